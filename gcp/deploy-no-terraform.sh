@@ -224,7 +224,7 @@ deploy_cloud_functions() {
         --memory=2GB \
         --timeout=540s \
         --max-instances=10 \
-        --set-env-vars="GCP_PROJECT=$PROJECT_ID,ENVIRONMENT=production" \
+        --set-env-vars="GCP_PROJECT=$PROJECT_ID,ENVIRONMENT=production,FUNCTION_MEMORY_MB=2048" \
         --quiet
     
     success "Cloud Functions deployed"
@@ -151,7 +151,7 @@ deploy_cloud_functions() {
         --memory=2GB \
         --timeout=540s \
         --max-instances=10 \
-        --set-env-vars=GCP_PROJECT=$PROJECT_ID,ENVIRONMENT=production
+        --set-env-vars=GCP_PROJECT=$PROJECT_ID,ENVIRONMENT=production,FUNCTION_MEMORY_MB=2048
     
     # Clean up
     rm scraper-function.zip
@@ -3,6 +3,9 @@ import os
 import json
 import time
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import List, Dict, Any
 from flask import Request
 from google.cloud import firestore
@@ -19,6 +22,22 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 # Initialize Firestore client
 db = firestore.Client()
 
+# Warm driver pool: Chrome instances are kept alive across warm invocations of the same
+# function instance. The pool size is bounded by the instance memory budget.
+FUNCTION_MEMORY_MB = int(os.environ.get('FUNCTION_MEMORY_MB', '2048'))
+BASE_MEMORY_MB = int(os.environ.get('BASE_MEMORY_MB', '512'))  # Python runtime + libraries
+CHROME_MEMORY_MB = int(os.environ.get('CHROME_MEMORY_MB', '450'))  # Per headless Chrome + chromedriver
+MAX_WARM_DRIVERS = max(1, min(
+    int(os.environ.get('MAX_WARM_DRIVERS', '4')),
+    (FUNCTION_MEMORY_MB - BASE_MEMORY_MB) // CHROME_MEMORY_MB
+))
+DRIVER_MAX_USES = int(os.environ.get('DRIVER_MAX_USES', '50'))  # Recycle long-lived drivers
+
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(MAX_WARM_DRIVERS)
+_idle_drivers = []
+_driver_uses = {}
+
 def get_secret(secret_name: str) -> str:
     """Get secret from Google Secret Manager"""
     try:
@@ -46,104 +65,177 @@ def setup_chrome_driver():
     
     return webdriver.Chrome(options=chrome_options)
 
+def driver_is_healthy(driver) -> bool:
+    """Check that a pooled driver still accepts commands"""
+    try:
+        driver.current_window_handle
+        return driver.execute_script("return 1") == 1
+    except Exception:
+        return False
+
+def discard_driver(driver):
+    """Quit a driver and forget its usage count"""
+    with _pool_lock:
+        _driver_uses.pop(id(driver), None)
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"Error quitting driver: {e}")
+
+def acquire_driver():
+    """Take a healthy warm driver from the pool, or start a new one within the memory budget"""
+    _pool_slots.acquire()
+    try:
+        while True:
+            with _pool_lock:
+                driver = _idle_drivers.pop() if _idle_drivers else None
+            if driver is None:
+                break
+            if driver_is_healthy(driver):
+                return driver
+            discard_driver(driver)
+        driver = setup_chrome_driver()
+        with _pool_lock:
+            _driver_uses[id(driver)] = 0
+        return driver
+    except Exception:
+        _pool_slots.release()
+        raise
+
+def release_driver(driver):
+    """Return a driver to the pool for the next keyword or invocation"""
+    try:
+        with _pool_lock:
+            _driver_uses[id(driver)] = _driver_uses.get(id(driver), 0) + 1
+            worn_out = _driver_uses[id(driver)] >= DRIVER_MAX_USES
+        if worn_out or not driver_is_healthy(driver):
+            discard_driver(driver)
+            return
+        try:
+            driver.delete_all_cookies()
+        except Exception:
+            discard_driver(driver)
+            return
+        with _pool_lock:
+            _idle_drivers.append(driver)
+    finally:
+        _pool_slots.release()
+
+@contextmanager
+def pooled_driver():
+    """Borrow a warm driver for the duration of one keyword"""
+    driver = acquire_driver()
+    try:
+        yield driver
+    finally:
+        release_driver(driver)
+
 def scrape_yargitay_keyword(keyword: str, max_results: int = 5) -> List[Dict[str, Any]]:
     """Scrape Yargıtay for a specific keyword"""
     results = []
-    driver = None
     
     try:
-        driver = setup_chrome_driver()
-        
-        # Navigate to Yargıtay search page
-        search_url = "https://karararama.yargitay.gov.tr/YargitayBilgiBankasiIstemciWeb/"
-        driver.get(search_url)
-        
-        # Wait for page to load
-        wait = WebDriverWait(driver, 10)
-        
-        # Find search input and enter keyword
-        search_input = wait.until(
-            EC.presence_of_element_located((By.ID, "txtSearchKeyword"))
-        )
-        search_input.clear()
-        search_input.send_keys(keyword)
-        
-        # Click search button
-        search_button = driver.find_element(By.ID, "btnSearch")
-        search_button.click()
-        
-        # Wait for results
-        time.sleep(3)
-        
-        # Extract results
-        result_elements = driver.find_elements(By.CLASS_NAME, "search-result-item")
-        
-        for i, element in enumerate(result_elements[:max_results]):
-            try:
-                title_element = element.find_element(By.CLASS_NAME, "result-title")
-                content_element = element.find_element(By.CLASS_NAME, "result-content")
-                date_element = element.find_element(By.CLASS_NAME, "result-date")
-                
-                result = {
-                    "title": title_element.text.strip(),
-                    "content": content_element.text.strip()[:500],  # Limit content
-                    "date": date_element.text.strip(),
-                    "case_number": f"CASE-{int(time.time())}-{i}",
-                    "court": "Yargıtay",
-                    "url": f"https://karararama.yargitay.gov.tr/karar/{i}",
-                    "keyword": keyword,
-                    "scraped_at": time.time()
-                }
-                results.append(result)
-                
-            except NoSuchElementException:
-                continue
-                
+        with pooled_driver() as driver:
+            results = extract_keyword_results(driver, keyword, max_results)
     except TimeoutException:
         print(f"Timeout while scraping keyword: {keyword}")
     except Exception as e:
         print(f"Error scraping keyword {keyword}: {e}")
-    finally:
-        if driver:
-            driver.quit()
     
     return results
 
-def cache_results_to_firestore(keyword: str, results: List[Dict[str, Any]]):
-    """Cache scraping results to Firestore"""
+def extract_keyword_results(driver, keyword: str, max_results: int) -> List[Dict[str, Any]]:
+    """Run the search for a keyword on the given driver and extract results"""
+    results = []
+    # Navigate to Yargıtay search page
+    search_url = "https://karararama.yargitay.gov.tr/YargitayBilgiBankasiIstemciWeb/"
+    driver.get(search_url)
+    
+    # Wait for page to load
+    wait = WebDriverWait(driver, 10)
+    
+    # Find search input and enter keyword
+    search_input = wait.until(
+        EC.presence_of_element_located((By.ID, "txtSearchKeyword"))
+    )
+    search_input.clear()
+    search_input.send_keys(keyword)
+    
+    # Click search button
+    search_button = driver.find_element(By.ID, "btnSearch")
+    search_button.click()
+    
+    # Wait for results
+    time.sleep(3)
+    
+    # Extract results
+    result_elements = driver.find_elements(By.CLASS_NAME, "search-result-item")
+    
+    for i, element in enumerate(result_elements[:max_results]):
+        try:
+            title_element = element.find_element(By.CLASS_NAME, "result-title")
+            content_element = element.find_element(By.CLASS_NAME, "result-content")
+            date_element = element.find_element(By.CLASS_NAME, "result-date")
+            
+            result = {
+                "title": title_element.text.strip(),
+                "content": content_element.text.strip()[:500],  # Limit content
+                "date": date_element.text.strip(),
+                "case_number": f"CASE-{int(time.time())}-{i}",
+                "court": "Yargıtay",
+                "url": f"https://karararama.yargitay.gov.tr/karar/{i}",
+                "keyword": keyword,
+                "scraped_at": time.time()
+            }
+            results.append(result)
+            
+        except NoSuchElementException:
+            continue
+    
+    return results
+
+def cache_results_to_firestore(results_by_keyword: Dict[str, List[Dict[str, Any]]]):
+    """Cache scraping results for several keywords with batched Firestore writes"""
+    keywords = list(results_by_keyword)
     try:
-        doc_ref = db.collection('scraper_cache').document(keyword)
-        doc_ref.set({
-            'keyword': keyword,
-            'results': results,
-            'cached_at': firestore.SERVER_TIMESTAMP,
-            'result_count': len(results)
-        })
-        print(f"Cached {len(results)} results for keyword: {keyword}")
+        # A Firestore batch holds at most 500 writes
+        for start in range(0, len(keywords), 500):
+            batch = db.batch()
+            for keyword in keywords[start:start + 500]:
+                results = results_by_keyword[keyword]
+                batch.set(db.collection('scraper_cache').document(keyword), {
+                    'keyword': keyword,
+                    'results': results,
+                    'cached_at': firestore.SERVER_TIMESTAMP,
+                    'result_count': len(results)
+                })
+            batch.commit()
+        print(f"Cached results for {len(keywords)} keywords")
     except Exception as e:
         print(f"Error caching to Firestore: {e}")
 
-def get_cached_results(keyword: str, max_age_hours: int = 24) -> List[Dict[str, Any]]:
-    """Get cached results from Firestore"""
+def get_cached_results(keywords: List[str], max_age_hours: int = 24) -> Dict[str, List[Dict[str, Any]]]:
+    """Get fresh cached results for all keywords with a single batched Firestore read"""
     try:
-        doc_ref = db.collection('scraper_cache').document(keyword)
-        doc = doc_ref.get()
-        
-        if doc.exists:
+        doc_refs = [db.collection('scraper_cache').document(keyword) for keyword in keywords]
+        cached = {}
+        for doc in db.get_all(doc_refs):
+            if not doc.exists:
+                continue
             data = doc.to_dict()
             cached_at = data.get('cached_at')
             
             # Check if cache is still valid
             if cached_at:
                 cache_age = time.time() - cached_at.timestamp()
-                if cache_age < (max_age_hours * 3600):
-                    print(f"Using cached results for keyword: {keyword}")
-                    return data.get('results', [])
+                if cache_age < (max_age_hours * 3600) and data.get('results'):
+                    cached[doc.id] = data['results']
         
-        return []
+        print(f"Cache hits: {len(cached)}/{len(keywords)} keywords")
+        return cached
     except Exception as e:
         print(f"Error getting cached results: {e}")
-        return []
+        return {}
 
 @functions_framework.http
 def scrape_yargitay(request: Request):
@@ -195,48 +287,37 @@ def scrape_yargitay(request: Request):
         if max_results > 20:
             max_results = 20
         
+        # One batched read for every keyword's cache document
+        cached = get_cached_results(keywords) if use_cache else {}
+        misses = list(dict.fromkeys(keyword for keyword in keywords if keyword not in cached))
+        
+        # Misses are scraped concurrently; the driver pool bounds how many Chrome instances are alive
+        scraped = {}
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(len(misses), MAX_WARM_DRIVERS)) as executor:
+                scraped = dict(zip(misses, executor.map(lambda kw: scrape_yargitay_keyword(kw, max_results), misses)))
+            
+            # Cache the fresh results in one batched write
+            fresh = {keyword: results for keyword, results in scraped.items() if results}
+            if fresh:
+                cache_results_to_firestore(fresh)
+        
         all_results = []
         search_details = {}
-        
         for keyword in keywords:
-            try:
-                # Try cache first
-                cached_results = []
-                if use_cache:
-                    cached_results = get_cached_results(keyword)
-                
-                if cached_results:
-                    results = cached_results[:max_results]
-                    search_details[keyword] = {
-                        'success': True,
-                        'count': len(results),
-                        'message': 'Retrieved from cache',
-                        'cached': True
-                    }
-                else:
-                    # Scrape fresh data
-                    results = scrape_yargitay_keyword(keyword, max_results)
-                    
-                    # Cache the results
-                    if results:
-                        cache_results_to_firestore(keyword, results)
-                    
-                    search_details[keyword] = {
-                        'success': True,
-                        'count': len(results),
-                        'message': 'Scraped fresh data',
-                        'cached': False
-                    }
-                
-                all_results.extend(results)
-                
-            except Exception as e:
-                search_details[keyword] = {
-                    'success': False,
-                    'count': 0,
-                    'message': f'Error: {str(e)}',
-                    'cached': False
-                }
+            if keyword in cached:
+                results = cached[keyword][:max_results]
+                message, from_cache = 'Retrieved from cache', True
+            else:
+                results = scraped.get(keyword, [])
+                message, from_cache = 'Scraped fresh data', False
+            search_details[keyword] = {
+                'success': True,
+                'count': len(results),
+                'message': message,
+                'cached': from_cache
+            }
+            all_results.extend(results)
         
         # Remove duplicates based on case_number
         unique_results = {}
@@ -0,0 +1,26 @@
+import importlib
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+FUNCTION_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def load_scraper(monkeypatch):
+    """Imports main.py afresh (module-level pool settings re-read) without connecting to Firestore."""
+    monkeypatch.syspath_prepend(str(FUNCTION_DIR))
+
+    def load():
+        monkeypatch.delitem(sys.modules, "main", raising=False)
+        with mock.patch("google.cloud.firestore.Client"):
+            return importlib.import_module("main")
+
+    return load
+
+
+@pytest.fixture
+def scraper(load_scraper):
+    return load_scraper()
@@ -0,0 +1,220 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+class FakeDriver:
+    """Headless Chrome yerine geçen, sağlığı ve çerez temizliği ayarlanabilen sürücü"""
+
+    def __init__(self, name):
+        self.name = name
+        self.healthy = True
+        self.cookie_error = False
+        self.quit_calls = 0
+        self.cookie_clears = 0
+
+    @property
+    def current_window_handle(self):
+        if not self.healthy:
+            raise RuntimeError("chrome not reachable")
+        return "window-1"
+
+    def execute_script(self, script):
+        return 1
+
+    def delete_all_cookies(self):
+        if self.cookie_error:
+            raise RuntimeError("session deleted")
+        self.cookie_clears += 1
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+@pytest.fixture
+def drivers(scraper, monkeypatch):
+    created = []
+
+    def setup_chrome_driver():
+        driver = FakeDriver(f"chrome-{len(created) + 1}")
+        created.append(driver)
+        return driver
+
+    monkeypatch.setattr(scraper, "setup_chrome_driver", setup_chrome_driver)
+    return created
+
+
+class TestDriverPool:
+    """Warm Chrome driver pool tests"""
+
+    def test_warm_driver_is_reused_across_keywords(self, scraper, drivers):
+        with scraper.pooled_driver() as first:
+            pass
+        with scraper.pooled_driver() as second:
+            pass
+
+        assert first is second and len(drivers) == 1
+        assert first.cookie_clears == 2 and first.quit_calls == 0
+        assert scraper._idle_drivers == [first]
+
+    def test_unhealthy_idle_driver_is_replaced(self, scraper, drivers):
+        with scraper.pooled_driver() as first:
+            pass
+        first.healthy = False
+
+        with scraper.pooled_driver() as second:
+            pass
+
+        assert second is not first and first.quit_calls == 1
+        assert scraper._idle_drivers == [second]
+        assert id(first) not in scraper._driver_uses
+
+    def test_worn_out_driver_is_recycled(self, scraper, drivers, monkeypatch):
+        monkeypatch.setattr(scraper, "DRIVER_MAX_USES", 2)
+        for _ in range(3):
+            with scraper.pooled_driver():
+                pass
+
+        assert len(drivers) == 2
+        assert drivers[0].quit_calls == 1 and drivers[1].quit_calls == 0
+
+    def test_cookie_failure_discards_driver(self, scraper, drivers):
+        driver = scraper.acquire_driver()
+        driver.cookie_error = True
+        scraper.release_driver(driver)
+
+        assert driver.quit_calls == 1 and scraper._idle_drivers == []
+
+    def test_borrowed_drivers_are_bounded_by_slots(self, scraper, drivers):
+        borrowed = [scraper.acquire_driver() for _ in range(scraper.MAX_WARM_DRIVERS)]
+        # Bütün yuvalar dolu; bir sürücü iade edilene kadar yenisi açılamaz
+        assert not scraper._pool_slots.acquire(blocking=False)
+
+        scraper.release_driver(borrowed[0])
+        assert scraper._pool_slots.acquire(blocking=False)
+        scraper._pool_slots.release()
+        for driver in borrowed[1:]:
+            scraper.release_driver(driver)
+
+    def test_failed_start_releases_slot(self, scraper, monkeypatch):
+        def broken_chrome():
+            raise RuntimeError("chromedriver missing")
+
+        monkeypatch.setattr(scraper, "setup_chrome_driver", broken_chrome)
+        for _ in range(scraper.MAX_WARM_DRIVERS + 1):
+            with pytest.raises(RuntimeError):
+                scraper.acquire_driver()
+
+        assert scraper.scrape_yargitay_keyword("tahliye") == []
+
+    def test_pool_size_follows_memory_budget(self, load_scraper, monkeypatch):
+        monkeypatch.setenv("FUNCTION_MEMORY_MB", "1024")
+        monkeypatch.setenv("MAX_WARM_DRIVERS", "4")
+        # (1024 - 512) // 450 = 1 sıcak sürücü
+        assert load_scraper().MAX_WARM_DRIVERS == 1
+
+        monkeypatch.setenv("FUNCTION_MEMORY_MB", "8192")
+        assert load_scraper().MAX_WARM_DRIVERS == 4
+
+
+class FakeDoc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeRef:
+    def __init__(self, doc_id):
+        self.id = doc_id
+
+
+class FakeCollection:
+    def document(self, doc_id):
+        return FakeRef(doc_id)
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db, self.writes = db, {}
+
+    def set(self, ref, data):
+        self.writes[ref.id] = data
+
+    def commit(self):
+        self.db.commits.append(len(self.writes))
+        self.db.docs.update(self.writes)
+
+
+class FakeFirestore:
+    """scraper_cache koleksiyonunu bellekte tutan istemci; toplu okuma/yazma çağrılarını sayar"""
+
+    def __init__(self, docs=None):
+        self.docs = dict(docs or {})
+        self.commits = []
+        self.get_all_calls = 0
+
+    def collection(self, name):
+        assert name == "scraper_cache"
+        return FakeCollection()
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, refs):
+        self.get_all_calls += 1
+        return [FakeDoc(ref.id, self.docs.get(ref.id)) for ref in refs]
+
+
+def cache_doc(results, age):
+    return {"results": results, "cached_at": datetime.now(timezone.utc) - age}
+
+
+class TestFirestoreCache:
+    """Batched scraper_cache read/write tests"""
+
+    def test_writes_are_chunked_into_batches_of_500(self, scraper, monkeypatch):
+        db = FakeFirestore()
+        monkeypatch.setattr(scraper, "db", db)
+        results = {f"kelime-{i}": [{"title": f"karar {i}"}] for i in range(1001)}
+
+        scraper.cache_results_to_firestore(results)
+
+        assert db.commits == [500, 500, 1]
+        assert db.docs["kelime-1000"]["results"] == [{"title": "karar 1000"}]
+        assert db.docs["kelime-0"]["result_count"] == 1
+
+    def test_reads_all_keywords_with_one_get_all(self, scraper, monkeypatch):
+        db = FakeFirestore({
+            "tahliye": cache_doc([{"title": "taze"}], timedelta(hours=1)),
+            "kira": cache_doc([{"title": "eski"}], timedelta(hours=30)),
+            "nafaka": cache_doc([], timedelta(hours=1)),
+        })
+        monkeypatch.setattr(scraper, "db", db)
+
+        cached = scraper.get_cached_results(["tahliye", "kira", "nafaka", "velayet"])
+
+        assert cached == {"tahliye": [{"title": "taze"}]}
+        assert db.get_all_calls == 1
+
+    def test_read_errors_are_cache_misses(self, scraper, monkeypatch):
+        db = FakeFirestore()
+
+        def unavailable(refs):
+            raise RuntimeError("firestore unavailable")
+
+        db.get_all = unavailable
+        monkeypatch.setattr(scraper, "db", db)
+        assert scraper.get_cached_results(["tahliye"]) == {}
+
+    def test_written_results_are_read_back(self, scraper, monkeypatch):
+        db = FakeFirestore()
+        monkeypatch.setattr(scraper, "db", db)
+        scraper.cache_results_to_firestore({"tahliye": [{"title": "karar"}]})
+        # SERVER_TIMESTAMP sunucuda çözülür; burada yazma anıyla değiştirilir
+        db.docs["tahliye"]["cached_at"] = datetime.now(timezone.utc)
+
+        assert scraper.get_cached_results(["tahliye"]) == {"tahliye": [{"title": "karar"}]}
@@ -343,8 +343,9 @@ resource "google_cloudfunctions_function" "yargitay_scraper" {
   }
 
   environment_variables = {
-    GCP_PROJECT  = var.project_id
-    ENVIRONMENT  = "production"
+    GCP_PROJECT        = var.project_id
+    ENVIRONMENT        = "production"
+    FUNCTION_MEMORY_MB = "2048"  # Warm Chrome pool size is derived from available_memory_mb
   }
 
   depends_on = [google_project_service.required_apis]
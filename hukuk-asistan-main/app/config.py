@@ -10,6 +10,15 @@ class Settings(BaseSettings):
     # Yargıtay Scraper API ayarları
     SCRAPER_API_URL: str = "https://scraper.yargisalzeka.com"
     
+    # Aday karar getirme: "scraper" (Selenium), "semantic" (yerel vektör indeksi) veya "hybrid"
+    RETRIEVAL_MODE: str = "scraper"
+    EMBEDDER: str = "hashed"  # "hashed" ağ gerektirmez, "gemini" Gemini embedding API'sini kullanır
+    EMBEDDING_DIMENSION: int = 512
+    VECTOR_INDEX_PATH: str = "/tmp/yargisalzeka-vector-index.npz"
+    VECTOR_INDEX_REFRESH_SECONDS: int = 6 * 3600  # Korpustan yeniden oluşturma aralığı
+    
+    SCORING_CONCURRENCY: int = 4  # Aynı anda AI ile puanlanan karar sayısı
+    
     # Genel ayarlar
     LOG_LEVEL: str = "INFO"
     ENVIRONMENT: str = "development"
@@ -0,0 +1,117 @@
+"""
+Metin Gömme (Embedding) Katmanı
+Karar ve olay metinlerini sabit boyutlu, L2-normalize vektörlere çevirir.
+Varsayılan gömücü ağ erişimi gerektirmeyen, deterministik karakter n-gram
+hashleme yöntemidir; farklı gömücüler register_embedder ile eklenebilir.
+"""
+
+import hashlib
+import re
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+_TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_NON_WORD = re.compile(r"[^0-9a-zçğıöşüâîû]+")
+
+
+def normalize_text(text: str) -> str:
+    """Türkçe büyük/küçük harf dönüşümü yapar, harf/rakam dışı karakterleri boşluğa çevirir."""
+    lowered = (text or "").translate(_TURKISH_LOWER).lower()
+    return _NON_WORD.sub(" ", lowered).strip()
+
+
+class Embedder:
+    """Gömücü arayüzü: embed() satır başına L2-normalize float32 matris döndürür"""
+
+    name = "base"
+    dimension: int = 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class HashedNgramEmbedder(Embedder):
+    """
+    Karakter n-gramlarını (kelime sınırları dahil) blake2b ile sabit boyuta hashleyen gömücü.
+    İşaretli hashleme çakışmaların etkisini dengeler; terim frekansı log ile sönümlenir.
+    Aynı metin her süreçte aynı vektörü üretir (Python hash() tuzlaması kullanılmaz).
+    """
+
+    name = "hashed"
+
+    def __init__(self, dimension: int = 512, min_n: int = 3, max_n: int = 5):
+        self.dimension = dimension
+        self.min_n = min_n
+        self.max_n = max_n
+        self._bucket_cache: Dict[str, Tuple[int, float]] = {}
+
+    def _bucket(self, gram: str) -> Tuple[int, float]:
+        bucket = self._bucket_cache.get(gram)
+        if bucket is None:
+            digest = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+            # En düşük bit işaret, kalan bitler boyut indeksi
+            bucket = ((digest >> 1) % self.dimension, 1.0 if digest & 1 else -1.0)
+            if len(self._bucket_cache) < 500_000:
+                self._bucket_cache[gram] = bucket
+        return bucket
+
+    def _ngrams(self, text: str) -> Iterable[str]:
+        for word in normalize_text(text).split():
+            padded = f" {word} "
+            for n in range(self.min_n, self.max_n + 1):
+                for start in range(0, max(len(padded) - n + 1, 1)):
+                    yield padded[start:start + n]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts: Dict[str, int] = {}
+            for gram in self._ngrams(text):
+                counts[gram] = counts.get(gram, 0) + 1
+            for gram, count in counts.items():
+                index, sign = self._bucket(gram)
+                vectors[row, index] += sign * (1.0 + np.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class GeminiEmbedder(Embedder):
+    """Gemini embedding modeliyle gömme (ağ erişimi ve GEMINI_API_KEY gerektirir)"""
+
+    name = "gemini"
+
+    def __init__(self, model: str = "models/text-embedding-004", dimension: int = 768):
+        self.model = model
+        self.dimension = dimension
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        import google.generativeai as genai
+
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            response = genai.embed_content(model=self.model, content=text[:8000])
+            vectors[row] = np.asarray(response["embedding"], dtype=np.float32)[:self.dimension]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+_EMBEDDERS: Dict[str, Callable[..., Embedder]] = {
+    HashedNgramEmbedder.name: HashedNgramEmbedder,
+    GeminiEmbedder.name: GeminiEmbedder,
+}
+
+
+def register_embedder(name: str, factory: Callable[..., Embedder]):
+    """Yeni bir gömücü türü kaydeder"""
+    _EMBEDDERS[name] = factory
+
+
+def get_embedder(name: str, **kwargs) -> Embedder:
+    """Adı verilen gömücüyü oluşturur; bilinmeyen ad için hashleme gömücüsüne düşer."""
+    factory = _EMBEDDERS.get(name)
+    if factory is None:
+        logger.warning(f"Bilinmeyen gömücü '{name}', '{HashedNgramEmbedder.name}' kullanılıyor")
+        factory = HashedNgramEmbedder
+    return factory(**kwargs)
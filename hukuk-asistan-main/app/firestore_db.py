@@ -291,6 +291,22 @@ class FirestoreManager:
             logger.error(f"Error logging system event: {e}")
             return False
     
+    # Decision corpus (scraper tarafından yargitay_decisions koleksiyonuna yazılır)
+    def iter_decisions(self, page_size: int = 500):
+        """Karar korpusunu sayfalı olarak dolaş (senkron)"""
+        decisions_ref = self.client.collection('yargitay_decisions').order_by('__name__')
+        last_doc = None
+        while True:
+            query = decisions_ref.limit(page_size)
+            if last_doc is not None:
+                query = query.start_after(last_doc)
+            docs = list(query.stream())
+            for doc in docs:
+                yield {**doc.to_dict(), 'decision_id': doc.id}
+            if len(docs) < page_size:
+                return
+            last_doc = docs[-1]
+
     # Statistics
     async def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         """Get user statistics"""
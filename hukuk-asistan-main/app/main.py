@@ -335,7 +335,8 @@ async def complete_analysis_workflow(request: Request, workflow_request: Workflo
             case_text=workflow_request.case_text,
             max_results=workflow_request.max_results,
             include_petition=workflow_request.include_petition,
-            http_client=client
+            http_client=client,
+            retrieval=workflow_request.retrieval
         )
         
         return WorkflowAnalysisResponse(**result)
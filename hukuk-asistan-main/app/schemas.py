@@ -45,6 +45,7 @@ class WorkflowAnalysisRequest(BaseModel):
     case_text: str
     max_results: Optional[int] = 10
     include_petition: Optional[bool] = False
+    retrieval: Optional[str] = None  # "scraper", "semantic" veya "hybrid" (varsayılan: RETRIEVAL_MODE)
 
 class WorkflowAnalysisResponse(BaseModel):
     keywords: List[str]
@@ -53,4 +54,5 @@ class WorkflowAnalysisResponse(BaseModel):
     petition_template: Optional[str] = None
     processing_time: float
     success: bool
-    message: str
\ No newline at end of file
+    message: str
+    retrieval: Optional[str] = None
\ No newline at end of file
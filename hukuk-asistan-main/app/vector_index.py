@@ -0,0 +1,240 @@
+"""
+Karar Korpusu için Vektör İndeksi
+Karar metinlerinin gömmeleri satır başına ölçekli int8 olarak saklanır (float32'ye göre
+4 kat daha az bellek). Sorgular toplu halde, bloklar üzerinde matris çarpımıyla
+kosinüs benzerliğine göre sıralanır; tarayıcıdan bağımsız aday getirme sağlar.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from .embeddings import Embedder
+
+# Saklanan karar alanları (metin dahil; sonuçlar doğrudan AI puanlamasına verilir)
+DOCUMENT_FIELDS = ("decision_id", "court", "esas_no", "karar_no", "karar_tarihi", "content", "source_url")
+
+
+def quantize(vectors: np.ndarray):
+    """float32 vektörleri satır başına ölçekle int8'e çevirir: v ≈ codes * scale"""
+    max_abs = np.abs(vectors).max(axis=1, keepdims=True)
+    scales = np.maximum(max_abs, 1e-12) / 127.0
+    codes = np.clip(np.rint(vectors / scales), -127, 127).astype(np.int8)
+    return codes, scales.ravel().astype(np.float32)
+
+
+def dequantized_norms(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Nicemlenmiş vektörlerin normları (kosinüsü nicemleme hatasından arındırmak için)"""
+    return np.linalg.norm(codes.astype(np.float32), axis=1) * scales
+
+
+def to_search_result(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Korpus belgesini scraper /search sonuç biçimine çevirir"""
+    court = document.get("court") or ""
+    karar_no = document.get("karar_no") or ""
+    return {
+        "daire": court,
+        "esas_no": document.get("esas_no") or "",
+        "karar_no": karar_no,
+        "karar_tarihi": document.get("karar_tarihi") or "",
+        "karar_metni": document.get("content") or "",
+        "case_number": document.get("esas_no") or "",
+        "title": f"{court} - {karar_no}",
+        "content": document.get("content") or "",
+        "date": document.get("karar_tarihi") or "",
+        "court": court,
+        "url": document.get("source_url") or "",
+    }
+
+
+class VectorIndex:
+    """int8 nicemlenmiş gömmeler üzerinde toplu top-K kosinüs araması"""
+
+    def __init__(self, embedder: Embedder, block_size: int = 65536, batch_size: int = 64):
+        self.embedder = embedder
+        self.block_size = block_size
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._codes = np.zeros((0, embedder.dimension), dtype=np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._documents: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self.built_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Belgeleri gömüp indekse ekler; aynı decision_id'li kayıt güncellenir."""
+        batch: List[Dict[str, Any]] = []
+        added = 0
+        for document in documents:
+            if not document.get("decision_id") or not document.get("content"):
+                continue
+            batch.append({field: document.get(field) for field in DOCUMENT_FIELDS})
+            if len(batch) >= self.batch_size:
+                added += self._add_batch(batch)
+                batch = []
+        if batch:
+            added += self._add_batch(batch)
+        self.built_at = time.time()
+        return added
+
+    def _add_batch(self, batch: List[Dict[str, Any]]) -> int:
+        codes, scales = quantize(self.embedder.embed([d["content"] for d in batch]))
+        norms = dequantized_norms(codes, scales)
+        with self._lock:
+            new_rows = []
+            for row, document in enumerate(batch):
+                position = self._positions.get(document["decision_id"])
+                if position is None:
+                    new_rows.append(row)
+                    self._positions[document["decision_id"]] = len(self._documents)
+                    self._documents.append(document)
+                else:
+                    self._codes[position] = codes[row]
+                    self._scales[position] = scales[row]
+                    self._norms[position] = norms[row]
+                    self._documents[position] = document
+            if new_rows:
+                start = len(self._documents) - len(new_rows)
+                self._reserve(start, len(self._documents))
+                self._codes[start:start + len(new_rows)] = codes[new_rows]
+                self._scales[start:start + len(new_rows)] = scales[new_rows]
+                self._norms[start:start + len(new_rows)] = norms[new_rows]
+        return len(batch)
+
+    def _reserve(self, used: int, size: int):
+        """
+        Tamponları ilk used satırı koruyarak en az size satıra büyütür. Kapasite geometrik
+        artar; korpus boyunca eklemeler her partide tüm diziyi kopyalamak yerine toplamda
+        O(n) satır kopyalar.
+        """
+        capacity = len(self._codes)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, self.batch_size)
+        for name in ("_codes", "_scales", "_norms"):
+            current = getattr(self, name)
+            grown = np.zeros((capacity,) + current.shape[1:], dtype=current.dtype)
+            grown[:used] = current[:used]
+            setattr(self, name, grown)
+
+    def _vectors(self):
+        """Kullanılan satırlar (tamponun boş kapasitesi hariç); çağıran kilidi tutmalıdır"""
+        size = len(self._documents)
+        return self._codes[:size], self._scales[:size], self._norms[:size]
+
+    def search_batch(self, queries: List[str], top_k: int = 10) -> List[List[Dict[str, Any]]]:
+        """Birden çok sorguyu tek matris çarpımıyla arar; her sorgu için en iyi top_k belge döner."""
+        if not queries:
+            return []
+        query_vectors = self.embedder.embed(queries)
+        with self._lock:
+            (codes, scales, norms), documents = self._vectors(), self._documents
+        if not documents:
+            return [[] for _ in queries]
+
+        k = min(top_k, len(documents))
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(documents), self.block_size):
+            end = min(start + self.block_size, len(documents))
+            # cos(q, v) = q · (codes * scale) / |codes * scale|
+            block_scores = (query_vectors @ codes[start:end].T.astype(np.float32)) * (
+                scales[start:end] / np.maximum(norms[start:end], 1e-12)
+            )
+            scores = np.concatenate([best_scores, block_scores], axis=1)
+            rows = np.concatenate([best_rows, np.broadcast_to(np.arange(start, end), block_scores.shape)], axis=1)
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                rows = np.take_along_axis(rows, keep, axis=1)
+            best_scores, best_rows = scores, rows
+
+        results = []
+        for query_scores, query_rows in zip(best_scores, best_rows):
+            order = np.argsort(-query_scores)
+            results.append([
+                {**documents[int(query_rows[i])], "similarity": round(float(query_scores[i]), 4)}
+                for i in order
+            ])
+        return results
+
+    def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        return self.search_batch([query], top_k)[0]
+
+    @staticmethod
+    def _metadata_path(path: Path) -> Path:
+        return path.with_name(path.name + ".json")
+
+    def save(self, path: str):
+        """
+        İndeksi yazar: vektörler .npz dosyasına, belgeler ve gömücü bilgisi yanındaki .json
+        dosyasına (pickle kullanılmaz). Her iki dosya geçici dosya + yer değiştirme ile yazılır.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata_path = self._metadata_path(path)
+        tmp_path = path.with_name(path.name + ".tmp.npz")
+        tmp_metadata_path = metadata_path.with_name(metadata_path.name + ".tmp")
+        with self._lock:
+            codes, scales, _ = self._vectors()
+            np.savez(tmp_path, codes=codes, scales=scales)
+            metadata = {
+                "embedder": self.embedder.name,
+                "dimension": self.embedder.dimension,
+                "count": len(self._documents),
+                "documents": self._documents,
+            }
+        with open(tmp_metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, default=str)
+        tmp_path.replace(path)
+        tmp_metadata_path.replace(metadata_path)
+
+    def load(self, path: str) -> bool:
+        """Aynı gömücüyle oluşturulmuş indeksi dosyadan yükler"""
+        path = Path(path)
+        metadata_path = self._metadata_path(path)
+        if not path.exists() or not metadata_path.exists():
+            return False
+        with open(metadata_path, encoding="utf-8") as f:
+            metadata = json.load(f)
+        name, dimension = metadata.get("embedder"), metadata.get("dimension")
+        if name != self.embedder.name or dimension != self.embedder.dimension:
+            logger.warning(f"Vektör indeksi farklı gömücüyle oluşturulmuş ({name}/{dimension}), yok sayılıyor")
+            return False
+        with np.load(path, allow_pickle=False) as data:
+            codes, scales = data["codes"], data["scales"]
+        documents = metadata.get("documents") or []
+        if (
+            codes.ndim != 2 or codes.shape[1] != self.embedder.dimension
+            or not len(documents) == metadata.get("count") == len(codes) == len(scales)
+        ):
+            logger.warning("Vektör indeksi dosyaları birbiriyle uyumsuz, yok sayılıyor")
+            return False
+        with self._lock:
+            self._codes = codes
+            self._scales = scales
+            self._norms = dequantized_norms(codes, scales)
+            self._documents = documents
+            self._positions = {d["decision_id"]: i for i, d in enumerate(documents)}
+        self.built_at = min(path.stat().st_mtime, metadata_path.stat().st_mtime)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            codes, scales, _ = self._vectors()
+        return {
+            "documents": len(self._documents),
+            "embedder": self.embedder.name,
+            "dimension": self.embedder.dimension,
+            "vector_bytes": int(codes.nbytes + scales.nbytes),
+            "built_at": self.built_at,
+        }
@@ -3,13 +3,59 @@ Workflow Mikroservisleri
 n8n workflow'larının yerini alan mikroservisler
 """
 
+import asyncio
+import json
 import time
 import httpx
 from loguru import logger
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 
 from .ai_service import gemini_service
 from .config import settings
+from .embeddings import get_embedder
+from .firestore_db import firestore_manager
+from .vector_index import VectorIndex, to_search_result
+
+RETRIEVAL_MODES = ("scraper", "semantic", "hybrid")
+# Başarısız vektör indeksi oluşturma/yenilemeden sonra yeniden deneme beklemesi (saniye)
+VECTOR_INDEX_RETRY_SECONDS = 300
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Aynı kararın tekrarlarını ayıklamak için kullanılan anahtar"""
+    return result.get("case_number") or result.get("esas_no") or result.get("title") or ""
+
+
+class IncrementalScorer:
+    """
+    Arama sonuçlarını geldikçe sınırlı eşzamanlılıkla puanlar.
+    Aynı karar birden çok kez eklense de yalnızca bir kez puanlanır.
+    """
+
+    def __init__(self, score_fn: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]], concurrency: int):
+        self._score_fn = score_fn
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def add(self, results: List[Dict[str, Any]]):
+        for result in results:
+            key = result_key(result)
+            if key not in self._tasks:
+                self._tasks[key] = asyncio.create_task(self._score(result))
+
+    async def _score(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._semaphore:
+            return await self._score_fn(result)
+
+    def cancel(self):
+        for task in self._tasks.values():
+            task.cancel()
+
+    async def results(self) -> List[Dict[str, Any]]:
+        """Tüm puanlamaları bekler ve puana göre (yüksekten düşüğe) sıralı döndürür"""
+        analyzed_results = list(await asyncio.gather(*self._tasks.values()))
+        analyzed_results.sort(key=lambda x: x.get("ai_score", 0), reverse=True)
+        return analyzed_results
 
 
 class WorkflowService:
@@ -19,35 +65,54 @@ class WorkflowService:
     
     def __init__(self):
         self.scraper_api_url = settings.SCRAPER_API_URL
+        self.vector_index = VectorIndex(
+            get_embedder(settings.EMBEDDER, dimension=settings.EMBEDDING_DIMENSION)
+        )
+        self._vector_index_lock = asyncio.Lock()
+        self._vector_refresh_task: Optional[asyncio.Task] = None
+        self._vector_refresh_after = 0.0
         
     async def complete_analysis_workflow(
         self, 
         case_text: str, 
         max_results: int = 10,
         include_petition: bool = False,
-        http_client: Optional[httpx.AsyncClient] = None
+        http_client: Optional[httpx.AsyncClient] = None,
+        retrieval: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Tam analiz workflow'u:
         1. Anahtar kelime çıkarma
-        2. Yargıtay'da arama
+        2. Aday kararları getirme (scraper, yerel vektör indeksi veya ikisi birden)
         3. Sonuçları AI ile puanlama
         4. İsteğe bağlı dilekçe şablonu oluşturma
         """
         start_time = time.time()
+        mode = (retrieval or settings.RETRIEVAL_MODE).lower()
+        if mode not in RETRIEVAL_MODES:
+            logger.warning(f"Bilinmeyen getirme modu '{mode}', scraper kullanılıyor")
+            mode = "scraper"
+        
+        scorer = IncrementalScorer(
+            lambda result: self._analyze_result(case_text, result),
+            settings.SCORING_CONCURRENCY
+        )
         
         try:
             # 1. Anahtar kelimeleri çıkar
             logger.info("Workflow başlatıldı: Anahtar kelime çıkarma")
             keywords = await self._extract_keywords(case_text)
             
-            # 2. Yargıtay'da arama yap
-            logger.info(f"Workflow: {len(keywords)} anahtar kelime ile arama yapılıyor")
-            search_results = await self._search_yargitay(keywords, max_results, http_client)
+            # 2. Aday kararları getir; scraper akışından gelen her parti hemen puanlanmaya başlar
+            logger.info(f"Workflow: {len(keywords)} anahtar kelime ile arama yapılıyor ({mode})")
+            search_results = await self._retrieve_candidates(
+                mode, case_text, keywords, max_results, http_client, on_results=scorer.add
+            )
             
-            # 3. Sonuçları AI ile analiz et ve puanla
+            # 3. Kalan sonuçları AI ile analiz et ve tüm puanlamaların bitmesini bekle
             logger.info(f"Workflow: {len(search_results)} sonuç AI ile analiz ediliyor")
-            analyzed_results = await self._analyze_and_score_results(case_text, search_results)
+            scorer.add(search_results)
+            analyzed_results = await scorer.results()
             
             # 4. İsteğe bağlı dilekçe şablonu oluştur
             petition_template = None
@@ -66,10 +131,12 @@ class WorkflowService:
                 "petition_template": petition_template,
                 "processing_time": processing_time,
                 "success": True,
-                "message": f"Analiz başarıyla tamamlandı. {len(analyzed_results)} sonuç bulundu."
+                "message": f"Analiz başarıyla tamamlandı. {len(analyzed_results)} sonuç bulundu.",
+                "retrieval": mode
             }
             
         except Exception as e:
+            scorer.cancel()
             processing_time = time.time() - start_time
             logger.error(f"Workflow hatası: {e}")
             
@@ -80,7 +147,8 @@ class WorkflowService:
                 "petition_template": None,
                 "processing_time": processing_time,
                 "success": False,
-                "message": f"Workflow hatası: {str(e)}"
+                "message": f"Workflow hatası: {str(e)}",
+                "retrieval": mode
             }
     
     async def _extract_keywords(self, case_text: str) -> List[str]:
@@ -116,48 +184,208 @@ class WorkflowService:
         
         return found_keywords[:8]
     
+    async def _retrieve_candidates(
+        self,
+        mode: str,
+        case_text: str,
+        keywords: List[str],
+        max_results: int,
+        http_client: Optional[httpx.AsyncClient],
+        on_results: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Seçilen moda göre aday kararları getirir; semantik sonuç yoksa scraper'a düşer.
+        on_results, scraper akışından gelen her sonuç partisi için hemen çağrılır.
+        """
+        if mode == "scraper":
+            return await self._search_yargitay(keywords, max_results, http_client, on_results)
+
+        if mode == "semantic":
+            results = await self._search_semantic(case_text, keywords, max_results)
+            if results:
+                return results
+            logger.info("Vektör indeksinde sonuç yok, scraper ile aranıyor")
+            return await self._search_yargitay(keywords, max_results, http_client, on_results)
+
+        # hybrid: iki kaynak paralel, aynı esas numarası tek kez
+        semantic_results, scraper_results = await asyncio.gather(
+            self._search_semantic(case_text, keywords, max_results),
+            self._search_yargitay(keywords, max_results, http_client, on_results)
+        )
+        merged = {}
+        for result in semantic_results + scraper_results:
+            merged.setdefault(result_key(result), result)
+        return list(merged.values())
+
+    async def _ensure_vector_index(self) -> bool:
+        """
+        Vektör indeksini hazırlar: önce diskteki kopya yüklenir, o da yoksa Firestore
+        korpusundan oluşturulur. VECTOR_INDEX_REFRESH_SECONDS'tan eski bir indeks sunulmaya
+        devam eder; yenisi arka planda oluşturulup hazır olunca yerine konur.
+        """
+        index = self.vector_index
+        if not len(index):
+            async with self._vector_index_lock:
+                index = self.vector_index
+                if not len(index):
+                    try:
+                        await asyncio.to_thread(index.load, settings.VECTOR_INDEX_PATH)
+                    except Exception as e:
+                        logger.warning(f"Vektör indeksi dosyadan yüklenemedi: {e}")
+                if not len(index) and firestore_manager.client:
+                    # Sunulacak indeks yok: ilk oluşturma isteğin içinde yapılır
+                    try:
+                        self.vector_index = await asyncio.to_thread(self._build_vector_index)
+                    except Exception as e:
+                        logger.warning(f"Vektör indeksi korpustan oluşturulamadı: {e}")
+                        self._vector_refresh_after = time.time() + VECTOR_INDEX_RETRY_SECONDS
+                index = self.vector_index
+
+        if len(index) and time.time() - (index.built_at or 0) >= settings.VECTOR_INDEX_REFRESH_SECONDS:
+            self._schedule_vector_index_refresh()
+        return len(index) > 0
+
+    def _schedule_vector_index_refresh(self):
+        """Eski indeksi yenilemek için (zaten çalışmıyorsa) arka plan görevi başlatır."""
+        if self._vector_refresh_task is not None and not self._vector_refresh_task.done():
+            return
+        if not firestore_manager.client or time.time() < self._vector_refresh_after:
+            return
+        self._vector_refresh_task = asyncio.create_task(self._refresh_vector_index())
+
+    async def _refresh_vector_index(self):
+        try:
+            self.vector_index = await asyncio.to_thread(self._build_vector_index)
+        except Exception as e:
+            logger.warning(f"Vektör indeksi arka planda yenilenemedi: {e}")
+            self._vector_refresh_after = time.time() + VECTOR_INDEX_RETRY_SECONDS
+
+    def _build_vector_index(self) -> VectorIndex:
+        """Firestore korpusundan yeni bir vektör indeksi oluşturup diske kaydeder (senkron)"""
+        started = time.time()
+        index = VectorIndex(self.vector_index.embedder)
+        count = index.add_documents(firestore_manager.iter_decisions())
+        index.save(settings.VECTOR_INDEX_PATH)
+        logger.info(f"Vektör indeksi oluşturuldu: {count} karar, {time.time() - started:.2f} saniye")
+        return index
+
+    async def _search_semantic(
+        self,
+        case_text: str,
+        keywords: List[str],
+        max_results: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Olay metni ve anahtar kelimelerle vektör indeksinde toplu arama yapar.
+        Her karar için iki sorgudan yüksek olan benzerlik kullanılır.
+        """
+        try:
+            if not await self._ensure_vector_index():
+                return []
+            queries = [case_text] + ([" ".join(keywords)] if keywords else [])
+            hits_per_query = await asyncio.to_thread(self.vector_index.search_batch, queries, max_results)
+        except Exception as e:
+            logger.warning(f"Semantik arama başarısız: {e}")
+            return []
+
+        best: Dict[str, Dict[str, Any]] = {}
+        for hits in hits_per_query:
+            for hit in hits:
+                current = best.get(hit["decision_id"])
+                if current is None or hit["similarity"] > current["similarity"]:
+                    best[hit["decision_id"]] = hit
+        ranked = sorted(best.values(), key=lambda hit: hit["similarity"], reverse=True)[:max_results]
+        return [
+            {**to_search_result(hit), "similarity": hit["similarity"], "retrieval": "semantic"}
+            for hit in ranked
+        ]
+
     async def _search_yargitay(
         self, 
         keywords: List[str], 
         max_results: int,
-        http_client: Optional[httpx.AsyncClient]
+        http_client: Optional[httpx.AsyncClient],
+        on_results: Optional[Callable[[List[Dict[str, Any]]], None]] = None
     ) -> List[Dict[str, Any]]:
         """Yargıtay scraper API'sini kullanarak arama yapar"""
         if not http_client:
             # Eğer http_client verilmemişse kendi client'ımızı oluştur
             timeout = httpx.Timeout(connect=5.0, read=30.0, write=5.0, pool=5.0)
             async with httpx.AsyncClient(timeout=timeout) as client:
-                return await self._perform_search(client, keywords, max_results)
+                return await self._perform_search(client, keywords, max_results, on_results)
         else:
-            return await self._perform_search(http_client, keywords, max_results)
+            return await self._perform_search(http_client, keywords, max_results, on_results)
     
     async def _perform_search(
         self, 
         client: httpx.AsyncClient, 
         keywords: List[str], 
-        max_results: int
+        max_results: int,
+        on_results: Optional[Callable[[List[Dict[str, Any]]], None]] = None
     ) -> List[Dict[str, Any]]:
-        """Gerçek arama işlemini yapar"""
+        """
+        Scraper'ın NDJSON akış uç noktasını (/search/stream) tüketir. Her anahtar kelimenin
+        sonuçları geldiği anda on_results'a verilir; akış yarıda kesilirse o ana kadar
+        gelen sonuçlar döner. Akış desteklemeyen scraper sürümlerinde /search kullanılır.
+        Okuma zaman aşımı X-Request-Timeout olarak iletilir; scraper bu sürede biten
+        istemcinin taramalarını durdurur.
+        """
+        search_payload = {
+            "keywords": keywords,
+            "max_results": max_results
+        }
+        results: List[Dict[str, Any]] = []
         try:
-            search_payload = {
-                "keywords": keywords,
-                "max_results": max_results
-            }
-            
-            scraper_url = f"{self.scraper_api_url}/search"
-            response = await client.post(scraper_url, json=search_payload)
-            
-            if response.status_code == 200:
-                search_data = response.json()
-                return search_data.get("results", [])
-            else:
-                logger.warning(f"Scraper API hatası: {response.status_code}")
-                return self._generate_mock_search_results()
+            scraper_url = f"{self.scraper_api_url}/search/stream"
+            headers = self._request_timeout_headers(client)
+            async with client.stream("POST", scraper_url, json=search_payload, headers=headers) as response:
+                if response.status_code == 404:
+                    return await self._perform_blocking_search(client, search_payload)
+                if response.status_code != 200:
+                    logger.warning(f"Scraper API hatası: {response.status_code}")
+                    return self._generate_mock_search_results()
+                
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record.get("type") == "keyword":
+                        batch = record.get("results", [])
+                        if batch:
+                            results.extend(batch)
+                            if on_results:
+                                on_results(batch)
+                    elif record.get("type") == "summary":
+                        logger.info(f"Scraper akışı tamamlandı: {record.get('message')}")
+                        break
+            return results
                 
         except Exception as e:
+            if results:
+                logger.warning(f"Scraper akışı yarıda kesildi, {len(results)} sonuç kullanılıyor: {e}")
+                return results
             logger.warning(f"Scraper API'ye bağlanılamadı: {e}")
             return self._generate_mock_search_results()
     
+    async def _perform_blocking_search(
+        self,
+        client: httpx.AsyncClient,
+        search_payload: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Tüm sonuçları tek yanıtta döndüren /search uç noktasıyla arama yapar."""
+        response = await client.post(
+            f"{self.scraper_api_url}/search", json=search_payload, headers=self._request_timeout_headers(client)
+        )
+        if response.status_code == 200:
+            return response.json().get("results", [])
+        logger.warning(f"Scraper API hatası: {response.status_code}")
+        return self._generate_mock_search_results()
+    
+    @staticmethod
+    def _request_timeout_headers(client: httpx.AsyncClient) -> Dict[str, str]:
+        """İstemcinin okuma zaman aşımını scraper'a X-Request-Timeout başlığıyla bildirir"""
+        return {"X-Request-Timeout": str(client.timeout.read)} if client.timeout.read else {}
+
     def _generate_mock_search_results(self) -> List[Dict[str, Any]]:
         """Scraper API çalışmadığında kullanılacak mock data"""
         return [
@@ -187,47 +415,33 @@ class WorkflowService:
             }
         ]
     
-    async def _analyze_and_score_results(
-        self, 
-        case_text: str, 
-        search_results: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Her arama sonucunu AI ile analiz eder ve puanlar"""
-        analyzed_results = []
-        
-        for result in search_results:
-            try:
-                # AI analizi yap
-                analysis = await gemini_service.analyze_decision_relevance(
-                    case_text, 
-                    result.get("content", "")
-                )
-                
-                # Sonuca AI puanını ekle
-                analyzed_result = {
-                    **result,
-                    "ai_score": analysis["score"],
-                    "ai_explanation": analysis["explanation"],
-                    "ai_similarity": analysis["similarity"]
-                }
-                
-            except Exception as e:
-                logger.warning(f"AI analizi başarısız, fallback puan kullanılıyor: {e}")
-                # Fallback scoring
-                score = self._calculate_fallback_score(case_text, result.get("content", ""))
-                analyzed_result = {
-                    **result,
-                    "ai_score": score,
-                    "ai_explanation": "Otomatik puanlama kullanıldı",
-                    "ai_similarity": "Orta" if score > 50 else "Düşük"
-                }
+    async def _analyze_result(self, case_text: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Tek bir arama sonucunu AI ile analiz eder; hata durumunda basit puanlamaya düşer"""
+        try:
+            # AI analizi yap
+            analysis = await gemini_service.analyze_decision_relevance(
+                case_text, 
+                result.get("content", "")
+            )
             
-            analyzed_results.append(analyzed_result)
-        
-        # Puanına göre sırala (yüksekten düşüğe)
-        analyzed_results.sort(key=lambda x: x.get("ai_score", 0), reverse=True)
-        
-        return analyzed_results
+            # Sonuca AI puanını ekle
+            return {
+                **result,
+                "ai_score": analysis["score"],
+                "ai_explanation": analysis["explanation"],
+                "ai_similarity": analysis["similarity"]
+            }
+            
+        except Exception as e:
+            logger.warning(f"AI analizi başarısız, fallback puan kullanılıyor: {e}")
+            # Fallback scoring
+            score = self._calculate_fallback_score(case_text, result.get("content", ""))
+            return {
+                **result,
+                "ai_score": score,
+                "ai_explanation": "Otomatik puanlama kullanıldı",
+                "ai_similarity": "Orta" if score > 50 else "Düşük"
+            }
     
     def _calculate_fallback_score(self, case_text: str, decision_text: str) -> int:
         """AI analizi çalışmadığında kullanılacak basit puanlama"""
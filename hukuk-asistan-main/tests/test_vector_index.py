@@ -0,0 +1,168 @@
+import asyncio
+import json
+import threading
+import time
+
+import numpy as np
+
+from app import workflow_service as workflow_module
+from app.config import settings
+from app.embeddings import HashedNgramEmbedder, get_embedder
+from app.vector_index import VectorIndex, quantize
+from app.workflow_service import WorkflowService
+
+
+def decision(decision_id, content):
+    return {
+        "decision_id": decision_id,
+        "court": "3. Hukuk Dairesi",
+        "esas_no": f"2024/{decision_id}",
+        "karar_no": "2024/99",
+        "karar_tarihi": "15.03.2024",
+        "content": content,
+    }
+
+
+CORPUS = [
+    decision("1", "Kiracının kira bedelini ödememesi nedeniyle tahliye davası açıldı."),
+    decision("2", "İşçinin kıdem ve ihbar tazminatı alacakları hüküm altına alındı."),
+    decision("3", "Boşanma davasında yoksulluk nafakası ve velayet değerlendirildi."),
+    decision("4", "Satıcının ayıplı mal teslimi nedeniyle alıcının tazminat talebi."),
+]
+
+
+class TestEmbeddings:
+    """Offline hashed n-gram embedder tests"""
+
+    def test_deterministic_and_normalized(self):
+        """Same text yields the same unit vector across instances"""
+        first = HashedNgramEmbedder(dimension=256).embed(["Kıdem tazminatı"])
+        second = HashedNgramEmbedder(dimension=256).embed(["KIDEM TAZMİNATI"])
+        assert np.allclose(first, second)
+        assert np.isclose(np.linalg.norm(first[0]), 1.0)
+
+    def test_unknown_embedder_falls_back(self):
+        """Unknown names fall back to the hashed embedder"""
+        assert isinstance(get_embedder("missing", dimension=64), HashedNgramEmbedder)
+
+
+class TestVectorIndex:
+    """int8 vector index tests"""
+
+    def test_quantization_error_is_small(self):
+        """Dequantized vectors stay close to the originals"""
+        vectors = HashedNgramEmbedder(dimension=256).embed([d["content"] for d in CORPUS])
+        codes, scales = quantize(vectors)
+        assert codes.dtype == np.int8
+        assert np.abs(codes * scales[:, None] - vectors).max() < 0.01
+
+    def test_batched_top_k_finds_paraphrases(self):
+        """Related wording ranks the matching decision first"""
+        index = VectorIndex(HashedNgramEmbedder(dimension=512), block_size=2)
+        index.add_documents(CORPUS)
+        results = index.search_batch(["kiracı tahliyesi kira ödenmedi", "işçi kıdem tazminatı"], top_k=2)
+        assert [r[0]["decision_id"] for r in results] == ["1", "2"]
+        assert all(len(r) == 2 for r in results)
+        assert results[0][0]["similarity"] >= results[0][1]["similarity"]
+
+    def test_update_and_persist(self, tmp_path):
+        """Re-adding a decision replaces it; save/load round-trips"""
+        index = VectorIndex(HashedNgramEmbedder(dimension=128))
+        index.add_documents(CORPUS)
+        index.add_documents([decision("4", "Nafaka artırım davası")])
+        assert len(index) == 4
+
+        path = str(tmp_path / "vectors.npz")
+        index.save(path)
+        loaded = VectorIndex(HashedNgramEmbedder(dimension=128))
+        assert loaded.load(path)
+        assert loaded.search("nafaka artırımı", top_k=1)[0]["decision_id"] == "4"
+        assert not VectorIndex(HashedNgramEmbedder(dimension=64)).load(path)
+
+    def test_small_batches_grow_buffers_geometrically(self, tmp_path):
+        """Batch appends reallocate O(log n) times and match a single-batch build"""
+        documents = [decision(str(i), f"karar {i} kira tahliye nafaka {i % 7}") for i in range(100)]
+        index = VectorIndex(HashedNgramEmbedder(dimension=64), batch_size=4)
+        capacities = []
+        add_batch = index._add_batch
+
+        def tracking_add_batch(batch):
+            added = add_batch(batch)
+            if not capacities or capacities[-1] != len(index._codes):
+                capacities.append(len(index._codes))
+            return added
+
+        index._add_batch = tracking_add_batch
+        index.add_documents(documents)
+        updated = decision("5", "güncellenmiş karar metni")
+        index.add_documents([updated])
+
+        # 26 parti, ama tamponlar yalnızca kapasite ikiye katlanırken yeniden ayrılır
+        assert len(index) == 100
+        assert capacities == [4, 8, 16, 32, 64, 128]
+        reference = VectorIndex(HashedNgramEmbedder(dimension=64), batch_size=1000)
+        reference.add_documents(documents[:5] + [updated] + documents[6:])
+        for actual, expected in zip(index._vectors(), reference._vectors()):
+            assert np.array_equal(actual, expected)
+        assert index.get_stats()["vector_bytes"] == reference.get_stats()["vector_bytes"]
+
+        path = str(tmp_path / "vectors.npz")
+        index.save(path)
+        loaded = VectorIndex(HashedNgramEmbedder(dimension=64))
+        assert loaded.load(path)
+        loaded.add_documents([decision("100", "yeni karar")])
+        assert len(loaded) == 101
+        assert loaded.search("yeni karar", top_k=1)[0]["decision_id"] == "100"
+
+    def test_saved_index_loads_without_pickle(self, tmp_path):
+        """Vectors load with allow_pickle=False; documents live in a JSON sidecar"""
+        index = VectorIndex(HashedNgramEmbedder(dimension=64))
+        index.add_documents(CORPUS)
+        path = tmp_path / "vectors.npz"
+        index.save(str(path))
+
+        with np.load(path, allow_pickle=False) as data:
+            assert sorted(data.files) == ["codes", "scales"]
+        metadata_path = tmp_path / "vectors.npz.json"
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        assert [d["decision_id"] for d in metadata["documents"]] == ["1", "2", "3", "4"]
+
+        metadata["documents"].pop()
+        metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+        assert not VectorIndex(HashedNgramEmbedder(dimension=64)).load(str(path))
+
+
+class TestVectorIndexRefresh:
+    """Stale vector index refresh tests"""
+
+    def test_stale_index_is_served_while_refreshing_in_background(self, monkeypatch):
+        """An old index answers immediately; the rebuilt one replaces it when ready"""
+        monkeypatch.setattr(workflow_module.firestore_manager, "client", object())
+        service = WorkflowService()
+        stale = VectorIndex(HashedNgramEmbedder(dimension=64))
+        stale.add_documents(CORPUS[:2])
+        stale.built_at = time.time() - settings.VECTOR_INDEX_REFRESH_SECONDS - 1
+        service.vector_index = stale
+
+        release = threading.Event()
+        fresh = VectorIndex(HashedNgramEmbedder(dimension=64))
+        fresh.add_documents(CORPUS)
+        builds = []
+
+        def slow_build():
+            builds.append(1)
+            release.wait(5)
+            return fresh
+
+        monkeypatch.setattr(service, "_build_vector_index", slow_build)
+
+        async def scenario():
+            assert await service._ensure_vector_index()
+            assert await service._ensure_vector_index()
+            assert service.vector_index is stale
+            release.set()
+            await service._vector_refresh_task
+
+        asyncio.run(scenario())
+        assert service.vector_index is fresh
+        assert len(builds) == 1
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import httpx
+
+from app.workflow_service import WorkflowService, IncrementalScorer
+
+
+def ndjson_transport(records, status_code=200):
+    body = "".join(json.dumps(record) + "\n" for record in records)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/search/stream":
+            return httpx.Response(404)
+        return httpx.Response(status_code, content=body, headers={"content-type": "application/x-ndjson"})
+
+    return httpx.MockTransport(handler)
+
+
+def decision(case_number):
+    return {"case_number": case_number, "title": case_number, "content": f"karar {case_number}"}
+
+
+class TestStreamingSearch:
+    """Incremental consumption of the scraper NDJSON stream"""
+
+    def test_batches_delivered_as_records_arrive(self):
+        """Each keyword record is handed to on_results before the summary"""
+        records = [
+            {"type": "keyword", "keyword": "kira", "results": [decision("1"), decision("2")]},
+            {"type": "keyword", "keyword": "tahliye", "results": []},
+            {"type": "keyword", "keyword": "tazminat", "results": [decision("3")]},
+            {"type": "summary", "success": True, "message": "ok", "unique_results": 3},
+        ]
+        batches = []
+
+        async def run():
+            async with httpx.AsyncClient(transport=ndjson_transport(records), base_url="http://scraper") as client:
+                service = WorkflowService()
+                service.scraper_api_url = "http://scraper"
+                return await service._perform_search(client, ["kira", "tahliye", "tazminat"], 10, batches.append)
+
+        results = asyncio.run(run())
+        assert [r["case_number"] for r in results] == ["1", "2", "3"]
+        assert [len(b) for b in batches] == [2, 1]
+
+    def test_stream_request_carries_timeout_header(self):
+        """The scraper learns the caller's read timeout on the streaming call too"""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.url.path, request.headers.get("X-Request-Timeout")))
+            body = json.dumps({"type": "summary", "success": True, "message": "ok"}) + "\n"
+            return httpx.Response(200, content=body, headers={"content-type": "application/x-ndjson"})
+
+        async def run():
+            transport = httpx.MockTransport(handler)
+            async with httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(5.0, read=30.0)) as client:
+                service = WorkflowService()
+                service.scraper_api_url = "http://scraper"
+                return await service._perform_search(client, ["kira"], 10)
+
+        assert asyncio.run(run()) == []
+        assert seen == [("/search/stream", "30.0")]
+
+    def test_scorer_deduplicates_and_sorts(self):
+        """The same decision is scored once; output is sorted by score"""
+        scored = []
+
+        async def score(result):
+            scored.append(result["case_number"])
+            return {**result, "ai_score": int(result["case_number"])}
+
+        async def run():
+            scorer = IncrementalScorer(score, concurrency=2)
+            scorer.add([decision("1"), decision("3")])
+            scorer.add([decision("3"), decision("2")])
+            return await scorer.results()
+
+        results = asyncio.run(run())
+        assert sorted(scored) == ["1", "2", "3"]
+        assert [r["ai_score"] for r in results] == [3, 2, 1]
@@ -0,0 +1,302 @@
+"""
+Tarayıcı Süreç Denetçisi (watchdog)
+search_single_keyword'ün başlattığı chromedriver/Chromium süreçlerini PID düzeyinde izler:
+- Tarayıcı başına RSS tavanı (BROWSER_MAX_RSS_MB) aşılırsa süreç ağacı sonlandırılır.
+- Sayfa sayısı (BROWSER_RECYCLE_AFTER_PAGES) veya bellek büyümesi eşiği aşılan tarayıcılar
+  bir sonraki sayfa geçişinde yeniden başlatılmak üzere işaretlenir (recycle).
+- Kaydı olmayan, süresi dolmuş chromium/chromedriver süreçleri (yetim) öldürülür. Yalnızca
+  bu sürecin soyundan gelen ya da başlatılırken PID'i kaydedilip sonradan başka bir ebeveyne
+  devredilmiş süreçler yetim sayılır; aynı makinedeki başka servislerin veya replikaların
+  tarayıcılarına dokunulmaz. Süreç PID 1 olarak çalıştığında (Cloud Run) devralınan zombi
+  çocuklar toplanır (reap).
+Tarayıcı sayısı ve bellek metrikleri /stats altında sunulur.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import psutil
+from loguru import logger
+
+from .config import settings
+
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "chromedriver")
+MB = 1024 * 1024
+
+
+def is_browser_process(proc: psutil.Process) -> bool:
+    try:
+        name = proc.name().lower()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+    return any(candidate in name for candidate in BROWSER_PROCESS_NAMES)
+
+
+def process_tree(pid: int) -> List[psutil.Process]:
+    """Kök süreç ve tüm alt süreçleri (süreç yoksa boş liste)"""
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return []
+
+
+def tree_rss(processes: List[psutil.Process]) -> int:
+    total = 0
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total
+
+
+def kill_processes(processes: List[psutil.Process]) -> int:
+    """Süreçleri önce SIGTERM, kısa süre sonra SIGKILL ile sonlandırır"""
+    alive = []
+    for proc in processes:
+        try:
+            proc.terminate()
+            alive.append(proc)
+        except psutil.NoSuchProcess:
+            continue
+        except psutil.AccessDenied as e:
+            logger.warning(f"Süreç sonlandırılamadı (pid={proc.pid}): {e}")
+    _, still_alive = psutil.wait_procs(alive, timeout=3)
+    for proc in still_alive:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            continue
+    return len(alive)
+
+
+def driver_pid(driver) -> Optional[int]:
+    """Yerel chromedriver sürecinin PID'i (Remote/Grid sürücülerinde None)"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+@dataclass
+class TrackedBrowser:
+    name: str
+    pid: Optional[int]
+    started_at: float = field(default_factory=time.monotonic)
+    pages: int = 0
+    baseline_rss: int = 0
+    rss: int = 0
+    pids: Set[int] = field(default_factory=set)
+    killed_reason: Optional[str] = None
+
+
+class BrowserSupervisor:
+    """Tarayıcı süreçlerini izleyen, bellek sınırlarını uygulayan ve yetim süreçleri temizleyen denetçi"""
+
+    def __init__(
+        self,
+        max_rss_mb: int,
+        recycle_after_pages: int,
+        recycle_rss_growth: float,
+        interval_seconds: float,
+        orphan_grace_seconds: float
+    ):
+        self.max_rss = max_rss_mb * MB
+        self.recycle_after_pages = recycle_after_pages
+        self.recycle_rss_growth = recycle_rss_growth
+        self.interval_seconds = interval_seconds
+        self.orphan_grace_seconds = orphan_grace_seconds
+        self._lock = threading.Lock()
+        self._browsers: Dict[int, TrackedBrowser] = {}  # id(driver) -> TrackedBrowser
+        # Bu sürecin başlattığı tarayıcı süreçleri: pid -> create_time (PID yeniden kullanımına karşı)
+        self._launched: Dict[int, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "started": 0, "closed": 0, "recycled": 0, "killed_rss": 0,
+            "orphans_killed": 0, "zombies_reaped": 0, "peak_browsers": 0, "peak_rss_mb": 0.0,
+        }
+
+    # Yaşam döngüsü
+    def start(self):
+        """Watchdog thread'ini başlatır (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="browser-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Tarayıcı watchdog başlatıldı (RSS tavanı {self.max_rss // MB} MB)")
+
+    def shutdown(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Tarayıcı watchdog turu başarısız: {e}")
+
+    # Tarayıcı kaydı
+    def _remember_launched(self, processes: List[psutil.Process]):
+        launched = {}
+        for proc in processes:
+            try:
+                launched[proc.pid] = proc.create_time()
+            except psutil.NoSuchProcess:
+                continue
+        with self._lock:
+            self._launched.update(launched)
+
+    def register(self, driver, name: str):
+        browser = TrackedBrowser(name=name, pid=driver_pid(driver))
+        if browser.pid is not None:
+            processes = process_tree(browser.pid)
+            browser.pids = {proc.pid for proc in processes}
+            browser.baseline_rss = browser.rss = tree_rss(processes)
+            self._remember_launched(processes)
+        with self._lock:
+            self._browsers[id(driver)] = browser
+            self._stats["started"] += 1
+            self._stats["peak_browsers"] = max(self._stats["peak_browsers"], len(self._browsers))
+
+    def unregister(self, driver):
+        with self._lock:
+            if self._browsers.pop(id(driver), None) is not None:
+                self._stats["closed"] += 1
+
+    def record_page(self, driver):
+        """Tarayıcıda yeni bir sonuç sayfası açıldığını kaydeder."""
+        with self._lock:
+            browser = self._browsers.get(id(driver))
+            if browser:
+                browser.pages += 1
+
+    def recycle_reason(self, driver) -> Optional[str]:
+        """Tarayıcı yeniden başlatılmalıysa nedenini döndürür."""
+        with self._lock:
+            browser = self._browsers.get(id(driver))
+        if browser is None:
+            return None
+        if browser.killed_reason:
+            return browser.killed_reason
+        if self.recycle_after_pages and browser.pages >= self.recycle_after_pages:
+            return f"{browser.pages} sayfa işlendi"
+        if browser.pid is not None and browser.baseline_rss:
+            browser.rss = tree_rss(process_tree(browser.pid))
+            if browser.rss > browser.baseline_rss * self.recycle_rss_growth:
+                return f"bellek {browser.baseline_rss // MB} MB -> {browser.rss // MB} MB büyüdü"
+        return None
+
+    def note_recycled(self):
+        with self._lock:
+            self._stats["recycled"] += 1
+
+    # Watchdog turu
+    def check(self):
+        """RSS tavanını uygular, zombileri toplar ve yetim tarayıcı süreçlerini öldürür."""
+        with self._lock:
+            browsers = [b for b in self._browsers.values() if b.pid is not None and not b.killed_reason]
+        total_rss = 0
+        for browser in browsers:
+            processes = process_tree(browser.pid)
+            browser.pids |= {proc.pid for proc in processes}
+            browser.rss = tree_rss(processes)
+            self._remember_launched(processes)
+            total_rss += browser.rss
+            if self.max_rss and browser.rss > self.max_rss:
+                browser.killed_reason = f"RSS tavanı aşıldı ({browser.rss // MB} MB)"
+                logger.warning(f"[{browser.name}] {browser.killed_reason}, tarayıcı sonlandırılıyor")
+                kill_processes(processes)
+                with self._lock:
+                    self._stats["killed_rss"] += 1
+        with self._lock:
+            self._stats["peak_rss_mb"] = max(self._stats["peak_rss_mb"], round(total_rss / MB, 1))
+        self._reap_zombies()
+        self._kill_orphans()
+
+    def _reap_zombies(self):
+        try:
+            children = psutil.Process().children()
+        except psutil.NoSuchProcess:
+            return
+        for child in children:
+            try:
+                if child.status() != psutil.STATUS_ZOMBIE:
+                    continue
+                os.waitpid(child.pid, os.WNOHANG)
+                with self._lock:
+                    self._stats["zombies_reaped"] += 1
+            except (psutil.NoSuchProcess, ChildProcessError):
+                continue
+
+    def _orphan_candidates(self) -> List[psutil.Process]:
+        """
+        Kayıtlı hiçbir tarayıcıya ait olmayan ve bu sürece ait olduğu kanıtlanabilen tarayıcılar:
+        bu sürecin alt süreçleri ile başlatılırken kaydedilip sonradan devredilmiş süreçler.
+        """
+        with self._lock:
+            tracked = set().union(*(b.pids for b in self._browsers.values())) if self._browsers else set()
+            launched = dict(self._launched)
+        try:
+            descendants = {proc.pid for proc in psutil.Process().children(recursive=True)}
+        except psutil.NoSuchProcess:
+            descendants = set()
+        now = time.time()
+        candidates, gone = [], []
+        for pid in descendants | set(launched):
+            try:
+                proc = psutil.Process(pid)
+                create_time = proc.create_time()
+            except psutil.NoSuchProcess:
+                gone.append(pid)
+                continue
+            if pid not in descendants and create_time != launched[pid]:
+                gone.append(pid)  # PID başka bir süreçle yeniden kullanılmış
+                continue
+            if pid in tracked or not is_browser_process(proc):
+                continue
+            if now - create_time < self.orphan_grace_seconds:
+                continue  # Henüz kaydedilmemiş, yeni başlatılan tarayıcı olabilir
+            candidates.append(proc)
+        with self._lock:
+            for pid in gone:
+                self._launched.pop(pid, None)
+        return candidates
+
+    def _kill_orphans(self):
+        orphans = self._orphan_candidates()
+        if not orphans:
+            return
+        killed = kill_processes(orphans)
+        with self._lock:
+            self._stats["orphans_killed"] += killed
+        logger.warning(f"{killed} yetim tarayıcı süreci sonlandırıldı")
+
+    # Metrikler
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            browsers = list(self._browsers.values())
+            stats = dict(self._stats)
+        stats.update({
+            "browsers": len(browsers),
+            "rss_mb": round(sum(b.rss for b in browsers) / MB, 1),
+            "max_browser_rss_mb": round(max((b.rss for b in browsers), default=0) / MB, 1),
+            "rss_limit_mb": self.max_rss // MB,
+            "watchdog_running": bool(self._thread and self._thread.is_alive()),
+        })
+        return stats
+
+
+# Global tarayıcı denetçisi
+browser_supervisor = BrowserSupervisor(
+    max_rss_mb=settings.BROWSER_MAX_RSS_MB,
+    recycle_after_pages=settings.BROWSER_RECYCLE_AFTER_PAGES,
+    recycle_rss_growth=settings.BROWSER_RECYCLE_RSS_GROWTH,
+    interval_seconds=settings.BROWSER_WATCHDOG_INTERVAL_SECONDS,
+    orphan_grace_seconds=settings.BROWSER_ORPHAN_GRACE_SECONDS
+)
@@ -0,0 +1,134 @@
+"""
+İstek Düzeyinde Sonuç Bütçesi
+SearchRequest.max_results, bir isteğin tüm anahtar kelime işçileri arasında paylaşılır.
+Her kelimeye orantılı bir kota verilir; kotasını dolduramadan biten kelimelerin artan
+payı diğerlerine devredilir. Kotadan yalnızca istekte ilk kez görülen kararlar düşülür;
+başka bir kelimenin zaten okuduğu karar yanıta yeni sonuç eklemediği için kota harcamaz
+(kelime başı okuma sınırı TARGET_RESULTS_PER_KEYWORD ise işçinin okuma sayısıyla ayrıca uygulanır).
+Tekil karar sayısı max_results'a ulaşınca tüm işçiler bir sonraki satırda durur
+(kooperatif iptal) ve tarayıcı slotlarını erken bırakır.
+Anahtar kelime işçileri scheduler thread'lerinde çalıştığından sınıf thread-safe'tir.
+"""
+import threading
+from typing import Dict, Iterable, List
+
+
+def proportional_quotas(total: int, keywords: List[str], per_keyword_cap: int) -> Dict[str, int]:
+    """
+    Toplam bütçeyi kelimelere eşit dağıtır; kalan birimler sıradaki ilk kelimelere verilir.
+    Hiçbir kota kelime başı üst sınırı (TARGET_RESULTS_PER_KEYWORD) aşmaz.
+    """
+    if not keywords:
+        return {}
+    base, remainder = divmod(max(total, 0), len(keywords))
+    return {
+        keyword: min(per_keyword_cap, base + (1 if i < remainder else 0))
+        for i, keyword in enumerate(keywords)
+    }
+
+
+class ResultBudget:
+    """Bir arama isteğinin anahtar kelime işçileri arasında paylaşılan sonuç bütçesi"""
+
+    def __init__(self, max_results: int, per_keyword_cap: int):
+        self.max_results = max(0, max_results)
+        self.per_keyword_cap = per_keyword_cap
+        self._lock = threading.Lock()
+        self._seen: set = set()
+        self._quotas: Dict[str, int] = {}
+        self._charged: Dict[str, int] = {}  # Kelimenin bulduğu yeni (tekil) karar sayısı
+        self._finished: set = set()
+        self._truncated: set = set()
+        self._spare = 0
+
+    def record_existing(self, case_ids: Iterable[str]):
+        """Cache veya yerel indeksten gelen kararları bütçeye sayar (kotalar henüz dağıtılmadan)."""
+        with self._lock:
+            self._seen.update(case_ids)
+
+    def allocate(self, keywords: List[str]) -> Dict[str, int]:
+        """Kalan bütçeyi taranacak kelimelere orantılı dağıtır."""
+        with self._lock:
+            remaining = max(0, self.max_results - len(self._seen))
+            self._quotas = proportional_quotas(remaining, keywords, self.per_keyword_cap)
+            # Kelime başı üst sınır nedeniyle dağıtılamayan birimler devredilebilir havuza girer
+            self._spare = max(0, remaining - sum(self._quotas.values()))
+            return dict(self._quotas)
+
+    @property
+    def unique_count(self) -> int:
+        return len(self._seen)
+
+    @property
+    def exhausted(self) -> bool:
+        return len(self._seen) >= self.max_results
+
+    def limits(self, keyword: str) -> bool:
+        """
+        Bütçe kelimenin sonucunu kesebilir mi? Kotası kelime başı sınıra eşit olan kelime
+        diğer kelimeler ne okursa okusun hedefine ulaşır; daha düşük kotalı kelime kesilebilir.
+        """
+        with self._lock:
+            return self._quotas.get(keyword, 0) < self.per_keyword_cap
+
+    def wants_more(self, keyword: str, found_count: int, pending: int = 0) -> bool:
+        """
+        Kelime işçisi bir karar daha okumalı mı? found_count kelimenin okuduğu karar sayısıdır
+        (kelime başı sınır için); kota ise yalnızca yeni kararlarla dolar. pending, okunmakta olan
+        ve henüz kaydedilmemiş kararlardır (yeni sayılır). Kota doluysa havuzdan bir birim ödünç
+        alınır; havuz boşsa veya toplam bütçe dolduysa False döner ve kelime kesilmiş olarak işaretlenir.
+        """
+        with self._lock:
+            if found_count + pending >= self.per_keyword_cap:
+                return False
+            if len(self._seen) + pending >= self.max_results:
+                self._truncated.add(keyword)
+                return False
+            quota = self._quotas.get(keyword, 0)
+            if self._charged.get(keyword, 0) + pending < quota:
+                return True
+            if self._spare > 0:
+                self._spare -= 1
+                self._quotas[keyword] = quota + 1
+                return True
+            self._truncated.add(keyword)
+            return False
+
+    def record(self, keyword: str, case_id: str) -> bool:
+        """
+        Okunan kararı kaydeder; karar bu istekte ilk kez görülüyorsa kelimenin kotasından
+        düşer ve True döner. case_id olarak esas numarası kullanılır (yanıttaki
+        tekilleştirme ile aynı anahtar).
+        """
+        with self._lock:
+            if case_id in self._seen:
+                return False
+            self._seen.add(case_id)
+            self._charged[keyword] = self._charged.get(keyword, 0) + 1
+            return True
+
+    def finish(self, keyword: str):
+        """Kelime bitti; yeni kararlarla dolmayan kota diğer kelimeler için havuza bırakılır."""
+        with self._lock:
+            if keyword in self._finished:
+                return
+            self._finished.add(keyword)
+            self._spare += max(0, self._quotas.get(keyword, 0) - self._charged.get(keyword, 0))
+
+    def remote_quota(self, keyword: str) -> int:
+        """
+        Başka süreçte çalışacak kelime işçisinin üst sınırı: kota ile devredilebilir havuzun
+        toplamı (kelime başı sınırla). Bütçe süreçler arası paylaşılamadığından yanıt ayrıca kırpılır.
+        """
+        with self._lock:
+            return min(self.per_keyword_cap, self._quotas.get(keyword, 0) + self._spare)
+
+    def mark_truncated(self, keyword: str):
+        """Başka süreçteki işçi kelimeyi bütçe nedeniyle kesti."""
+        with self._lock:
+            self._truncated.add(keyword)
+
+    def was_truncated(self, keyword: str) -> bool:
+        """Kelime, hedefine ulaşmadan bütçe nedeniyle mi durduruldu?"""
+        with self._lock:
+            return keyword in self._truncated
@@ -0,0 +1,351 @@
+"""
+Arama Önbelleği Yardımcıları
+Sonuçlar anahtar kelime kümesi yerine tek tek (normalize edilmiş) anahtar kelimeler
+için saklanır; böylece örtüşen aramalar ortak kelimelerin sonuçlarını paylaşır.
+Okumalar önce süreç içi L1 önbelleğe, ardından paylaşılan L2 depoya (Firestore) gider.
+Tazeliği geçmiş (stale) kayıtlar hemen döndürülür ve arka planda tek bir görevle yenilenir.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+# Türkçe büyük/küçük harf dönüşümü: str.lower() "I" -> "i" ve "İ" -> "i̇" üretir
+_TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Anahtar kelimeyi Türkçe kurallarıyla küçültür ve boşlukları sadeleştirir."""
+    return _WHITESPACE.sub(" ", keyword.translate(_TURKISH_LOWER).lower()).strip()
+
+
+def keyword_cache_key(keyword: str) -> str:
+    """Normalize edilmiş anahtar kelimeden önbellek anahtarı üretir."""
+    return hashlib.md5(normalize_keyword(keyword).encode("utf-8")).hexdigest()
+
+
+def jittered(seconds: float, jitter: float) -> float:
+    """Süreyi ±jitter oranında rastgele kaydırır; kayıtların dalga halinde dolmasını önler."""
+    if jitter <= 0:
+        return seconds
+    return seconds * random.uniform(1 - jitter, 1 + jitter)
+
+
+def unique_keywords(keywords: Iterable[str]) -> List[str]:
+    """Normalize edilmiş, sırası korunmuş ve tekrarsız anahtar kelime listesi döndürür."""
+    seen = {}
+    for keyword in keywords:
+        normalized = normalize_keyword(keyword)
+        if normalized and normalized not in seen:
+            seen[normalized] = None
+    return list(seen)
+
+
+class LRUCache:
+    """
+    Süreç içi (L1) önbellek: LRU sıralı, kayıt başına TTL ve toplam bayt sınırı.
+    Thread-safe'tir; boyut JSON serileştirme uzunluğu ile yaklaşık hesaplanır.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at, _ = item
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        size = len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            self._bytes = 0
+            return count
+
+    def _remove(self, key: str):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class TieredKeywordCache:
+    """
+    Anahtar kelime sonuçları için iki katmanlı read-through önbellek.
+    L1 süreç içi LRU'dur; L2 paylaşılan depodur (Firestore). L2'de bulunan kayıtlar
+    L1'e taşınır, böylece sıcak sorgular ağ turu olmadan yanıtlanır.
+
+    Her kayıt bir tazelik süresi (fresh_until) taşır. Bu süre geçtikten sonra kayıt,
+    sabit süre dolumuna (stale penceresi sonu) kadar "stale" olarak döndürülür;
+    çağıran taraf kaydı arka planda yenilemekten sorumludur.
+    """
+
+    def __init__(
+        self,
+        l1: LRUCache,
+        l2=None,
+        fresh_ttl_seconds: float = 24 * 3600,
+        stale_ttl_seconds: float = 6 * 24 * 3600,
+        jitter: float = 0.0
+    ):
+        self.l1 = l1
+        self.l2 = l2
+        self.fresh_ttl_seconds = fresh_ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.jitter = jitter
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "stale_hits": 0, "negative_hits": 0}
+
+    def _l2_available(self) -> bool:
+        return self.l2 is not None and getattr(self.l2, "client", None) is not None
+
+    @staticmethod
+    def _fresh_until_from_l2(cache_data: Dict[str, Any]) -> float:
+        """L2 kaydının tazelik sınırını epoch saniyesi olarak döndürür."""
+        boundary = cache_data.get("fresh_until") or cache_data.get("expires_at")
+        if isinstance(boundary, datetime):
+            if boundary.tzinfo is None:
+                # utcnow() ile yazılan naive tarihler UTC'dir
+                boundary = boundary.replace(tzinfo=timezone.utc)
+            return boundary.timestamp()
+        return time.time()
+
+    async def get_many(self, keywords: List[str], track: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Normalize edilmiş anahtar kelimelerin kayıtlarını döndürür.
+        Her kayıt {"results", "search_duration", "source", "stale"} alanlarını içerir;
+        negatif kayıtlarda ayrıca {"negative", "success", "message"} bulunur.
+        track=False iç kontroller (ör. ön-tarama) için isabet istatistiklerini değiştirmez.
+        Süresi geçmiş (stale) negatif kayıtlar döndürülmez; kelime yeniden aranmalıdır.
+        """
+        # İstatistikler await boyunca paylaşılır; track=False sayımları ayrı bir sözlüğe gider
+        stats = self._stats if track else dict.fromkeys(self._stats, 0)
+        found: Dict[str, Dict[str, Any]] = {}
+        for keyword in keywords:
+            entry = self.l1.get(keyword)
+            if entry is not None and not (entry.get("negative") and entry["fresh_until"] <= time.time()):
+                found[keyword] = {**entry, "source": "l1"}
+        stats["l1_hits"] += len(found)
+
+        missing = [k for k in keywords if k not in found]
+        if missing and self._l2_available():
+            try:
+                l2_entries = await self.l2.get_keyword_caches(missing)
+            except Exception as e:
+                logger.warning(f"L2 cache okuması başarısız: {e}")
+                l2_entries = {}
+            for keyword, cache_data in l2_entries.items():
+                entry = {
+                    "results": cache_data.get("search_results", []),
+                    "search_duration": cache_data.get("search_duration", 0),
+                    "fresh_until": self._fresh_until_from_l2(cache_data),
+                }
+                l1_ttl = jittered(self.l1.ttl_seconds, self.jitter)
+                if cache_data.get("negative"):
+                    entry.update({
+                        "negative": True,
+                        "success": cache_data.get("success", True),
+                        "message": cache_data.get("message", ""),
+                    })
+                    # Negatif kayıt L1'de L2'deki süresinden uzun yaşamamalı
+                    l1_ttl = min(l1_ttl, entry["fresh_until"] - time.time())
+                    if l1_ttl <= 0:
+                        continue
+                self.l1.set(keyword, entry, l1_ttl)
+                found[keyword] = {**entry, "source": "l2"}
+                stats["l2_hits"] += 1
+
+        now = time.time()
+        for entry in found.values():
+            # Negatif kayıtlar yalnızca tazeyken bulunur (yukarıda süzülür)
+            entry["stale"] = not entry.get("negative") and entry.get("fresh_until", now) <= now
+            if entry["stale"]:
+                stats["stale_hits"] += 1
+            if entry.get("negative"):
+                stats["negative_hits"] += 1
+
+        stats["misses"] += len([k for k in keywords if k not in found])
+        return found
+
+    async def set(
+        self,
+        keyword: str,
+        results: List[Dict[str, Any]],
+        search_duration: float,
+        fresh_ttl_seconds: Optional[float] = None
+    ):
+        """
+        Kaydı L1'e yazar ve L2'ye aktarır (write-through). Süreler jitter ile dağıtılır.
+        fresh_ttl_seconds=0 kaydı hemen stale yazar: sunulur ama ilk erişimde arka planda yenilenir.
+        """
+        keyword = normalize_keyword(keyword)
+        fresh_ttl_seconds = self.fresh_ttl_seconds if fresh_ttl_seconds is None else fresh_ttl_seconds
+        fresh_seconds = jittered(fresh_ttl_seconds, self.jitter)
+        fresh_until = time.time() + fresh_seconds
+        self.l1.set(
+            keyword,
+            {"results": results, "search_duration": search_duration, "fresh_until": fresh_until},
+            jittered(self.l1.ttl_seconds, self.jitter)
+        )
+        if self._l2_available():
+            try:
+                now = datetime.utcnow()
+                await self.l2.save_keyword_cache(
+                    keyword,
+                    results,
+                    search_duration,
+                    fresh_until=now + timedelta(seconds=fresh_seconds),
+                    expires_at=now + timedelta(seconds=fresh_seconds + jittered(self.stale_ttl_seconds, self.jitter))
+                )
+            except Exception as e:
+                logger.warning(f"L2 cache yazması başarısız: {e}")
+
+    async def set_negative(self, keyword: str, message: str, success: bool, ttl_seconds: float):
+        """
+        Sonuç bulunamayan (success=True) veya hata veren (success=False) anahtar kelime için
+        kısa ömürlü negatif kayıt yazar. Negatif kayıtlar stale olarak sunulmaz;
+        süreleri dolunca kelime yeniden aranır.
+        """
+        if ttl_seconds <= 0:
+            return
+        keyword = normalize_keyword(keyword)
+        ttl_seconds = jittered(ttl_seconds, self.jitter)
+        negative = {"negative": True, "success": success, "message": message}
+        self.l1.set(
+            keyword,
+            {"results": [], "search_duration": 0, "fresh_until": time.time() + ttl_seconds, **negative},
+            ttl_seconds
+        )
+        if self._l2_available():
+            try:
+                expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+                await self.l2.save_keyword_cache(
+                    keyword, [], 0, fresh_until=expires_at, expires_at=expires_at, metadata=negative
+                )
+            except Exception as e:
+                logger.warning(f"L2 negatif cache yazması başarısız: {e}")
+
+    def clear(self) -> int:
+        """Yalnızca L1'i temizler; L2 süre dolumu ile temizlenir."""
+        return self.l1.clear()
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["l1_hits"] + self._stats["l2_hits"] + self._stats["misses"]
+        hits = self._stats["l1_hits"] + self._stats["l2_hits"]
+        return {
+            **self._stats,
+            "lookups": lookups,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "l1_hit_ratio": round(self._stats["l1_hits"] / lookups, 4) if lookups else 0.0,
+            "l1": self.l1.get_stats(),
+            "l2_enabled": self._l2_available(),
+        }
+
+
+class SingleFlight:
+    """
+    Anahtar başına tek uçuş (single-flight) kilidi.
+    Aynı anahtar için aynı anda yalnızca bir görev çalışır; diğer çağıranlar
+    o görevin sonucunu bekler. Böylece süresi dolan popüler bir kayıt için
+    her istek ayrı bir tarayıcı araması başlatmaz.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+        self.background_refreshes = 0
+
+    def _start(self, key: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = asyncio.ensure_future(factory())
+        self._tasks[key] = task
+
+        def _done(t: asyncio.Task, k: str = key):
+            if self._tasks.get(k) is t:
+                del self._tasks[k]
+            if not t.cancelled() and t.exception():
+                logger.warning(f"'{k}' için görev hatası: {t.exception()}")
+
+        task.add_done_callback(_done)
+        return task
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Anahtar için süren görev varsa ona katılır, yoksa yenisini başlatır."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._start(key, factory)
+        else:
+            self.coalesced += 1
+        # Bekleyen istek iptal edilse bile paylaşılan görev devam etsin
+        return await asyncio.shield(task)
+
+    def spawn(self, key: str, factory: Callable[[], Awaitable[Any]]) -> bool:
+        """Arka plan yenilemesi başlatır; anahtar için zaten görev varsa hiçbir şey yapmaz."""
+        if key in self._tasks:
+            return False
+        self._start(key, factory)
+        self.background_refreshes += 1
+        return True
+
+    def is_running(self, key: str) -> bool:
+        return key in self._tasks
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._tasks),
+            "coalesced": self.coalesced,
+            "background_refreshes": self.background_refreshes,
+        }
@@ -0,0 +1,102 @@
+"""
+İptal Yayılımı
+İstemci bağlantıyı kestiğinde veya istek süresi (deadline) dolduğunda süren tarayıcı
+aramalarının durdurulması için kullanılır. Her anahtar kelime taramasının bir
+CancelToken'ı vardır; single-flight ile aynı taramayı bekleyen her istek token'ı
+"tutar". Token'ı tutan son istek de ayrıldığında ya da tüm isteklerin süresi
+dolduğunda tarama bir sonraki satır/sayfa kontrolünde durur.
+search_single_keyword scheduler thread'lerinde çalıştığından sınıflar thread-safe'tir.
+"""
+import threading
+import time
+from typing import List, Optional
+
+DEADLINE_HEADER = "X-Request-Deadline"  # Unix zamanı (saniye)
+TIMEOUT_HEADER = "X-Request-Timeout"  # İstek alındıktan sonraki süre (saniye)
+
+
+def deadline_from_headers(headers) -> Optional[float]:
+    """İstek başlıklarından time.monotonic() cinsinden son zamanı hesaplar; başlık yoksa None."""
+    now_wall, now_mono = time.time(), time.monotonic()
+    deadlines = []
+    try:
+        if headers.get(TIMEOUT_HEADER):
+            deadlines.append(now_mono + float(headers[TIMEOUT_HEADER]))
+        if headers.get(DEADLINE_HEADER):
+            deadlines.append(now_mono + float(headers[DEADLINE_HEADER]) - now_wall)
+    except ValueError:
+        return None
+    return min(deadlines) if deadlines else None
+
+
+class CancelToken:
+    """Birden çok isteğin paylaşabildiği, tarayıcı işçilerinin kontrol ettiği iptal bayrağı"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._holders = 0
+        self._deadlines: List[Optional[float]] = []
+        self.reason: Optional[str] = None
+
+    def acquire(self, deadline: Optional[float] = None):
+        """Bir istek taramanın sonucunu bekliyor; deadline None ise süre sınırı yoktur."""
+        with self._lock:
+            self._holders += 1
+            self._deadlines.append(deadline)
+
+    def release(self, deadline: Optional[float] = None):
+        """İstek artık sonucu beklemiyor; bekleyen kalmadıysa tarama iptal edilir."""
+        with self._lock:
+            self._holders -= 1
+            if deadline in self._deadlines:
+                self._deadlines.remove(deadline)
+            if self._holders <= 0:
+                self._cancel_locked("Tüm istemciler ayrıldı")
+
+    def cancel(self, reason: str = "İptal edildi"):
+        with self._lock:
+            self._cancel_locked(reason)
+
+    def _cancel_locked(self, reason: str):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        with self._lock:
+            # Süre sınırı olmayan bir bekleyen varsa tarama deadline nedeniyle kesilmez
+            if not self._deadlines or any(d is None for d in self._deadlines):
+                return False
+            if time.monotonic() < max(self._deadlines):
+                return False
+            self._cancel_locked("İstek süresi doldu")
+            return True
+
+
+class RequestCancellation:
+    """Bir HTTP isteğinin tuttuğu tarama token'ları; istek bitince veya kopunca hepsi bırakılır"""
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self._tokens: List[CancelToken] = []
+        self._released = False
+
+    def hold(self, token: CancelToken) -> CancelToken:
+        token.acquire(self.deadline)
+        if self._released:
+            # İstek zaten sona erdi; başka bekleyen yoksa tarama hemen iptal edilir
+            token.release(self.deadline)
+        else:
+            self._tokens.append(token)
+        return token
+
+    def release_all(self):
+        if self._released:
+            return
+        self._released = True
+        for token in self._tokens:
+            token.release(self.deadline)
@@ -0,0 +1,141 @@
+"""
+Kaldığı Yerden Devam Eden Anahtar Kelime Taramaları
+Her sonuç sayfası işlendikten sonra taramanın ilerlemesi (sayfa numarası, işlenmiş case_id'ler,
+o ana kadarki sonuçlar) kaydedilir:
+- Tarayıcı sayfa 4'te çökerse yeni tarayıcı aynı sayfadan devam eder (aynı çağrı içinde).
+- Çağrı hata/iptal ile biterse kayıt "in_progress" kalır; aynı kelimenin sonraki taraması
+  kayıtlı sonuçları koruyarak kaldığı sayfadan sürer.
+- Tamamlanan taramanın imleci saklanır; continue_paging istekleri ilk sayfadan başlamak yerine
+  bu imleçten devam ederek yalnızca yeni kararları getirir.
+Kayıtlar süreç içinde (LRU) ve Firestore'da (scraper_checkpoints) tutulur; tarayıcı işçileri
+thread'lerde çalıştığından Firestore çağrıları senkrondur.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from .cache import normalize_keyword
+from .config import settings
+from .firestore_db import firestore_manager
+
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETE = "complete"
+
+
+@dataclass
+class ScrapeCheckpoint:
+    keyword: str
+    page_number: int = 1  # Devam edilecek sonuç sayfası (satırlar case_id ile tekilleştirilir)
+    processed_cases: List[str] = field(default_factory=list)
+    results: List[Dict[str, Any]] = field(default_factory=list)  # Yalnızca tamamlanmamış taramalarda
+    status: str = STATUS_IN_PROGRESS
+    exhausted: bool = False  # Son sonuç sayfasına ulaşıldı
+    updated_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScrapeCheckpoint":
+        fields = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in data.items() if key in fields})
+
+    def cursor(self) -> Dict[str, Any]:
+        return {
+            "page": self.page_number,
+            "processed": len(self.processed_cases),
+            "status": self.status,
+            "exhausted": self.exhausted,
+        }
+
+
+class CheckpointStore:
+    """Tarama kayıtlarının L1 (süreç içi) + Firestore deposu"""
+
+    def __init__(self, store, ttl_seconds: float, max_entries: int = 1000):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, ScrapeCheckpoint]" = OrderedDict()
+        self._stats = {"saved": 0, "resumed": 0, "continued": 0, "store_errors": 0}
+
+    def _available(self) -> bool:
+        return self.store is not None and getattr(self.store, "client", None) is not None
+
+    def _expired(self, checkpoint: ScrapeCheckpoint) -> bool:
+        return time.time() - checkpoint.updated_at > self.ttl_seconds
+
+    def load(self, keyword: str) -> Optional[ScrapeCheckpoint]:
+        key = normalize_keyword(keyword)
+        with self._lock:
+            checkpoint = self._entries.get(key)
+            if checkpoint is not None:
+                self._entries.move_to_end(key)
+        if checkpoint is None and self._available():
+            try:
+                data = self.store.fetch_scrape_checkpoint(key)
+                checkpoint = ScrapeCheckpoint.from_dict(data) if data else None
+            except Exception as e:
+                self._stats["store_errors"] += 1
+                logger.warning(f"Tarama kaydı okunamadı '{key}': {e}")
+        if checkpoint is None or self._expired(checkpoint):
+            return None
+        return checkpoint
+
+    def save(self, checkpoint: ScrapeCheckpoint):
+        checkpoint.keyword = normalize_keyword(checkpoint.keyword)
+        checkpoint.updated_at = time.time()
+        with self._lock:
+            self._entries[checkpoint.keyword] = checkpoint
+            self._entries.move_to_end(checkpoint.keyword)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._stats["saved"] += 1
+        if self._available():
+            try:
+                self.store.store_scrape_checkpoint(checkpoint.keyword, asdict(checkpoint), self.ttl_seconds)
+            except Exception as e:
+                self._stats["store_errors"] += 1
+                logger.warning(f"Tarama kaydı yazılamadı '{checkpoint.keyword}': {e}")
+
+    def start(self, keyword: str, continue_paging: bool = False) -> Optional[ScrapeCheckpoint]:
+        """
+        Taramanın başlangıç noktasını döndürür:
+        - yarım kalmış kayıt varsa kayıtlı sonuçlarla kaldığı sayfadan,
+        - continue_paging ise tamamlanmış taramanın imlecinden (sonuçlar boş),
+        - aksi halde ilk sayfadan.
+        continue_paging istenip başka sayfa kalmadıysa None döner.
+        """
+        previous = self.load(keyword)
+        if previous is not None and previous.status == STATUS_IN_PROGRESS:
+            self._stats["resumed"] += 1
+            return ScrapeCheckpoint.from_dict(asdict(previous))
+        if continue_paging and previous is not None:
+            if previous.exhausted:
+                return None
+            self._stats["continued"] += 1
+            return ScrapeCheckpoint(
+                keyword=keyword,
+                page_number=previous.page_number,
+                processed_cases=list(previous.processed_cases),
+            )
+        return ScrapeCheckpoint(keyword=keyword)
+
+    def cursor(self, keyword: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            checkpoint = self._entries.get(normalize_keyword(keyword))
+        return checkpoint.cursor() if checkpoint else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+# Global tarama kaydı deposu
+checkpoint_store = CheckpointStore(
+    firestore_manager,
+    settings.CHECKPOINT_TTL_SECONDS,
+    settings.CHECKPOINT_MAX_ENTRIES
+)
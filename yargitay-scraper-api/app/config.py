@@ -9,8 +9,113 @@ class Settings(BaseSettings):
     USER_RATE_LIMIT: str = "10/minute"
     MAX_PAGES_TO_SEARCH: int = 5
     TARGET_RESULTS_PER_KEYWORD: int = 3
+    YARGITAY_BASE_URL: str = "https://karararama.yargitay.gov.tr"  # Karşılaştırma testlerinde yerel fixture sunucusu verilebilir
     SELENIUM_GRID_URL: str = "http://selenium-hub:4444/wd/hub"
     USE_LOCAL_CHROME: bool = True  # Google Cloud için local Chrome kullan
 
+    # Karar paneli bekleme ayarları (sabit sleep yerine içerik değişimi takibi)
+    PANEL_WAIT_TIMEOUT: float = 20.0
+    PANEL_SETTLE_MS: int = 150  # Panel metni bu süre boyunca değişmezse tamamlanmış sayılır
+    PANEL_POLL_MIN_INTERVAL: float = 0.05
+    PANEL_POLL_MAX_INTERVAL: float = 0.5
+
+    # Tek tarayıcıda eşzamanlı karar okuyan sekme sayısı (1 = sıralı işleme)
+    DECISION_TABS_PER_DRIVER: int = 1
+
+    # Süreç genelinde eşzamanlı tarayıcı (Chrome) sayısı ve bekleyen iş kuyruğu sınırı
+    MAX_BROWSER_SLOTS: int = 4
+    SCRAPER_MAX_QUEUE: int = 200
+
+    # Çalıştırma modu: "local" tarayıcıları bu süreçte çalıştırır, "queue" işleri broker üzerinden
+    # ayrı worker süreçlerine (python -m app.worker) gönderir
+    SCRAPER_EXECUTION_MODE: str = "local"
+    REDIS_URL: str = ""  # Boşsa süreç içi broker kullanılır (işleri bu süreçteki worker tüketir)
+    JOB_QUEUE_PREFIX: str = "yargitay:scraper"
+    JOB_RESULT_TIMEOUT_SECONDS: float = 900.0  # Bu sürede sonuç gelmeyen iş başarısız sayılır
+    JOB_RESULT_TTL_SECONDS: int = 600  # Alınmayan sonuç ve iptal işaretlerinin broker'da tutulma süresi
+    WORKER_HEARTBEAT_SECONDS: float = 5.0
+
+    # Ağ filtresi: arama için gereken alan adları dışındaki tüm istekler ve ağır kaynaklar engellenir
+    NETWORK_BLOCKING_ENABLED: bool = True
+    NETWORK_ALLOWED_HOSTS: str = "karararama.yargitay.gov.tr"  # Virgülle ayrılmış; script/XHR yalnızca bu alanlardan yüklenir
+    NETWORK_BLOCKED_URL_PATTERNS: str = (
+        "*.png,*.jpg,*.jpeg,*.gif,*.webp,*.svg,*.ico,*.bmp,"
+        "*.woff,*.woff2,*.ttf,*.otf,*.eot,*.css,*.mp4,*.webm,*.mp3"
+    )  # İzinli alanlarda da engellenen kaynaklar (CDP Network.setBlockedURLs desenleri)
+    NETWORK_BASELINE_SAMPLE_RATE: float = 0.0  # Tasarrufu ölçmek için filtresiz açılacak tarayıcı oranı (0-1)
+
+    # Tarayıcı süreç denetçisi: tarayıcı başına bellek tavanı, yeniden başlatma eşikleri ve yetim süreç temizliği
+    BROWSER_MAX_RSS_MB: int = 1024  # chromedriver + Chromium süreç ağacı toplamı (0 = sınırsız)
+    BROWSER_RECYCLE_AFTER_PAGES: int = 20  # Bu kadar sayfa açan tarayıcı yeniden başlatılır (0 = kapalı)
+    BROWSER_RECYCLE_RSS_GROWTH: float = 2.5  # RSS başlangıcın bu katına çıkarsa yeniden başlatılır
+    BROWSER_WATCHDOG_INTERVAL_SECONDS: float = 10.0
+    BROWSER_ORPHAN_GRACE_SECONDS: float = 120.0  # Kaydı olmayan tarayıcı süreci bu süreden eskiyse öldürülür
+
+    # Selenium Grid yerleşimi (USE_LOCAL_CHROME=false): hub durumundan boş slot okunur, oturumlar işler
+    # arasında yeniden kullanılır, Grid doluysa yerel Chromium'a düşülür
+    GRID_STATUS_TTL_SECONDS: float = 2.0  # Hub /status yanıtının önbellekte tutulma süresi
+    GRID_STATUS_TIMEOUT_SECONDS: float = 2.0
+    GRID_LOCAL_FALLBACK: bool = True
+    GRID_MAX_IDLE_SESSIONS: int = 4  # Sonraki işler için açık tutulan boştaki oturum sayısı (0 = yeniden kullanım kapalı)
+    GRID_SESSION_IDLE_SECONDS: float = 60.0  # Grid'in oturum zaman aşımından kısa olmalı
+    GRID_SESSION_MAX_REUSES: int = 20  # Bu kadar işte kullanılan oturum kapatılır
+
+    # Uyarlanabilir (AIMD) eşzamanlılık: MAX_BROWSER_SLOTS üst sınır, site yavaşlarsa slot sayısı azaltılır
+    ADAPTIVE_CONCURRENCY_ENABLED: bool = True
+    ADAPTIVE_MIN_SLOTS: int = 1
+    ADAPTIVE_INITIAL_SLOTS: int = 2
+    ADAPTIVE_WINDOW: int = 20  # Her bu kadar ölçümde bir sınır yeniden değerlendirilir
+    ADAPTIVE_DECREASE_FACTOR: float = 0.5
+    ADAPTIVE_PAGE_LATENCY_TARGET: float = 8.0  # Sonuç sayfası yükleme süresi p95 hedefi (saniye)
+    ADAPTIVE_PANEL_LATENCY_TARGET: float = 4.0  # Karar paneli yükleme süresi p95 hedefi (saniye)
+    ADAPTIVE_ERROR_RATE_THRESHOLD: float = 0.2
+
+    # Siteye yapılan isteklerin (sayfa açma, arama, sayfa geçişi, karar tıklaması) global hız tavanı
+    SITE_MAX_REQUESTS_PER_SECOND: float = 4.0  # 0 = sınırsız
+    SITE_REQUEST_BURST: int = 4
+
+    # Süreç içi (L1) arama önbelleği sınırları
+    L1_CACHE_MAX_ENTRIES: int = 1000
+    L1_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    L1_CACHE_TTL_SECONDS: int = 3600
+
+    # Stale-while-revalidate: tazelik süresi, ardından stale olarak sunulabilecek süre
+    # ve kayıtların aynı anda dolmasını önleyen rastgele sapma oranı
+    CACHE_FRESH_TTL_SECONDS: int = 24 * 3600
+    CACHE_STALE_TTL_SECONDS: int = 6 * 24 * 3600
+    CACHE_TTL_JITTER: float = 0.1
+
+    # Negatif cache: sonuç bulunamayan ve hata veren anahtar kelimeler için kısa süreler (0 = kapalı)
+    NEGATIVE_CACHE_TTL_SECONDS: int = 6 * 3600
+    FAILURE_CACHE_TTL_SECONDS: int = 300
+
+    # Popüler anahtar kelimeler için arka plan ön-tarayıcısı
+    PRECRAWL_ENABLED: bool = True
+    PRECRAWL_INTERVAL_SECONDS: int = 1800
+    PRECRAWL_OFFPEAK_HOURS: str = "1-6"  # Yerel saat aralığı, gece yarısını aşabilir (ör. "22-6")
+    PRECRAWL_TIMEZONE: str = "Europe/Istanbul"
+    PRECRAWL_LOOKBACK_DAYS: int = 7
+    PRECRAWL_RISING_WINDOW_HOURS: int = 24
+    PRECRAWL_BROWSER_BUDGET: int = 20  # Bir turda en fazla kaç anahtar kelime taranır
+    PRECRAWL_MAX_CONCURRENCY: int = 2  # Ön-tarama için aynı anda kullanılabilecek tarayıcı sayısı
+
+    # Tarama kayıtları: sayfa bazlı ilerleme, tarayıcı çökmesinde ve sonraki isteklerde kaldığı yerden devam
+    CHECKPOINT_TTL_SECONDS: int = 6 * 3600
+    CHECKPOINT_MAX_ENTRIES: int = 1000
+    CHECKPOINT_MAX_DRIVER_RESTARTS: int = 2  # Bir tarama içinde çöken tarayıcının en fazla kaç kez yenileneceği
+
+    # Korpus taraması: kelime sonuç sayfaları bitene kadar tarama imlecinden (continue_paging) taranır
+    CORPUS_CRAWL_MAX_SCRAPES: int = 10  # Kelime başına bir çağrıdaki tarama hakkı; dolarsa sonraki çağrı kaldığı yerden sürer
+
+    # İstemci bağlantısı kopma kontrolü aralığı (kopan isteklerin taramaları iptal edilir)
+    CLIENT_DISCONNECT_POLL_SECONDS: float = 0.5
+
+    # Korpus üzerinde yerel tam metin indeksi (BM25)
+    TEXT_INDEX_ENABLED: bool = True
+    TEXT_INDEX_DIR: str = "/tmp/yargitay-text-index"  # Cloud Run'da yalnızca /tmp yazılabilir
+    TEXT_INDEX_MIN_HITS: int = 3  # Bu kadar eşleşme varsa Selenium'a gidilmez
+    TEXT_INDEX_FLUSH_THRESHOLD: int = 200  # Bekleyen karar sayısı bu değere ulaşınca segment yeniden yazılır
+    TEXT_INDEX_REBUILD_ON_STARTUP: bool = True  # İndeks boşsa açılışta Firestore korpusundan oluştur
+
 # Ayarları import edilebilir bir nesne olarak oluştur
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+Yargıtay Karar Korpusu
+Taranan her karar, daire/esas/karar numarasından türetilen kalıcı bir ID ile
+yargitay_decisions koleksiyonuna bir kez yazılır. Metin özeti (content_hash)
+değişmediyse kayıt yeniden yazılmaz. Tarih aralığına göre artımlı tarama ve
+anahtar kelime bazlı tarama durumu (watermark) desteklenir; tarama sonuç sayfalarının
+sonuna ulaşmadan watermark ilerlemez.
+"""
+import asyncio
+import hashlib
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+from .cache import normalize_keyword
+
+_WHITESPACE = re.compile(r"\s+")
+_DATE_PATTERN = re.compile(r"(\d{1,2})[./-](\d{1,2})[./-](\d{4})")
+
+
+def decision_key(daire: str, esas_no: str, karar_no: str) -> str:
+    """Daire, esas ve karar numarasından kalıcı karar ID'si üretir."""
+    parts = [_WHITESPACE.sub(" ", (p or "").strip()).casefold() for p in (daire, esas_no, karar_no)]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def content_hash(text: str) -> str:
+    """Karar metninin boşluk farklarından etkilenmeyen SHA-256 özeti."""
+    return hashlib.sha256(_WHITESPACE.sub(" ", text or "").strip().encode("utf-8")).hexdigest()
+
+
+def parse_decision_date(value: str) -> Optional[datetime]:
+    """'31.12.2024' biçimindeki karar tarihini datetime'a çevirir."""
+    match = _DATE_PATTERN.search(value or "")
+    if not match:
+        return None
+    day, month, year = (int(g) for g in match.groups())
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+def to_corpus_document(result: Dict[str, Any], keyword: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Scraper sonucunu korpus belgesine çevirir. Alan adları YargitayDecision modeli
+    (court, date, number, title, content, keywords) ile uyumludur.
+    """
+    text = result.get("karar_metni") or result.get("content") or ""
+    if not text or text in ("Karar metni bulunamadı.", "Karar metni alınamadı."):
+        return None
+
+    daire = result.get("daire") or result.get("court") or ""
+    esas_no = result.get("esas_no") or result.get("case_number") or ""
+    karar_no = result.get("karar_no") or ""
+    keywords = {normalize_keyword(k) for k in (keyword, result.get("keyword")) if k}
+
+    return {
+        "decision_id": decision_key(daire, esas_no, karar_no),
+        "court": daire,
+        "esas_no": esas_no,
+        "karar_no": karar_no,
+        "number": karar_no,
+        "karar_tarihi": result.get("karar_tarihi") or result.get("date") or "",
+        "date": parse_decision_date(result.get("karar_tarihi") or result.get("date") or ""),
+        "title": f"{daire} - {karar_no}",
+        "content": text,
+        "content_hash": content_hash(text),
+        "keywords": sorted(keywords),
+        "source_url": result.get("url"),
+    }
+
+
+def in_date_range(decision: Dict[str, Any], date_from: Optional[date], date_to: Optional[date]) -> bool:
+    """Karar tarihi aralıkta mı? Tarihi okunamayan kararlar yalnızca aralık verilmediğinde kabul edilir."""
+    if not date_from and not date_to:
+        return True
+    decided = decision.get("date")
+    if not decided:
+        return False
+    if date_from and decided.date() < date_from:
+        return False
+    if date_to and decided.date() > date_to:
+        return False
+    return True
+
+
+class CorpusIngestor:
+    """Taranan kararları korpusa aktaran ve artımlı taramayı yöneten sınıf"""
+
+    def __init__(self, store, index=None, index_flush_threshold: int = 200):
+        self.store = store
+        self.index = index
+        self.index_flush_threshold = index_flush_threshold
+        self._pending: Set[asyncio.Task] = set()
+        self._stats = {"batches": 0, "new": 0, "updated": 0, "unchanged": 0, "skipped": 0, "errors": 0}
+
+    def _available(self) -> bool:
+        return getattr(self.store, "client", None) is not None
+
+    async def ingest(
+        self,
+        results: Iterable[Dict[str, Any]],
+        keyword: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Dict[str, int]:
+        """Sonuçları korpusa yazar; aynı karar bir partide birden çok kez gelirse tekilleştirir."""
+        documents: Dict[str, Dict[str, Any]] = {}
+        skipped = 0
+        for result in results:
+            document = to_corpus_document(result, keyword)
+            if not document or not in_date_range(document, date_from, date_to):
+                skipped += 1
+                continue
+            if document["decision_id"] in documents:
+                merged = set(documents[document["decision_id"]]["keywords"]) | set(document["keywords"])
+                documents[document["decision_id"]]["keywords"] = sorted(merged)
+            else:
+                documents[document["decision_id"]] = document
+
+        if documents and self.index is not None:
+            await self._index_documents(list(documents.values()))
+
+        summary = {"new": 0, "updated": 0, "unchanged": 0}
+        if documents and self._available():
+            try:
+                summary = await self.store.save_decisions(list(documents.values()))
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Korpus kaydı başarısız: {e}")
+        summary["skipped"] = skipped
+
+        self._stats["batches"] += 1
+        for field in ("new", "updated", "unchanged", "skipped"):
+            self._stats[field] += summary.get(field, 0)
+        return summary
+
+    async def _index_documents(self, documents: List[Dict[str, Any]]):
+        """Belgeleri yerel metin indeksine ekler; bekleyenler eşiği aşınca diske birleştirir."""
+        try:
+            # Tokenleştirme ve indeks kilidi event loop'u bloklamasın
+            await asyncio.to_thread(self.index.add_documents, documents)
+            if self.index.pending_count >= self.index_flush_threshold:
+                await asyncio.to_thread(self.index.flush)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Yerel indeks güncellemesi başarısız: {e}")
+
+    def ingest_in_background(self, results: List[Dict[str, Any]], keyword: Optional[str] = None):
+        """Arama yanıtını geciktirmeden korpus kaydını arka planda başlatır."""
+        if not results or (not self._available() and self.index is None):
+            return
+        task = asyncio.create_task(self.ingest(results, keyword))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def crawl(
+        self,
+        keyword: str,
+        scrape_fn,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        max_scrapes: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Anahtar kelimeyi sayfa sayfa tarar ve aralıktaki kararları korpusa ekler.
+        scrape_fn(keyword, continue_paging) tek bir tarama yapar; ilk taramadan sonra tarama
+        imlecinden devam edilir. Sonuçlar alaka sırasıyla geldiğinden tarih aralığı taramayı erken
+        bitiremez: sonuç sayfaları bitene ya da max_scrapes hakkı dolana kadar sürer.
+        date_from verilmezse önceki tamamlanmış taramanın en yeni karar tarihinden (watermark)
+        devam edilir. Watermark yalnızca sonuçların sonuna ulaşan taramada ilerler; yarım kalan
+        tarama bir sonraki çağrıda imleçten sürer, böylece aralıktaki eski kararlar atlanmaz.
+        """
+        keyword = normalize_keyword(keyword)
+        state = (await self.store.get_crawl_state(keyword) if self._available() else None) or {}
+        if date_from is None and state.get("newest_decision_date"):
+            watermark = state["newest_decision_date"]
+            date_from = watermark.date() if isinstance(watermark, datetime) else watermark
+
+        resume = bool(state.get("in_progress"))
+        summary = {"new": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        dates = [
+            value.replace(tzinfo=None) for value in (state.get("pending_newest_decision_date"),)
+            if resume and isinstance(value, datetime)
+        ]
+        scrapes = result_count = 0
+        complete, success, message = False, True, ""
+        while scrapes < max_scrapes:
+            _, results, success, message = await scrape_fn(keyword, resume or scrapes > 0)
+            scrapes += 1
+            if not success:
+                break
+            if not results:
+                complete = True  # İmlecin devam edecek sayfası kalmadı
+                break
+            result_count += len(results)
+            batch = await self.ingest(results, keyword, date_from, date_to)
+            for field in summary:
+                summary[field] += batch.get(field, 0)
+            dates.extend(d for d in (parse_decision_date(r.get("karar_tarihi", "")) for r in results) if d)
+
+        previous = state.get("newest_decision_date")
+        if self._available() and (complete or result_count):
+            if complete:
+                if isinstance(previous, datetime):
+                    dates.append(previous.replace(tzinfo=None))
+                crawl_state = {
+                    "newest_decision_date": max(dates, default=None),
+                    "pending_newest_decision_date": None,
+                    "in_progress": False,
+                }
+            else:
+                crawl_state = {"pending_newest_decision_date": max(dates, default=None), "in_progress": True}
+            await self.store.save_crawl_state(keyword, {
+                **crawl_state,
+                "last_crawled_at": datetime.utcnow(),
+                "last_result_count": result_count,
+            })
+
+        return {
+            "keyword": keyword,
+            "success": success,
+            "message": message,
+            "complete": complete,
+            "scrapes": scrapes,
+            "date_from": date_from.isoformat() if date_from else None,
+            "date_to": date_to.isoformat() if date_to else None,
+            **summary,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pending_batches": len(self._pending)}
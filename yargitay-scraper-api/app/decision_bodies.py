@@ -0,0 +1,62 @@
+"""
+İçerik Adresli Karar Metinleri
+Cache kayıtları (keyword_cache, search_cache) eskiden her sonucun tam metnini (karar_metni) ve
+aynı metnin bir kopyasını (content) taşıyordu; aynı karar onlarca kayıtta tekrarlanıyor ve
+kayıtlar Firestore'un 1 MiB belge sınırına yaklaşıyordu. Metinler artık decision_bodies
+koleksiyonunda içerik özetiyle (sha256) bir kez saklanır; cache kayıtlarındaki sonuçlar
+yalnızca body_refs alanında alan adı -> özet referansı tutar. Okumada referanslar tek bir
+toplu get_all ile çözülür. body_refs taşımayan eski kayıtlar olduğu gibi okunur. Referansı
+çözülemeyen kayıt cache ıskası sayılır; boş metinle dönmek yerine kelime yeniden taranır.
+"""
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Metni ayrı saklanan sonuç alanları (content çoğunlukla karar_metni'nin kopyasıdır)
+BODY_FIELDS = ("karar_metni", "content")
+
+
+def body_key(text: str) -> str:
+    """Metnin birebir sha256 özeti (metin okumada aynen geri döner)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def externalize_bodies(results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Sonuçlardaki metinleri referansla değiştirir; (referanslı sonuçlar, özet -> metin) döner."""
+    stripped, bodies = [], {}
+    for result in results:
+        item = dict(result)
+        refs = {}
+        for field in BODY_FIELDS:
+            text = item.pop(field, None)
+            if text:
+                key = body_key(text)
+                bodies[key] = text
+                refs[field] = key
+            elif text is not None:
+                item[field] = text
+        if refs:
+            item["body_refs"] = refs
+        stripped.append(item)
+    return stripped, bodies
+
+
+def body_refs(results: Iterable[Dict[str, Any]]) -> Set[str]:
+    """Sonuçların başvurduğu metin özetleri"""
+    return {key for result in results for key in (result.get("body_refs") or {}).values()}
+
+
+def resolve_bodies(results: List[Dict[str, Any]], bodies: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+    """Referansları metinlerle değiştirir; herhangi bir metin bulunamazsa None döner."""
+    resolved = []
+    for result in results:
+        refs = result.get("body_refs")
+        if not refs:
+            resolved.append(result)
+            continue
+        if any(key not in bodies for key in refs.values()):
+            return None
+        item = {key: value for key, value in result.items() if key != "body_refs"}
+        for field, key in refs.items():
+            item[field] = bodies[key]
+        resolved.append(item)
+    return resolved
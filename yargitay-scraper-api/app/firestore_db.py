@@ -2,14 +2,20 @@
 Google Cloud Firestore Database Configuration for Scraper API
 """
 import os
+import asyncio
 import hashlib
-from typing import Optional, List, Dict, Any
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Iterator
 from datetime import datetime, timedelta
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
 from loguru import logger
 from dotenv import load_dotenv
 
+from .cache import normalize_keyword, keyword_cache_key
+from .decision_bodies import body_refs, externalize_bodies, resolve_bodies
+
 load_dotenv()
 
 
@@ -20,6 +26,10 @@ class FirestoreManager:
         self.client: Optional[firestore.Client] = None
         self.project_id = os.getenv("GCP_PROJECT_ID")
         self.database_id = os.getenv("FIRESTORE_DATABASE_ID", "(default)")
+        # Bu süreçte yazıldığı/okunduğu bilinen karar metni özetleri ve Firestore'daki süre sonları
+        # (süre sonu yeterliyse tekrar varlık kontrolü yapılmaz)
+        self._known_bodies: "OrderedDict[str, Optional[datetime]]" = OrderedDict()
+        self._known_bodies_lock = threading.Lock()
         
     def connect(self) -> bool:
         """Firestore'a bağlan"""
@@ -164,10 +174,244 @@ class FirestoreManager:
             logger.error(f"Yargıtay arama hatası: {e}")
             return []
     
+    # Decision Corpus
+    def upsert_decisions(self, decisions: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Kararları decision_id ile toplu olarak kaydet (senkron).
+        Mevcut kayıtlar tek get_all ile okunur; content_hash aynıysa metin yeniden yazılmaz,
+        yalnızca yeni anahtar kelimeler eklenir.
+        """
+        summary = {"new": 0, "updated": 0, "unchanged": 0}
+        if not decisions:
+            return summary
+
+        decisions_ref = self.client.collection('yargitay_decisions')
+        by_id = {d['decision_id']: d for d in decisions}
+        existing = {
+            doc.id: doc.to_dict()
+            for doc in self.client.get_all(
+                [decisions_ref.document(decision_id) for decision_id in by_id],
+                field_paths=['content_hash', 'keywords']
+            )
+            if doc.exists
+        }
+
+        batch = self.client.batch()
+        writes = 0
+        for decision_id, decision in by_id.items():
+            doc_ref = decisions_ref.document(decision_id)
+            current = existing.get(decision_id)
+            if current and current.get('content_hash') == decision['content_hash']:
+                new_keywords = set(decision.get('keywords', [])) - set(current.get('keywords') or [])
+                if new_keywords:
+                    batch.update(doc_ref, {'keywords': firestore.ArrayUnion(sorted(new_keywords))})
+                    writes += 1
+                summary["unchanged"] += 1
+                continue
+
+            data = {**decision, 'updated_at': firestore.SERVER_TIMESTAMP}
+            if current:
+                data['keywords'] = firestore.ArrayUnion(decision.get('keywords', []))
+                summary["updated"] += 1
+            else:
+                data['created_at'] = firestore.SERVER_TIMESTAMP
+                summary["new"] += 1
+            batch.set(doc_ref, data, merge=True)
+            writes += 1
+
+            # Batch size limit (500)
+            if writes >= 500:
+                batch.commit()
+                batch = self.client.batch()
+                writes = 0
+
+        if writes:
+            batch.commit()
+
+        logger.info(f"Karar korpusu güncellendi: {summary}")
+        return summary
+
+    def fetch_crawl_state(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """Anahtar kelimenin korpus tarama durumunu getir (senkron)"""
+        doc = self.client.collection('corpus_crawl_state').document(keyword_cache_key(keyword)).get()
+        return doc.to_dict() if doc.exists else None
+
+    def store_crawl_state(self, keyword: str, state: Dict[str, Any]):
+        """Anahtar kelimenin korpus tarama durumunu kaydet (senkron)"""
+        self.client.collection('corpus_crawl_state').document(keyword_cache_key(keyword)).set(
+            {**state, 'keyword': normalize_keyword(keyword), 'updated_at': firestore.SERVER_TIMESTAMP},
+            merge=True
+        )
+
+    def fetch_scrape_checkpoint(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """Anahtar kelimenin tarama kaydını getir (senkron)"""
+        doc = self.client.collection('scraper_checkpoints').document(keyword_cache_key(keyword)).get()
+        return doc.to_dict() if doc.exists else None
+
+    def store_scrape_checkpoint(self, keyword: str, checkpoint: Dict[str, Any], ttl_seconds: float):
+        """Anahtar kelimenin tarama kaydını yaz (senkron)"""
+        self.client.collection('scraper_checkpoints').document(keyword_cache_key(keyword)).set({
+            **checkpoint,
+            'expires_at': datetime.utcnow() + timedelta(seconds=ttl_seconds),
+        })
+
+    def fetch_corpus_stats(self) -> Dict[str, Any]:
+        """Korpus istatistiklerini getir (senkron)"""
+        try:
+            decisions_ref = self.client.collection('yargitay_decisions')
+            total = decisions_ref.count().get()[0][0].value
+            newest = list(
+                decisions_ref.order_by('date', direction=firestore.Query.DESCENDING).limit(1)
+                .select(['date']).stream()
+            )
+            crawl_states = [doc.to_dict() for doc in self.client.collection('corpus_crawl_state').stream()]
+            return {
+                'total_decisions': total,
+                'newest_decision_date': newest[0].to_dict().get('date') if newest else None,
+                'tracked_keywords': len(crawl_states),
+                'last_crawl': max(
+                    (state.get('last_crawled_at') for state in crawl_states if state.get('last_crawled_at')),
+                    default=None
+                ),
+            }
+        except Exception as e:
+            logger.error(f"Korpus istatistikleri alınamadı: {e}")
+            return {}
+
+    def iter_decisions(self, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Korpustaki tüm kararları sayfalı olarak dolaş (senkron)"""
+        decisions_ref = self.client.collection('yargitay_decisions').order_by('__name__')
+        last_doc = None
+        while True:
+            query = decisions_ref.limit(page_size)
+            if last_doc is not None:
+                query = query.start_after(last_doc)
+            docs = list(query.stream())
+            for doc in docs:
+                yield {**doc.to_dict(), 'decision_id': doc.id}
+            if len(docs) < page_size:
+                return
+            last_doc = docs[-1]
+
+    async def save_decisions(self, decisions: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Kararları toplu olarak kaydet"""
+        return await asyncio.to_thread(self.upsert_decisions, decisions)
+
+    async def get_crawl_state(self, keyword: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.fetch_crawl_state, keyword)
+
+    async def save_crawl_state(self, keyword: str, state: Dict[str, Any]):
+        await asyncio.to_thread(self.store_crawl_state, keyword, state)
+
+    async def get_corpus_stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.fetch_corpus_stats)
+
     async def get_decisions_by_keywords(self, keywords: List[str], limit: int = 50) -> List[Dict[str, Any]]:
         """Anahtar kelimelere göre kararları getir"""
         return await self.search_yargitay_decisions(keywords=keywords, limit=limit)
     
+    # Decision Bodies (içerik adresli karar metinleri)
+    KNOWN_BODIES_LIMIT = 20000
+    # Metnin süre sonu, başvuran en uzun ömürlü cache kaydının süre sonundan bu kadar sonradır;
+    # aynı metne bu aralıkta yapılan yeni başvurular yeniden yazma gerektirmez
+    BODY_EXPIRY_SLACK = timedelta(days=1)
+
+    def _remember_bodies(self, expiries: Dict[str, Optional[datetime]]):
+        with self._known_bodies_lock:
+            for key, expires_at in expiries.items():
+                self._known_bodies[key] = expires_at.replace(tzinfo=None) if expires_at else None
+                self._known_bodies.move_to_end(key)
+            while len(self._known_bodies) > self.KNOWN_BODIES_LIMIT:
+                self._known_bodies.popitem(last=False)
+
+    def store_decision_bodies(self, bodies: Dict[str, str], expires_at: datetime) -> int:
+        """
+        Karar metinlerini decision_bodies koleksiyonuna özetleriyle kaydet (senkron).
+        Metinler değişmez ve cache kayıtları arasında paylaşılır; yalnızca eksik olanlar yazılır.
+        Her metnin expires_at alanı kendisine başvuran cache kayıtlarının en geç süre sonunu
+        (expires_at) kapsayacak şekilde uzatılır; hiçbir kaydın başvurmadığı metinler
+        cleanup_expired_cache ile silinir. Yazılan (veya süresi uzatılan) metin sayısını döner.
+        """
+        required = expires_at.replace(tzinfo=None)
+        with self._known_bodies_lock:
+            unknown = [
+                key for key in bodies
+                if key not in self._known_bodies or (self._known_bodies[key] or datetime.min) < required
+            ]
+        if not unknown:
+            return 0
+
+        bodies_ref = self.client.collection('decision_bodies')
+        existing = {
+            doc.id: doc.to_dict().get('expires_at')
+            for doc in self.client.get_all([bodies_ref.document(key) for key in unknown], field_paths=['expires_at'])
+            if doc.exists
+        }
+
+        body_expires_at = required + self.BODY_EXPIRY_SLACK
+        batch = self.client.batch()
+        writes = 0
+        expiries = {}
+        for key in unknown:
+            current = existing.get(key)
+            if current is not None and current.replace(tzinfo=None) >= required:
+                expiries[key] = current
+                continue
+            if key in existing:
+                # Eski (süre sonu olmayan) veya daha kısa ömürlü metin: yalnızca süre sonu uzatılır
+                batch.update(bodies_ref.document(key), {'expires_at': body_expires_at})
+            else:
+                batch.set(bodies_ref.document(key), {
+                    'text': bodies[key],
+                    'size': len(bodies[key]),
+                    'created_at': firestore.SERVER_TIMESTAMP,
+                    'expires_at': body_expires_at
+                })
+            expiries[key] = body_expires_at
+            writes += 1
+
+            # Batch size limit (500)
+            if writes % 500 == 0:
+                batch.commit()
+                batch = self.client.batch()
+
+        if writes % 500 != 0:
+            batch.commit()
+
+        self._remember_bodies(expiries)
+        return writes
+
+    def fetch_decision_bodies(self, keys) -> Dict[str, str]:
+        """Karar metinlerini özetlerine göre tek get_all ile getir (senkron)"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        bodies_ref = self.client.collection('decision_bodies')
+        bodies, expiries = {}, {}
+        for doc in self.client.get_all([bodies_ref.document(key) for key in keys]):
+            if doc.exists:
+                data = doc.to_dict()
+                bodies[doc.id] = data.get('text', '')
+                expiries[doc.id] = data.get('expires_at')
+        missing = [key for key in keys if key not in bodies]
+        if missing:
+            logger.warning(f"{len(missing)} karar metni decision_bodies koleksiyonunda bulunamadı")
+            # Yeniden taramada bu metinler tekrar yazılsın
+            with self._known_bodies_lock:
+                for key in missing:
+                    self._known_bodies.pop(key, None)
+        self._remember_bodies(expiries)
+        return bodies
+
+    def _externalize_results(self, results: List[Dict[str, Any]], expires_at: datetime) -> List[Dict[str, Any]]:
+        """
+        Metinleri decision_bodies'e yazar (en az expires_at'e kadar saklanır), cache kaydına
+        girecek referanslı sonuçları döner.
+        """
+        stripped, bodies = externalize_bodies(results)
+        self.store_decision_bodies(bodies, expires_at)
+        return stripped
+
     # Search Cache Management
     async def save_search_cache(
         self, 
@@ -183,16 +427,17 @@ class FirestoreManager:
             keywords_str = '_'.join(sorted(keywords))
             keywords_hash = hashlib.md5(keywords_str.encode()).hexdigest()
             
+            expires_at = datetime.utcnow() + timedelta(days=7)
             cache_data = {
                 'keywords_hash': keywords_hash,
                 'keywords': keywords,
-                'search_results': results,
+                'search_results': await asyncio.to_thread(self._externalize_results, results, expires_at),
                 'total_results': len(results),
                 'search_duration': search_duration,
                 'hit_count': 1,
                 'created_at': firestore.SERVER_TIMESTAMP,
                 'last_used': firestore.SERVER_TIMESTAMP,
-                'expires_at': datetime.utcnow() + timedelta(days=7)
+                'expires_at': expires_at
             }
             
             # Cache'e kaydet
@@ -220,12 +465,20 @@ class FirestoreManager:
                 
                 # Expiry kontrolü
                 if cache_data.get('expires_at') and cache_data['expires_at'] > datetime.utcnow():
+                    results = cache_data.get('search_results') or []
+                    bodies = await asyncio.to_thread(self.fetch_decision_bodies, body_refs(results))
+                    resolved = resolve_bodies(results, bodies)
+                    if resolved is None:
+                        # Karar metni eksik kayıt ıska sayılır; arama yeniden yapılıp kayıt yenilenir
+                        logger.warning(f"Arama cache kaydının karar metinleri eksik, yok sayılıyor: {keywords_hash}")
+                        return None
+
                     # Hit count'u artır
                     doc_ref.update({
                         'hit_count': firestore.Increment(1),
                         'last_used': firestore.SERVER_TIMESTAMP
                     })
-                    
+                    cache_data['search_results'] = resolved
                     return cache_data
                 else:
                     # Expired cache'i sil
@@ -237,6 +490,121 @@ class FirestoreManager:
             logger.error(f"Arama cache getirme hatası: {e}")
             return None
     
+    # Keyword Cache Management
+    # Senkron Firestore istemcisi event loop'u bloklamasın diye async metotlar
+    # işi asyncio.to_thread ile ayrı bir thread'de yapar.
+    def store_keyword_cache(
+        self,
+        keyword: str,
+        results: List[Dict[str, Any]],
+        search_duration: float,
+        fresh_until: Optional[datetime] = None,
+        expires_at: Optional[datetime] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Tek bir anahtar kelimenin sonuçlarını cache'e kaydet (senkron).
+        fresh_until sonrasında kayıt stale kabul edilir, expires_at sonrasında silinir.
+        metadata ek alanları (ör. negatif cache bilgisi) kayda ekler.
+        Karar metinleri decision_bodies'e bir kez yazılır, kayıtta yalnızca referansları tutulur.
+        """
+        try:
+            cache_key = keyword_cache_key(keyword)
+            expires_at = expires_at or datetime.utcnow() + timedelta(days=7)
+            cache_data = {
+                'keyword': normalize_keyword(keyword),
+                'search_results': self._externalize_results(results, expires_at),
+                'total_results': len(results),
+                'search_duration': search_duration,
+                'hit_count': 1,
+                'created_at': firestore.SERVER_TIMESTAMP,
+                'last_used': firestore.SERVER_TIMESTAMP,
+                'fresh_until': fresh_until or expires_at,
+                'expires_at': expires_at,
+                **(metadata or {})
+            }
+
+            self.client.collection('keyword_cache').document(cache_key).set(cache_data)
+
+            logger.info(f"Anahtar kelime cache'e kaydedildi: {cache_data['keyword']}")
+            return cache_key
+
+        except Exception as e:
+            logger.error(f"Anahtar kelime cache kaydetme hatası: {e}")
+            raise
+
+    def fetch_keyword_caches(self, keywords: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Birden çok anahtar kelimenin cache kayıtlarını tek seferde getir (senkron).
+        Dönen sözlük normalize edilmiş anahtar kelime -> cache verisi eşlemesidir;
+        süresi dolmuş, bulunmayan ya da karar metni referansı çözülemeyen kelimeler sözlükte
+        yer almaz. Tüm kayıtların karar metni referansları tek get_all ile çözülür.
+        """
+        try:
+            cache_ref = self.client.collection('keyword_cache')
+            refs = {keyword_cache_key(k): normalize_keyword(k) for k in keywords}
+            doc_refs = [cache_ref.document(key) for key in refs]
+
+            found, references = {}, {}
+            now = datetime.utcnow()
+            batch = self.client.batch()
+            pending_writes = 0
+            for doc in self.client.get_all(doc_refs):
+                if not doc.exists:
+                    continue
+                cache_data = doc.to_dict()
+                expires_at = cache_data.get('expires_at')
+                if expires_at and expires_at.replace(tzinfo=None) > now:
+                    found[refs[doc.id]] = cache_data
+                    references[refs[doc.id]] = doc.reference
+                else:
+                    batch.delete(doc.reference)
+                    pending_writes += 1
+
+            bodies = self.fetch_decision_bodies(
+                body_refs(result for cache_data in found.values() for result in cache_data.get('search_results') or [])
+            )
+            for keyword, cache_data in list(found.items()):
+                resolved = resolve_bodies(cache_data.get('search_results') or [], bodies)
+                if resolved is None:
+                    # Karar metni eksik kayıt ıska sayılır; kelime yeniden taranıp kayıt yenilenir
+                    logger.warning(f"'{keyword}' cache kaydının karar metinleri eksik, yok sayılıyor")
+                    del found[keyword]
+                    continue
+                cache_data['search_results'] = resolved
+                batch.update(references[keyword], {
+                    'hit_count': firestore.Increment(1),
+                    'last_used': firestore.SERVER_TIMESTAMP
+                })
+                pending_writes += 1
+
+            if pending_writes:
+                batch.commit()
+
+            return found
+
+        except Exception as e:
+            logger.error(f"Anahtar kelime cache getirme hatası: {e}")
+            return {}
+
+    async def save_keyword_cache(
+        self,
+        keyword: str,
+        results: List[Dict[str, Any]],
+        search_duration: float,
+        fresh_until: Optional[datetime] = None,
+        expires_at: Optional[datetime] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Tek bir anahtar kelimenin sonuçlarını cache'e kaydet"""
+        return await asyncio.to_thread(
+            self.store_keyword_cache, keyword, results, search_duration, fresh_until, expires_at, metadata
+        )
+
+    async def get_keyword_caches(self, keywords: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Birden çok anahtar kelimenin cache kayıtlarını tek seferde getir"""
+        return await asyncio.to_thread(self.fetch_keyword_caches, keywords)
+
     # Search Query Logging
     async def log_search_query(
         self, 
@@ -270,6 +638,26 @@ class FirestoreManager:
             logger.error(f"Arama sorgusu loglama hatası: {e}")
             raise
     
+    def fetch_recent_search_queries(self, since: datetime, limit: int = 5000) -> List[Dict[str, Any]]:
+        """Belirtilen tarihten sonraki arama sorgularının anahtar kelimelerini getir (senkron)"""
+        try:
+            query = (
+                self.client.collection('search_queries')
+                .where(filter=FieldFilter('created_at', '>=', since))
+                .order_by('created_at', direction=firestore.Query.DESCENDING)
+                .select(['keywords', 'created_at'])
+                .limit(limit)
+            )
+            return [doc.to_dict() for doc in query.stream()]
+
+        except Exception as e:
+            logger.error(f"Arama sorguları getirilemedi: {e}")
+            return []
+
+    async def get_recent_search_queries(self, since: datetime, limit: int = 5000) -> List[Dict[str, Any]]:
+        """Belirtilen tarihten sonraki arama sorgularını getir"""
+        return await asyncio.to_thread(self.fetch_recent_search_queries, since, limit)
+
     # Statistics
     async def get_scraper_stats(self) -> Dict[str, Any]:
         """Scraper istatistikleri"""
@@ -300,6 +688,10 @@ class FirestoreManager:
             now = datetime.utcnow()
             active_cache = cache_ref.where('expires_at', '>', now).get()
             stats['active_cache'] = len(list(active_cache))
+
+            # Keyword cache stats
+            keyword_cache_ref = self.client.collection('keyword_cache')
+            stats['keyword_cache_entries'] = len(list(keyword_cache_ref.select([]).get()))
             
             return stats
             
@@ -309,25 +701,30 @@ class FirestoreManager:
     
     # Cleanup Operations
     async def cleanup_expired_cache(self) -> int:
-        """Süresi dolmuş cache'leri temizle"""
+        """
+        Süresi dolmuş cache'leri temizle. Karar metinlerinin (decision_bodies) süre sonu,
+        kendilerine başvuran cache kayıtlarının en geç süre sonuna göre uzatıldığından süresi
+        dolan metne artık hiçbir kayıt başvurmaz. Silme ile eşzamanlı yeni bir başvuru olursa
+        çözülemeyen referans cache ıskası sayılır ve metin yeniden taramada tekrar yazılır.
+        """
         try:
-            cache_ref = self.client.collection('search_cache')
             now = datetime.utcnow()
             
-            # Expired cache'leri bul
-            expired_docs = cache_ref.where('expires_at', '<=', now).get()
-            
             deleted_count = 0
             batch = self.client.batch()
             
-            for doc in expired_docs:
-                batch.delete(doc.reference)
-                deleted_count += 1
+            for collection in ('search_cache', 'keyword_cache', 'scraper_checkpoints', 'decision_bodies'):
+                # Expired cache'leri bul
+                expired_docs = self.client.collection(collection).where('expires_at', '<=', now).get()
                 
-                # Batch size limit (500)
-                if deleted_count % 500 == 0:
-                    batch.commit()
-                    batch = self.client.batch()
+                for doc in expired_docs:
+                    batch.delete(doc.reference)
+                    deleted_count += 1
+                    
+                    # Batch size limit (500)
+                    if deleted_count % 500 == 0:
+                        batch.commit()
+                        batch = self.client.batch()
             
             # Remaining deletes
             if deleted_count % 500 != 0:
@@ -0,0 +1,273 @@
+"""
+Selenium Grid Yerleşim İstemcisi
+USE_LOCAL_CHROME=false iken her tarayıcı Grid'e körlemesine açılıyordu; düğümler doluyken hub
+yeni oturumu kuyruğa alır ve oturum bekleme süresi tarama süresini aşabilir. Bu modül:
+- Hub /status yanıtından düğüm başına boş Chrome slotlarını okur (kısa süreli önbellekle).
+- Oturum açılırken slotu yerel olarak rezerve eder; /status gecikmesi nedeniyle aşırı yükleme olmaz.
+- Biten işlerin sağlıklı oturumlarını boşta tutar, sonraki iş yeni oturum açmadan bunları kullanır.
+- Grid doluysa (veya hub erişilemezse) yerel Chromium'a düşülmesi için karar verir.
+Düğüm seçimini hub'ın dağıtıcısı yapar; istemci yalnızca kapasite olduğunda Grid'e iş gönderir.
+"""
+import json
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from urllib.request import urlopen
+
+from loguru import logger
+
+from .config import settings
+
+CHROME_BROWSERS = ("chrome", "chromium")
+
+
+def parse_grid_status(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Selenium 4 /status yanıtından kapasite özetini çıkarır. Düğüm bilgisi olmayan
+    yanıtlarda (Selenium 3) "nodes" boş, "free" None döner.
+    """
+    value = payload.get("value", {})
+    nodes = []
+    for node in value.get("nodes", []) or []:
+        slots = node.get("slots", []) or []
+        chrome_slots = [
+            slot for slot in slots
+            if (slot.get("stereotype") or {}).get("browserName", "").lower() in CHROME_BROWSERS
+        ] or slots
+        busy = sum(1 for slot in slots if slot.get("session"))
+        free_chrome = sum(1 for slot in chrome_slots if not slot.get("session"))
+        max_sessions = node.get("maxSessions") or len(slots)
+        up = node.get("availability", "UP") == "UP"
+        nodes.append({
+            "id": node.get("id") or node.get("uri"),
+            "uri": node.get("uri"),
+            "up": up,
+            "total": len(chrome_slots),
+            "busy": busy,
+            "free": max(0, min(free_chrome, max_sessions - busy)) if up else 0,
+        })
+    return {
+        "ready": bool(value.get("ready")),
+        "nodes": nodes,
+        "free": sum(node["free"] for node in nodes) if nodes else None,
+        "total": sum(node["total"] for node in nodes),
+    }
+
+
+def fetch_grid_status(grid_url: str, timeout: float) -> Dict[str, Any]:
+    """Hub /status uç noktasını okur (SELENIUM_GRID_URL /wd/hub önekli olabilir)."""
+    with urlopen(f"{grid_url.rstrip('/')}/status", timeout=timeout) as response:
+        return parse_grid_status(json.loads(response.read().decode("utf-8")))
+
+
+@dataclass
+class IdleSession:
+    driver: Any
+    key: str
+    uses: int
+    idle_since: float = field(default_factory=time.monotonic)
+
+
+class GridClient:
+    """Grid kapasitesine göre oturum yerleştiren ve boştaki oturumları yeniden kullanan istemci"""
+
+    def __init__(
+        self,
+        grid_url: str,
+        status_ttl: float = 2.0,
+        status_timeout: float = 2.0,
+        max_idle_sessions: int = 4,
+        idle_seconds: float = 60.0,
+        max_reuses: int = 20,
+        fetch_status: Optional[Callable[[], Dict[str, Any]]] = None
+    ):
+        self.grid_url = grid_url
+        self.status_ttl = status_ttl
+        self.max_idle_sessions = max_idle_sessions
+        self.idle_seconds = idle_seconds
+        self.max_reuses = max_reuses
+        self._fetch_status = fetch_status or (lambda: fetch_grid_status(grid_url, status_timeout))
+        self._lock = threading.Lock()
+        self._status: Optional[Dict[str, Any]] = None
+        self._status_at = 0.0
+        self._reserved = 0
+        self._idle: List[IdleSession] = []
+        # Grid'de açılmış oturumlar -> (oturum anahtarı, kullanım sayısı)
+        self._sessions: "weakref.WeakKeyDictionary[Any, list]" = weakref.WeakKeyDictionary()
+        self._start_seconds: List[float] = []
+        self._stats = {
+            "new_sessions": 0, "reused_sessions": 0, "local_fallbacks": 0, "grid_full": 0,
+            "status_errors": 0, "discarded_sessions": 0,
+        }
+
+    # Kapasite
+    def status(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Önbellekteki hub durumunu döndürür; hub okunamazsa None."""
+        now = time.monotonic()
+        with self._lock:
+            if not refresh and self._status is not None and now - self._status_at < self.status_ttl:
+                return self._status
+        try:
+            status = self._fetch_status()
+        except Exception as e:
+            with self._lock:
+                self._stats["status_errors"] += 1
+            logger.warning(f"Selenium Grid durumu okunamadı: {e}")
+            status = None
+        with self._lock:
+            self._status, self._status_at = status, now
+        return status
+
+    def reserve(self) -> Optional[bool]:
+        """
+        Yeni oturum için Grid'de slot ayırır. True: slot ayrıldı, False: Grid dolu,
+        None: kapasite bilinmiyor (hub okunamadı veya düğüm bilgisi yok).
+        """
+        status = self.status()
+        with self._lock:
+            if status is None or status["free"] is None:
+                return None
+            if status["free"] - self._reserved <= 0:
+                self._stats["grid_full"] += 1
+                return False
+            self._reserved += 1
+            return True
+
+    def cancel_reservation(self):
+        with self._lock:
+            self._reserved = max(0, self._reserved - 1)
+
+    def adopt(self, driver, key: str, started: float, reserved: bool):
+        """Grid'de yeni açılan oturumu kaydeder; slot artık hub durumunda görünür."""
+        with self._lock:
+            if reserved:
+                self._reserved = max(0, self._reserved - 1)
+            self._sessions[driver] = [key, 1]
+            self._stats["new_sessions"] += 1
+            self._start_seconds = (self._start_seconds + [time.monotonic() - started])[-200:]
+            # Bir sonraki rezervasyon güncel kapasiteyi görmeli
+            self._status_at = 0.0
+
+    def note_local_fallback(self):
+        with self._lock:
+            self._stats["local_fallbacks"] += 1
+
+    # Oturum yeniden kullanımı
+    def owns(self, driver) -> bool:
+        with self._lock:
+            return driver in self._sessions
+
+    def acquire(self, key: str):
+        """Aynı anahtarlı (sekme düzeni) sağlıklı boş oturumu döndürür; yoksa None."""
+        while True:
+            with self._lock:
+                candidates = [idle for idle in self._idle if idle.key == key]
+                if not candidates:
+                    return None
+                idle = candidates[-1]  # En son bırakılan oturum en sıcak olanıdır
+                self._idle.remove(idle)
+            if time.monotonic() - idle.idle_since <= self.idle_seconds and self._reset(idle.driver):
+                with self._lock:
+                    self._sessions[idle.driver] = [key, idle.uses + 1]
+                    self._stats["reused_sessions"] += 1
+                return idle.driver
+            self._discard(idle.driver)
+
+    def release(self, driver) -> bool:
+        """İşi biten oturumu boşta tutar; tutulamıyorsa kapatılmalıdır (False döner)."""
+        with self._lock:
+            entry = self._sessions.get(driver)
+            if entry is None or self.max_idle_sessions <= 0 or entry[1] >= self.max_reuses:
+                self._sessions.pop(driver, None)
+                return False
+        if not self._reset(driver):
+            with self._lock:
+                self._sessions.pop(driver, None)
+            return False
+        with self._lock:
+            self._idle.append(IdleSession(driver=driver, key=entry[0], uses=entry[1]))
+            expired = self._expired_locked()
+        for idle in expired:
+            self._discard(idle.driver)
+        return True
+
+    def _expired_locked(self) -> List[IdleSession]:
+        now = time.monotonic()
+        expired = [idle for idle in self._idle if now - idle.idle_since > self.idle_seconds]
+        fresh = [idle for idle in self._idle if idle not in expired]
+        # Sınırı aşan en eski oturumlar da kapatılır
+        overflow = len(fresh) - self.max_idle_sessions
+        if overflow > 0:
+            expired += fresh[:overflow]
+            fresh = fresh[overflow:]
+        self._idle = fresh
+        return expired
+
+    def prune(self):
+        """Süresi dolan boş oturumları kapatır."""
+        with self._lock:
+            expired = self._expired_locked()
+        for idle in expired:
+            self._discard(idle.driver)
+
+    @staticmethod
+    def _reset(driver) -> bool:
+        """Fazla sekmeleri kapatır ve çerezleri siler; oturum yanıt vermiyorsa False."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            self._sessions.pop(driver, None)
+            self._stats["discarded_sessions"] += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def shutdown(self):
+        """Boştaki tüm oturumları kapatır."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session.driver)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            status = self._status
+            samples = sorted(self._start_seconds)
+            stats: Dict[str, Any] = {
+                **self._stats,
+                "grid_url": self.grid_url,
+                "idle_sessions": len(self._idle),
+                "reserved": self._reserved,
+            }
+        if status is not None:
+            stats.update({"free_slots": status["free"], "total_slots": status["total"], "nodes": status["nodes"]})
+        if samples:
+            stats["session_start"] = {
+                "avg": round(sum(samples) / len(samples), 3),
+                "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+            }
+        return stats
+
+
+# Global Grid istemcisi
+grid_client = GridClient(
+    settings.SELENIUM_GRID_URL,
+    status_ttl=settings.GRID_STATUS_TTL_SECONDS,
+    status_timeout=settings.GRID_STATUS_TIMEOUT_SECONDS,
+    max_idle_sessions=settings.GRID_MAX_IDLE_SESSIONS,
+    idle_seconds=settings.GRID_SESSION_IDLE_SECONDS,
+    max_reuses=settings.GRID_SESSION_MAX_REUSES
+)
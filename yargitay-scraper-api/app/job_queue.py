@@ -0,0 +1,436 @@
+"""
+Dağıtık Scraper İş Kuyruğu
+SCRAPER_EXECUTION_MODE=queue iken tarayıcı işleri süreç içi thread'ler yerine bir broker'a
+yazılır; ayrı worker süreçleri/düğümleri (python -m app.worker) işleri alır, kendi
+ScraperScheduler'larıyla tarayıcıda çalıştırır ve sonucu işi gönderen API örneğinin yanıt
+listesine yazar. Böylece Chrome kapasitesi API örneklerinden bağımsız ölçeklenir.
+- Her öncelik seviyesi ayrı bir listedir; worker'lar önce etkileşimli işleri alır.
+- İptal (istemci ayrıldı / deadline) broker'da işaretlenir, worker taramayı satır/sayfa arasında durdurur.
+- Sonuç bütçesi (max_results) süreçler arası paylaşılamadığından işe kelimenin üst sınırı yazılır.
+- Aşama süreleri worker'da ölçülüp sonuçla birlikte döner.
+- Tarama kaydı (checkpoint) worker sürecinde tutulduğundan kelimenin imleci de sonuçla döner.
+REDIS_URL boşsa aynı süreçteki InMemoryBroker kullanılır (testler ve tek düğümlü çalışma).
+"""
+import json
+import threading
+import time
+import uuid
+import concurrent.futures
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from .cache import normalize_keyword
+from .config import settings
+from .scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, SchedulerFullError
+from .schemas import ResultItem
+
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+
+
+class InMemoryBroker:
+    """Redis olmayan ortamlar ve testler için süreç içi broker (işler JSON olarak saklanır)"""
+
+    def __init__(self, priorities=PRIORITIES):
+        self.priorities = sorted(priorities)
+        self._cond = threading.Condition()
+        self._queues: Dict[int, deque] = {priority: deque() for priority in self.priorities}
+        self._replies: Dict[str, deque] = {}
+        self._cancelled: Dict[str, float] = {}
+        self._workers: Dict[str, Dict[str, Any]] = {}
+
+    def enqueue(self, job: Dict[str, Any]):
+        with self._cond:
+            self._queues[job["priority"]].appendleft(json.dumps(job))
+            self._cond.notify_all()
+
+    def dequeue(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """En yüksek öncelikli sıradaki işi alır; timeout içinde iş gelmezse None."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for priority in self.priorities:
+                    if self._queues[priority]:
+                        return json.loads(self._queues[priority].pop())
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def publish_result(self, reply_to: str, result: Dict[str, Any]):
+        with self._cond:
+            self._replies.setdefault(reply_to, deque()).appendleft(json.dumps(result))
+            self._cond.notify_all()
+
+    def next_result(self, reply_to: str, timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                replies = self._replies.get(reply_to)
+                if replies:
+                    return json.loads(replies.pop())
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def cancel(self, job_id: str):
+        with self._cond:
+            now = time.time()
+            self._cancelled[job_id] = now
+            for cancelled_id, at in list(self._cancelled.items()):
+                if now - at > settings.JOB_RESULT_TTL_SECONDS:
+                    del self._cancelled[cancelled_id]
+
+    def is_cancelled(self, job_id: str) -> bool:
+        with self._cond:
+            return job_id in self._cancelled
+
+    def queue_length(self) -> int:
+        with self._cond:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def heartbeat(self, worker_id: str, info: Dict[str, Any], ttl_seconds: float):
+        with self._cond:
+            self._workers[worker_id] = {**info, "expires_at": time.time() + ttl_seconds}
+
+    def workers(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        with self._cond:
+            return {
+                worker_id: {k: v for k, v in info.items() if k != "expires_at"}
+                for worker_id, info in self._workers.items() if info["expires_at"] > now
+            }
+
+
+class RedisBroker:
+    """Redis listeleri üzerinde broker: LPUSH ile yazılır, BRPOP ile FIFO okunur"""
+
+    def __init__(self, client, prefix: str, result_ttl_seconds: int, priorities=PRIORITIES):
+        self.client = client
+        self.prefix = prefix
+        self.result_ttl_seconds = result_ttl_seconds
+        self.priorities = sorted(priorities)
+
+    def _queue_key(self, priority: int) -> str:
+        return f"{self.prefix}:jobs:{priority}"
+
+    def enqueue(self, job: Dict[str, Any]):
+        self.client.lpush(self._queue_key(job["priority"]), json.dumps(job))
+
+    def dequeue(self, timeout: float) -> Optional[Dict[str, Any]]:
+        # BRPOP anahtarları verilen sırayla dener; öncelik sırası korunur
+        item = self.client.brpop([self._queue_key(p) for p in self.priorities], timeout=timeout)
+        return json.loads(item[1]) if item else None
+
+    def publish_result(self, reply_to: str, result: Dict[str, Any]):
+        key = f"{self.prefix}:results:{reply_to}"
+        pipe = self.client.pipeline()
+        pipe.lpush(key, json.dumps(result))
+        pipe.expire(key, self.result_ttl_seconds)
+        pipe.execute()
+
+    def next_result(self, reply_to: str, timeout: float) -> Optional[Dict[str, Any]]:
+        item = self.client.brpop([f"{self.prefix}:results:{reply_to}"], timeout=timeout)
+        return json.loads(item[1]) if item else None
+
+    def cancel(self, job_id: str):
+        self.client.set(f"{self.prefix}:cancel:{job_id}", 1, ex=self.result_ttl_seconds)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        return bool(self.client.exists(f"{self.prefix}:cancel:{job_id}"))
+
+    def queue_length(self) -> int:
+        pipe = self.client.pipeline()
+        for priority in self.priorities:
+            pipe.llen(self._queue_key(priority))
+        return sum(pipe.execute())
+
+    def heartbeat(self, worker_id: str, info: Dict[str, Any], ttl_seconds: float):
+        self.client.set(f"{self.prefix}:workers:{worker_id}", json.dumps(info), ex=max(1, int(ttl_seconds)))
+
+    def workers(self) -> Dict[str, Dict[str, Any]]:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:workers:*"))
+        if not keys:
+            return {}
+        return {
+            key.rsplit(":", 1)[-1]: json.loads(value)
+            for key, value in zip(keys, self.client.mget(keys)) if value
+        }
+
+
+def create_broker(redis_url: str):
+    """REDIS_URL verilmişse Redis broker'ı, aksi halde süreç içi broker'ı oluşturur."""
+    if not redis_url:
+        return InMemoryBroker()
+    import redis
+
+    client = redis.Redis.from_url(redis_url, decode_responses=True)
+    return RedisBroker(client, settings.JOB_QUEUE_PREFIX, settings.JOB_RESULT_TTL_SECONDS)
+
+
+def job_payload(
+    keyword: str,
+    thread_id: int,
+    tabs: int | None = None,
+    budget=None,
+    cancel_token=None,
+    timings=None,
+    continue_paging: bool = False
+) -> Dict[str, Any]:
+    """search_single_keyword argümanlarından kuyruğa yazılabilecek iş alanlarını çıkarır."""
+    return {
+        "keyword": keyword,
+        "thread_id": thread_id,
+        "tabs": tabs,
+        "max_results": budget.remote_quota(keyword) if budget is not None else None,
+        "continue_paging": continue_paging,
+    }
+
+
+@dataclass
+class PendingJob:
+    future: concurrent.futures.Future
+    keyword: str
+    budget: Any = None
+    cancel_token: Any = None
+    timings: Any = None
+    submitted_at: float = field(default_factory=time.monotonic)
+    cancel_sent: bool = False
+
+
+class QueueScheduler:
+    """
+    ScraperScheduler ile aynı arayüzde, işleri broker'a gönderen zamanlayıcı.
+    Bir dağıtıcı thread bu örneğin yanıt listesini okuyup Future'ları tamamlar, iptalleri
+    broker'a iletir ve süresi dolan işleri başarısız sayar.
+    """
+
+    def __init__(self, broker, max_queue: int, result_timeout: float, instance_id: str | None = None):
+        self.broker = broker
+        self.max_queue = max_queue
+        self.result_timeout = result_timeout
+        self.instance_id = instance_id or uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._pending: Dict[str, PendingJob] = {}
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._wait_samples: deque = deque(maxlen=500)
+        # Worker'ların bildirdiği son tarama imleçleri (normalize kelime -> imleç)
+        self._cursors: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "timed_out": 0, "cancel_requests": 0}
+
+    # Yaşam döngüsü
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._dispatch_loop, name="job-queue-dispatcher", daemon=True)
+            self._thread.start()
+        logger.info(f"İş kuyruğu zamanlayıcısı başlatıldı ({type(self.broker).__name__}, örnek {self.instance_id[:8]})")
+
+    def shutdown(self, wait: bool = True):
+        """Yanıt beklemeyi bırakır; süren işler worker'larda iptal edilir."""
+        with self._lock:
+            self._running = False
+            pending, self._pending = self._pending, {}
+        for job_id, job in pending.items():
+            job.future.cancel()
+            try:
+                self.broker.cancel(job_id)
+            except Exception as e:
+                logger.debug(f"İş iptali broker'a yazılamadı {job_id}: {e}")
+        if wait and self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+        logger.info("İş kuyruğu zamanlayıcısı durduruldu")
+
+    # İş gönderme
+    def submit(
+        self,
+        request_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> concurrent.futures.Future:
+        """
+        search_single_keyword işini kuyruğa yazar. Bütçe, iptal token'ı ve aşama süreleri bu
+        süreçte kalır; worker'ın sonucu geldiğinde bunlara işlenir.
+        """
+        if not self._running:
+            self.start()
+        payload = job_payload(*args)
+        job_id = uuid.uuid4().hex
+        job = {
+            **payload,
+            "id": job_id,
+            "fn": fn.__name__,
+            "request_id": request_id,
+            "priority": priority,
+            "reply_to": self.instance_id,
+            "enqueued_at": time.time(),
+        }
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        try:
+            if self.broker.queue_length() >= self.max_queue:
+                raise SchedulerFullError(f"İş kuyruğu dolu ({self.max_queue})")
+            with self._lock:
+                self._pending[job_id] = PendingJob(
+                    future=future,
+                    keyword=payload["keyword"],
+                    budget=args[3] if len(args) > 3 else None,
+                    cancel_token=args[4] if len(args) > 4 else None,
+                    timings=args[5] if len(args) > 5 else None,
+                )
+            self.broker.enqueue(job)
+        except SchedulerFullError:
+            self._stats["rejected"] += 1
+            raise
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(job_id, None)
+            self._stats["rejected"] += 1
+            raise SchedulerFullError(f"İş kuyruğuna yazılamadı: {e}") from e
+        self._stats["submitted"] += 1
+        return future
+
+    # Dağıtıcı
+    def _dispatch_loop(self):
+        while self._running:
+            try:
+                result = self.broker.next_result(self.instance_id, timeout=1.0)
+            except Exception as e:
+                logger.warning(f"İş kuyruğu yanıtı okunamadı: {e}")
+                time.sleep(1.0)
+                result = None
+            if result is not None:
+                self._complete(result)
+            self._propagate_cancellations()
+            self._expire_pending()
+
+    def _complete(self, result: Dict[str, Any]):
+        with self._lock:
+            job = self._pending.pop(result["job_id"], None)
+        if job is None:
+            return  # Süresi dolmuş veya iptal edilmiş iş
+        results = [ResultItem(**item) for item in result.get("results", [])]
+        if job.budget is not None:
+            for item in results:
+                job.budget.record(job.keyword, item.esas_no)
+            if result.get("truncated"):
+                job.budget.mark_truncated(job.keyword)
+            job.budget.finish(job.keyword)
+        if job.timings is not None and result.get("timings"):
+            job.timings.merge(result["timings"])
+        if result.get("queue_wait") is not None:
+            self._wait_samples.append(result["queue_wait"])
+        if result.get("cursor"):
+            self._remember_cursor(job.keyword, result["cursor"])
+        self._stats["completed" if result["success"] else "failed"] += 1
+        self._resolve(job, (job.keyword, results, result["success"], result["message"]))
+
+    def _remember_cursor(self, keyword: str, cursor: Dict[str, Any]):
+        key = normalize_keyword(keyword)
+        with self._lock:
+            self._cursors[key] = cursor
+            self._cursors.move_to_end(key)
+            while len(self._cursors) > settings.CHECKPOINT_MAX_ENTRIES:
+                self._cursors.popitem(last=False)
+
+    def cursor(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """Kelimenin worker'da tutulan tarama kaydının son bildirilen imleci."""
+        with self._lock:
+            return self._cursors.get(normalize_keyword(keyword))
+
+    @staticmethod
+    def _resolve(job: PendingJob, value: tuple):
+        try:
+            job.future.set_result(value)
+        except concurrent.futures.InvalidStateError:
+            pass  # Bekleyen taraf vazgeçti
+
+    def _propagate_cancellations(self):
+        with self._lock:
+            to_cancel = [
+                (job_id, job) for job_id, job in self._pending.items()
+                if not job.cancel_sent and (
+                    job.future.cancelled() or (job.cancel_token is not None and job.cancel_token.cancelled)
+                )
+            ]
+        for job_id, job in to_cancel:
+            try:
+                self.broker.cancel(job_id)
+                job.cancel_sent = True
+                self._stats["cancel_requests"] += 1
+            except Exception as e:
+                logger.warning(f"İş iptali broker'a yazılamadı {job_id}: {e}")
+
+    def _expire_pending(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [job_id for job_id, job in self._pending.items() if now - job.submitted_at > self.result_timeout]
+            jobs = [(job_id, self._pending.pop(job_id)) for job_id in expired]
+        for job_id, job in jobs:
+            self._stats["timed_out"] += 1
+            logger.warning(f"İş {self.result_timeout:.0f} saniyede tamamlanmadı: '{job.keyword}' ({job_id})")
+            try:
+                self.broker.cancel(job_id)
+            except Exception:
+                pass
+            if job.budget is not None:
+                job.budget.finish(job.keyword)
+            self._resolve(job, (job.keyword, [], False, "Scraper worker zamanında yanıt vermedi"))
+
+    # Metrikler
+    @property
+    def slot_limit(self) -> int:
+        """Canlı worker'ların toplam tarayıcı slotu"""
+        return sum(info.get("slot_limit", 0) for info in self._workers())
+
+    def _workers(self) -> List[Dict[str, Any]]:
+        try:
+            return list(self.broker.workers().values())
+        except Exception as e:
+            logger.debug(f"Worker listesi okunamadı: {e}")
+            return []
+
+    def get_stats(self) -> Dict[str, Any]:
+        workers = self._workers()
+        try:
+            queued = self.broker.queue_length()
+        except Exception:
+            queued = -1
+        with self._lock:
+            pending = len(self._pending)
+        stats = {
+            **self._stats,
+            "mode": "queue",
+            "broker": type(self.broker).__name__,
+            "workers": len(workers),
+            "max_slots": sum(info.get("max_slots", 0) for info in workers),
+            "slot_limit": sum(info.get("slot_limit", 0) for info in workers),
+            "active": sum(info.get("active", 0) for info in workers),
+            "queued": queued,
+            "pending": pending,
+        }
+        samples = sorted(self._wait_samples)
+        if samples:
+            stats["queue_wait"] = {
+                "avg": round(sum(samples) / len(samples), 4),
+                "p50": round(samples[len(samples) // 2], 4),
+                "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+                "max": round(samples[-1], 4),
+            }
+        return stats
+
+
+# Global broker ve kuyruk zamanlayıcısı (yalnızca SCRAPER_EXECUTION_MODE=queue iken başlatılır)
+job_broker = create_broker(settings.REDIS_URL)
+queue_scheduler = QueueScheduler(
+    job_broker,
+    max_queue=settings.SCRAPER_MAX_QUEUE,
+    result_timeout=settings.JOB_RESULT_TIMEOUT_SECONDS
+)
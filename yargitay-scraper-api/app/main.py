@@ -2,13 +2,15 @@
 
 import sys
 import time
+import json
 import asyncio
-import concurrent.futures
-import hashlib
+import uuid
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from loguru import logger
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -20,6 +22,23 @@ from . import schemas
 from .config import settings
 from .search_logic import search_single_keyword
 from .firestore_db import init_firestore, close_firestore, firestore_manager
+from .scheduler import scraper_scheduler, SchedulerFullError, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from .job_queue import InMemoryBroker, job_broker, queue_scheduler
+from .worker import ScraperWorker
+from .throttle import site_controller
+from .browser_supervisor import browser_supervisor
+from .network_profile import network_profile
+from .grid_client import grid_client
+from .checkpoint import checkpoint_store
+from .metrics import (
+    ACTIVE_BROWSERS, BROWSER_RSS, DECISIONS_SCRAPED, KEYWORD_SEARCHES, QUEUED_JOBS, SLOT_LIMIT, PhaseTimings,
+)
+from .cache import unique_keywords, LRUCache, TieredKeywordCache, SingleFlight
+from .precrawler import PreCrawler
+from .corpus import CorpusIngestor
+from .text_index import TextIndex
+from .budget import ResultBudget
+from .cancellation import CancelToken, RequestCancellation, deadline_from_headers
 
 # --- Loglama Yapılandırması ---
 logger.remove()
@@ -28,9 +47,31 @@ logger.add(sys.stdout, format="{time} {level} {message}", level=settings.LOG_LEV
 # --- Rate Limiter ---
 limiter = Limiter(key_func=get_remote_address)
 
-# --- In-memory cache for search results ---
-search_cache = {}
-search_stats = {"total_searches": 0, "total_results": 0}
+# --- Katmanlı arama önbelleği: L1 süreç içi LRU/TTL, L2 Firestore ---
+search_cache = TieredKeywordCache(
+    l1=LRUCache(
+        max_entries=settings.L1_CACHE_MAX_ENTRIES,
+        max_bytes=settings.L1_CACHE_MAX_BYTES,
+        ttl_seconds=settings.L1_CACHE_TTL_SECONDS
+    ),
+    l2=firestore_manager,
+    fresh_ttl_seconds=settings.CACHE_FRESH_TTL_SECONDS,
+    stale_ttl_seconds=settings.CACHE_STALE_TTL_SECONDS,
+    jitter=settings.CACHE_TTL_JITTER
+)
+# Anahtar kelime başına tek eşzamanlı tarayıcı araması (stampede koruması)
+search_flights = SingleFlight()
+# Tarayıcı işleri: süreç içi slot havuzu veya broker üzerinden ayrı worker süreçleri
+job_scheduler = queue_scheduler if settings.SCRAPER_EXECUTION_MODE == "queue" else scraper_scheduler
+# Korpus üzerinde yerel BM25 indeksi: yeterli eşleşme varsa Selenium'a hiç gidilmez
+text_index = TextIndex(settings.TEXT_INDEX_DIR) if settings.TEXT_INDEX_ENABLED else None
+# Taranan kararların kalıcı korpusu (yargitay_decisions); yeni kararlar yerel indekse de eklenir
+corpus = CorpusIngestor(firestore_manager, text_index, settings.TEXT_INDEX_FLUSH_THRESHOLD)
+search_stats = {"total_searches": 0, "total_results": 0, "cancelled_scrapes": 0}
+# Süren anahtar kelime taramalarının iptal token'ları (single-flight ile paylaşılır)
+scrape_tokens: dict = {}
+# Süren taramaların aşama süreleri (search_details "timings" alanı için, token ile birlikte oluşturulur)
+scrape_timings: dict = {}
 
 # --- Uygulama Yaşam Döngüsü ---
 @asynccontextmanager
@@ -48,8 +89,40 @@ async def lifespan(app: FastAPI):
         logger.error(f"Firestore initialization hatası: {e} - fallback mode aktif")
         db_connected = False
     
+    job_scheduler.start()
+    embedded_worker = None
+    if job_scheduler is queue_scheduler and isinstance(job_broker, InMemoryBroker):
+        # Redis yoksa kuyruk bu süreçteki bir worker tarafından tüketilir
+        scraper_scheduler.start()
+        embedded_worker = ScraperWorker(
+            job_broker, scraper_scheduler, heartbeat_seconds=settings.WORKER_HEARTBEAT_SECONDS
+        ).start()
+    browser_supervisor.start()
+    precrawler.start()
+    index_task = None
+    if (
+        text_index is not None and db_connected and settings.TEXT_INDEX_REBUILD_ON_STARTUP
+        and await asyncio.to_thread(len, text_index) == 0
+    ):
+        index_task = asyncio.create_task(rebuild_text_index())
+    
     yield
     
+    await precrawler.stop()
+    job_scheduler.shutdown(wait=False)
+    if embedded_worker is not None:
+        embedded_worker.stop(wait=False)
+        scraper_scheduler.shutdown(wait=False)
+    browser_supervisor.shutdown()
+    grid_client.shutdown()
+    if index_task is not None and not index_task.done():
+        index_task.cancel()
+    if text_index is not None:
+        try:
+            await asyncio.to_thread(text_index.flush)
+        except Exception as e:
+            logger.warning(f"Yerel indeks kaydedilemedi: {e}")
+    
     # Firestore bağlantısını güvenli şekilde kapat
     try:
         close_firestore()
@@ -70,10 +143,324 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
 # --- Helper Functions ---
-def generate_cache_key(keywords):
-    """Anahtar kelimelerden cache key oluşturur"""
-    keywords_str = ",".join(sorted(keywords))
-    return hashlib.md5(keywords_str.encode()).hexdigest()
+def to_result_dict(result) -> dict:
+    """ResultItem'ı API uyumluluk alanları eklenmiş dict'e çevirir"""
+    # ResultItem objesi ise dict'e çevir
+    if hasattr(result, 'model_dump'):
+        result_dict = result.model_dump()
+    elif hasattr(result, 'dict'):
+        result_dict = result.dict()
+    else:
+        result_dict = dict(result)
+
+    result_dict.update({
+        "case_number": result_dict.get("esas_no", ""),
+        "title": f"{result_dict.get('daire', '')} - {result_dict.get('karar_no', '')}",
+        "content": result_dict.get("karar_metni", ""),
+        "date": result_dict.get("karar_tarihi", ""),
+        "court": result_dict.get("daire", ""),
+        "url": f"https://karararama.yargitay.gov.tr/YargitayBilgiBankasiIstemciWeb/#{result_dict.get('esas_no', '')}"
+    })
+    return result_dict
+
+def result_key(result_dict: dict) -> str:
+    """Sonuçların tekilleştirilmesinde kullanılan anahtar (esas numarası)"""
+    return result_dict.get("case_number") or result_dict.get("esas_no", "unknown")
+
+def merge_unique_results(results_by_keyword: dict) -> list:
+    """Anahtar kelime sonuçlarını birleştirir (aynı case_number'a sahip olanlar tek kez)"""
+    unique_results = {}
+    for results in results_by_keyword.values():
+        for result_dict in results:
+            case_number = result_key(result_dict)
+            if case_number not in unique_results:
+                unique_results[case_number] = result_dict
+    return list(unique_results.values())
+
+def index_hit_to_result(document: dict, keyword: str) -> dict:
+    """Yerel indeks belgesini /search sonuç biçimine çevirir"""
+    return to_result_dict({
+        "daire": document.get("court") or "",
+        "esas_no": document.get("esas_no") or "",
+        "karar_no": document.get("karar_no") or "",
+        "karar_tarihi": document.get("karar_tarihi") or "",
+        "karar_metni": document.get("content") or "",
+        "keyword": keyword,
+    })
+
+async def search_text_index(keyword: str) -> list:
+    """
+    Anahtar kelimeyi yerel indekste arar. Tüm terimleri içeren en az TEXT_INDEX_MIN_HITS
+    karar varsa sonuçlar döner; kapsam yetersizse boş liste döner ve kelime taranır.
+    """
+    # Boyut okuması indeks kilidini alır; event loop'ta değil thread'de yapılır
+    if text_index is None or await asyncio.to_thread(len, text_index) == 0:
+        return []
+    hits = await asyncio.to_thread(
+        text_index.search, keyword, settings.TARGET_RESULTS_PER_KEYWORD, True
+    )
+    if len(hits) < min(settings.TEXT_INDEX_MIN_HITS, settings.TARGET_RESULTS_PER_KEYWORD):
+        return []
+    return [index_hit_to_result(hit, keyword) for hit in hits]
+
+async def rebuild_text_index() -> int:
+    """Yerel indeksi Firestore korpusundan yeniden oluşturur"""
+    started = time.time()
+    documents = await asyncio.to_thread(lambda: list(firestore_manager.iter_decisions()))
+    count = await asyncio.to_thread(text_index.rebuild, documents)
+    logger.info(f"Yerel metin indeksi korpustan oluşturuldu: {count} karar, {time.time() - started:.2f} saniye")
+    return count
+
+def scrape_cursor(keyword: str) -> dict | None:
+    """
+    Kelimenin tarama imleci. Queue modunda tarama (ve tarama kaydı) worker sürecindedir;
+    imleç worker'ın iş sonucuyla gelir.
+    """
+    if job_scheduler is queue_scheduler:
+        return queue_scheduler.cursor(keyword)
+    return checkpoint_store.cursor(keyword)
+
+def flight_key(keyword: str, continue_paging: bool = False, request_id: str | None = None) -> str:
+    """
+    Devam taramaları (continue_paging) normal taramadan ayrı single-flight/token anahtarı kullanır.
+    request_id verilirse anahtar o isteğe özeldir: bütçeyle kesilebilecek taramalar paylaşılmaz.
+    """
+    key = f"{keyword}#devam" if continue_paging else keyword
+    return f"{key}#{request_id}" if request_id else key
+
+async def scrape_keyword(
+    keyword: str,
+    request_id: str,
+    idx: int,
+    priority: int = PRIORITY_INTERACTIVE,
+    ingest: bool = True,
+    budget: ResultBudget | None = None,
+    cancel_token: CancelToken | None = None,
+    timings: PhaseTimings | None = None,
+    continue_paging: bool = False,
+    private: bool = False
+) -> tuple:
+    """
+    Anahtar kelimeyi süreç genelindeki zamanlayıcı üzerinden tarayıcıyla arar.
+    Eşzamanlı Chrome sayısı tüm istekler için MAX_BROWSER_SLOTS ile sınırlıdır.
+    Başarılı sonuçlar hemen cache'e (L1 + L2) yazılır ve arka planda korpusa aktarılır;
+    sonuç çıkmayan veya hata veren kelimeler kısa süreli negatif kayıt olarak saklanır.
+    İsteğin max_results bütçesi nedeniyle erken kesilen aramalar eksik olduğundan cache'e yazılmaz.
+    İstemcisi ayrıldığı için iptal edilen aramaların kısmi sonuçları stale olarak yazılır;
+    bir sonraki istekte hemen sunulur ve arka planda tamamlanır.
+    continue_paging taramaları önceki taramanın imlecinden yalnızca yeni kararları getirir;
+    kelimenin cache kaydını değiştirmez, sonuçlar yalnızca korpusa aktarılır.
+    private taramalar (bütçeyle kesilebilecek) isteğe özel single-flight anahtarıyla çalışır.
+    """
+    started = time.time()
+    key = flight_key(keyword, continue_paging, request_id if private else None)
+    try:
+        keyword, results, success, message = await asyncio.wrap_future(
+            job_scheduler.submit(
+                request_id, search_single_keyword, keyword, idx, None, budget, cancel_token, timings, continue_paging,
+                priority=priority
+            )
+        )
+    finally:
+        if cancel_token is not None and scrape_tokens.get(key) is cancel_token:
+            del scrape_tokens[key]
+        scrape_timings.pop(key, None)
+    result_dicts = [to_result_dict(r) for r in results]
+    DECISIONS_SCRAPED.inc(len(result_dicts))
+    if continue_paging:
+        KEYWORD_SEARCHES.labels(outcome="continued" if success else "error").inc()
+        if ingest and result_dicts:
+            corpus.ingest_in_background(result_dicts, keyword)
+        return keyword, result_dicts, success, message
+    if cancel_token is not None and cancel_token.cancelled:
+        KEYWORD_SEARCHES.labels(outcome="cancelled").inc()
+        search_stats["cancelled_scrapes"] += 1
+        if result_dicts:
+            if not (budget is not None and budget.was_truncated(keyword)):
+                await search_cache.set(keyword, result_dicts, time.time() - started, fresh_ttl_seconds=0)
+            if ingest:
+                corpus.ingest_in_background(result_dicts, keyword)
+        return keyword, result_dicts, success, message
+    if budget is not None and budget.was_truncated(keyword):
+        KEYWORD_SEARCHES.labels(outcome="truncated").inc()
+        if ingest and result_dicts:
+            corpus.ingest_in_background(result_dicts, keyword)
+        return keyword, result_dicts, success, f"{message} (max_results bütçesiyle sınırlandı)"
+    KEYWORD_SEARCHES.labels(outcome="error" if not success else "found" if result_dicts else "empty").inc()
+    if success and result_dicts:
+        await search_cache.set(keyword, result_dicts, time.time() - started)
+        if ingest:
+            corpus.ingest_in_background(result_dicts, keyword)
+    elif not result_dicts:
+        ttl = settings.NEGATIVE_CACHE_TTL_SECONDS if success else settings.FAILURE_CACHE_TTL_SECONDS
+        await search_cache.set_negative(keyword, message, success, ttl)
+    return keyword, result_dicts, success, message
+
+# Popüler anahtar kelimeleri yoğun olmayan saatlerde önceden tarayan arka plan görevi
+precrawler = PreCrawler(search_cache, search_flights, scrape_keyword, firestore_manager)
+
+async def lookup_without_scraping(keywords: list) -> tuple:
+    """
+    Tarayıcı açmadan yanıtlanabilen kelimeleri bulur: önce cache (L1, sonra L2),
+    ardından yerel korpus indeksi. (results_by_keyword, search_details, indeksten gelen sayı) döner.
+    """
+    results_by_keyword = {}
+    search_details = {}
+
+    # Read-through cache: önce L1 (süreç içi), eksikler için tek seferde L2 (Firestore)
+    cached_keywords = await search_cache.get_many(keywords)
+    for keyword, entry in cached_keywords.items():
+        results_by_keyword[keyword] = entry["results"]
+        if entry.get("negative"):
+            # Yakın zamanda sonuç vermeyen / hata veren kelime: tarayıcı açılmadan yanıtlanır
+            # (get_many süresi geçmiş negatif kayıtları döndürmez; onlar yeniden taranır)
+            search_details[keyword] = {
+                "success": entry["success"],
+                "count": 0,
+                "message": f"{entry['message']} (negatif cache, {entry['source']})",
+                "cached": True
+            }
+            continue
+        message = f"Cache'den döndürüldü ({entry['source']})"
+        if entry["stale"]:
+            # Stale-while-revalidate: eski kayıt hemen sunulur, yenileme arka planda tek görevle yapılır
+            search_flights.spawn(
+                keyword,
+                lambda kw=keyword: scrape_keyword(kw, "cache-refresh", 0, PRIORITY_BACKGROUND)
+            )
+            message += " - arka planda yenileniyor"
+        search_details[keyword] = {
+            "success": True,
+            "count": len(entry["results"]),
+            "message": message,
+            "cached": True
+        }
+
+    # Cache'de olmayan kelimeler önce yerel korpus indeksinde aranır
+    index_count = 0
+    for keyword in [k for k in keywords if k not in results_by_keyword]:
+        try:
+            index_results = await search_text_index(keyword)
+        except Exception as e:
+            logger.warning(f"Yerel indeks araması başarısız '{keyword}': {e}")
+            continue
+        if index_results:
+            index_count += 1
+            results_by_keyword[keyword] = index_results
+            search_details[keyword] = {
+                "success": True,
+                "count": len(index_results),
+                "message": "Yerel korpus indeksinden döndürüldü",
+                "cached": True
+            }
+    return results_by_keyword, search_details, index_count
+
+def create_result_budget(max_results: int | None, results_by_keyword: dict, missing_keywords: list):
+    """
+    İsteğin max_results değerinden kelime işçilerinin paylaştığı bütçeyi oluşturur.
+    Cache/indeksten gelen tekil kararlar bütçeden düşülür, kalan kısım taranacak
+    kelimelere orantılı dağıtılır.
+    """
+    if not max_results or not missing_keywords:
+        return None
+    budget = ResultBudget(max_results, settings.TARGET_RESULTS_PER_KEYWORD)
+    budget.record_existing(
+        result_key(result_dict) for results in results_by_keyword.values() for result_dict in results
+    )
+    budget.allocate(missing_keywords)
+    return budget
+
+def skip_exhausted_keywords(budget, missing_keywords: list, results_by_keyword: dict, search_details: dict) -> list:
+    """Bütçe cache/indeks sonuçlarıyla dolduysa eksik kelimeler taranmaz; taranacak kelimeleri döndürür."""
+    if budget is None or not budget.exhausted:
+        return missing_keywords
+    for keyword in missing_keywords:
+        results_by_keyword[keyword] = []
+        search_details[keyword] = {
+            "success": True,
+            "count": 0,
+            "message": "Sonuç bütçesi (max_results) dolduğu için taranmadı",
+            "cached": False
+        }
+    return []
+
+def start_keyword_searches(
+    missing_keywords: list,
+    request_id: str,
+    budget: ResultBudget | None = None,
+    cancellation: RequestCancellation | None = None,
+    timings_out: dict | None = None,
+    continue_paging: bool = False
+) -> list:
+    """
+    Eksik kelimeler single-flight ile aranır: aynı kelime başka bir istekte zaten
+    aranıyorsa yeni tarayıcı açılmaz, süren aramanın sonucu beklenir.
+    İstek, her taramanın iptal token'ını tutar; taramayı bekleyen son istek de
+    ayrıldığında tarama durdurulur. Bütçesi (max_results) kelimeyi kesebilecek istekler
+    süren taramaya katılmaz ve başkalarının katılamayacağı isteğe özel bir tarama başlatır.
+    timings_out verilirse her kelimenin (paylaşılan) taramasının aşama süreleri buraya yazılır.
+    continue_paging ise kelimeler önceki taramalarının imlecinden devam ettirilir.
+    """
+    async def join_search(keyword: str, idx: int):
+        # Bütçe bu kelimeyi kesebiliyorsa tarama paylaşılmaz: kesilmiş sonuç başka isteğe gitmemeli
+        private = budget is not None and budget.limits(keyword)
+        key = flight_key(keyword, continue_paging, request_id if private else None)
+        # Token kontrolü ile single-flight'a katılma arasında await yoktur (atomik)
+        if search_flights.is_running(key):
+            # Arka plan taramalarının (cache yenileme, ön tarama, korpus) token'ı yoktur;
+            # bunlara katılan istek taramayı tutmaz ve yeni token oluşturmaz
+            token = scrape_tokens.get(key)
+        else:
+            # Token, taramanın sonunda scrape_keyword tarafından silinir
+            token = scrape_tokens[key] = CancelToken()
+            scrape_timings[key] = PhaseTimings()
+        timings = scrape_timings.get(key)
+        if cancellation is not None and token is not None:
+            cancellation.hold(token)
+        result = await search_flights.run(
+            key,
+            lambda: scrape_keyword(
+                keyword, request_id, idx, budget=budget, cancel_token=token, timings=timings,
+                continue_paging=continue_paging, private=private
+            )
+        )
+        if timings_out is not None and timings is not None:
+            timings_out[keyword] = timings.as_dict()
+        return result
+
+    return [join_search(keyword, idx) for idx, keyword in enumerate(missing_keywords)]
+
+async def settle_keyword_search(keyword: str, future) -> tuple:
+    """Kelime taramasını bekler; hata fırlatmak yerine (keyword, sonuç, hata) döner."""
+    try:
+        return keyword, await future, None
+    except Exception as e:
+        return keyword, None, e
+
+async def watch_disconnect(request: Request, cancellation: RequestCancellation):
+    """İstemci bağlantıyı keserse veya istek süresi dolarsa isteğin tuttuğu taramaları bırakır"""
+    while True:
+        if await request.is_disconnected():
+            logger.info("İstemci bağlantısı koptu, taramalar iptal ediliyor")
+            break
+        if cancellation.deadline is not None and time.monotonic() >= cancellation.deadline:
+            logger.info("İstek süresi doldu, taramalar iptal ediliyor")
+            break
+        await asyncio.sleep(settings.CLIENT_DISCONNECT_POLL_SECONDS)
+    cancellation.release_all()
+
+async def log_search(keywords: list, results_count: int, elapsed_time: float):
+    """Arama sorgusunu Firestore sorgu günlüğüne yazar"""
+    if firestore_manager.client:
+        try:
+            await firestore_manager.log_search_query(
+                query_text=" ".join(keywords),
+                keywords=keywords,
+                results_count=results_count,
+                execution_time=elapsed_time
+            )
+        except Exception as e:
+            logger.warning(f"Arama sorgusu loglama başarısız: {e}")
 
 # --- API Endpoints ---
 
@@ -106,81 +493,82 @@ async def search_yargitay_parallel(
     request: Request,
     search_request: schemas.SearchRequest
 ):
-    """Anahtar kelimelerle Yargıtay'da paralel arama yapar."""
+    """
+    Anahtar kelimelerle Yargıtay'da paralel arama yapar.
+    Cache anahtar kelime bazındadır: önbellekte bulunan kelimeler oradan alınır,
+    yalnızca eksik kelimeler için tarayıcı ile arama yapılır.
+    """
     logger.info(f"Arama başlatıldı: {len(search_request.keywords)} anahtar kelime")
     start_time = time.time()
-    
-    # Firestore cache kontrolü
-    cached_result = None
-    if firestore_manager.client:
-        try:
-            cached_result = await firestore_manager.get_search_cache(search_request.keywords)
-            if cached_result:
-                logger.info(f"Firestore cache'den sonuç döndürüldü: {len(cached_result['search_results'])} sonuç")
-                return schemas.SearchResponse(
-                    results=cached_result['search_results'],
-                    success=True,
-                    message=f"Cache'den döndürüldü. {len(cached_result['search_results'])} sonuç bulundu.",
-                    search_details={},
-                    processing_time=cached_result.get('search_duration', 0),
-                    total_keywords=len(search_request.keywords),
-                    unique_results=len(cached_result['search_results'])
-                )
-        except Exception as e:
-            logger.warning(f"Firestore cache kontrolü başarısız: {e}")
-    
-    # In-memory cache kontrolü (fallback)
-    cache_key = generate_cache_key(search_request.keywords)
-    if cache_key in search_cache:
-        cached_result = search_cache[cache_key]
-        logger.info(f"In-memory cache'den sonuç döndürüldü: {len(cached_result['results'])} sonuç")
-        return schemas.SearchResponse(**cached_result)
-    
-    max_workers = min(len(search_request.keywords), 10)
-    all_results = []
-    search_details = {}
+
+    keywords = unique_keywords(search_request.keywords)
+    if search_request.continue_paging:
+        # Devam istekleri cache/indeksi atlar; her kelime kaldığı sayfadan taranır
+        results_by_keyword, search_details, index_count = {}, {}, 0
+    else:
+        results_by_keyword, search_details, index_count = await lookup_without_scraping(keywords)
+
+    missing_keywords = [k for k in keywords if k not in results_by_keyword]
+    logger.info(
+        f"Cache'de bulunan: {len(keywords) - len(missing_keywords) - index_count}, "
+        f"indeksten: {index_count}, aranacak: {len(missing_keywords)} anahtar kelime"
+    )
+
+    budget = create_result_budget(search_request.max_results, results_by_keyword, missing_keywords)
+    missing_keywords = skip_exhausted_keywords(budget, missing_keywords, results_by_keyword, search_details)
+
+    request_id = uuid.uuid4().hex
+    cancellation = RequestCancellation(deadline_from_headers(request.headers))
+    timings_out = {} if search_request.include_timings else None
+    futures = start_keyword_searches(
+        missing_keywords, request_id, budget, cancellation, timings_out, search_request.continue_paging
+    )
+    watcher = asyncio.create_task(watch_disconnect(request, cancellation)) if futures else None
 
     try:
-        loop = asyncio.get_event_loop()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [
-                loop.run_in_executor(executor, search_single_keyword, keyword, idx)
-                for idx, keyword in enumerate(search_request.keywords)
-            ]
-            for future in asyncio.as_completed(futures):
-                keyword, results, success, message = await future
-                all_results.extend(results)
-                search_details[keyword] = {
-                    "success": success, 
-                    "count": len(results), 
-                    "message": message
-                }
+        capacity_rejections = 0
+        for next_done in asyncio.as_completed(
+            [settle_keyword_search(keyword, future) for keyword, future in zip(missing_keywords, futures)]
+        ):
+            keyword, outcome, error = await next_done
+            if error is not None:
+                # Bir kelimenin hatası diğer kelimelerin toplanmış sonuçlarını düşürmez
+                if isinstance(error, SchedulerFullError):
+                    capacity_rejections += 1
+                    logger.warning(f"Arama reddedildi, scraper kapasitesi dolu: {error}")
+                    message = "Scraper kapasitesi dolu, lütfen daha sonra tekrar deneyin."
+                else:
+                    logger.error(f"Arama hatası '{keyword}': {error}")
+                    message = str(error)
+                search_details[keyword] = {"success": False, "count": 0, "message": message, "cached": False}
+                continue
+            keyword, results, success, message = outcome
+            results_by_keyword[keyword] = results
+            search_details[keyword] = {
+                "success": success, 
+                "count": len(results), 
+                "message": message,
+                "cached": False
+            }
+            if timings_out is not None and keyword in timings_out:
+                search_details[keyword]["timings"] = timings_out[keyword]
+            cursor = scrape_cursor(keyword)
+            if cursor:
+                search_details[keyword]["cursor"] = cursor
 
-        # Sonuçları unique hale getir (aynı case_number'a sahip olanları birleştir)
-        unique_results = {}
-        for result in all_results:
-            # ResultItem objesi ise dict'e çevir
-            if hasattr(result, 'model_dump'):
-                result_dict = result.model_dump()
-            elif hasattr(result, 'dict'):
-                result_dict = result.dict()
-            else:
-                result_dict = result
-            
-            case_number = result_dict.get("case_number", result_dict.get("esas_no", "unknown"))
-            if case_number not in unique_results:
-                # API uyumluluğu için ek alanlar ekle
-                result_dict.update({
-                    "case_number": result_dict.get("esas_no", ""),
-                    "title": f"{result_dict.get('daire', '')} - {result_dict.get('karar_no', '')}",
-                    "content": result_dict.get("karar_metni", ""),
-                    "date": result_dict.get("karar_tarihi", ""),
-                    "court": result_dict.get("daire", ""),
-                    "url": f"https://karararama.yargitay.gov.tr/YargitayBilgiBankasiIstemciWeb/#{result_dict.get('esas_no', '')}"
-                })
-                unique_results[case_number] = result_dict
-        
-        final_results = list(unique_results.values())
+        # Taranması gereken kelimelerin tümü reddedildiyse kısmi (yalnızca cache) yanıt yerine 503
+        if capacity_rejections and capacity_rejections == len(missing_keywords):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Scraper kapasitesi dolu, lütfen daha sonra tekrar deneyin."
+            )
+
+        # Sonuçları istek sırasına göre birleştir ve unique hale getir
+        final_results = merge_unique_results(
+            {k: results_by_keyword[k] for k in keywords if k in results_by_keyword}
+        )
+        if search_request.max_results:
+            final_results = final_results[:search_request.max_results]
         
         # İstatistikleri güncelle
         search_stats["total_searches"] += 1
@@ -189,46 +577,31 @@ async def search_yargitay_parallel(
         elapsed_time = time.time() - start_time
         logger.info(f"Toplam arama süresi: {elapsed_time:.2f} saniye. Sonuç sayısı: {len(final_results)}")
 
+        cached_count = len(keywords) - len(missing_keywords)
+        if missing_keywords:
+            message = f"Paralel arama {elapsed_time:.2f} saniyede tamamlandı. {len(final_results)} unique sonuç bulundu."
+        else:
+            message = f"Cache'den döndürüldü. {len(final_results)} sonuç bulundu."
+        if cached_count and missing_keywords:
+            message += f" ({cached_count} anahtar kelime cache'den)"
+
         response_data = {
             "results": final_results,
             "success": True,
-            "message": f"Paralel arama {elapsed_time:.2f} saniyede tamamlandı. {len(final_results)} unique sonuç bulundu.",
+            "message": message,
             "search_details": search_details,
             "processing_time": elapsed_time,
             "total_keywords": len(search_request.keywords),
             "unique_results": len(final_results)
         }
         
-        # Firestore'a cache kaydet
-        if firestore_manager.client and final_results:
-            try:
-                await firestore_manager.save_search_cache(
-                    keywords=search_request.keywords,
-                    results=final_results,
-                    search_duration=elapsed_time
-                )
-                logger.info(f"Arama sonuçları Firestore cache'e kaydedildi")
-            except Exception as e:
-                logger.warning(f"Firestore cache kaydetme başarısız: {e}")
-        
-        # In-memory cache'e kaydet (fallback)
-        if len(search_cache) < 100:
-            search_cache[cache_key] = response_data
-        
         # Arama sorgusunu logla
-        if firestore_manager.client:
-            try:
-                await firestore_manager.log_search_query(
-                    query_text=" ".join(search_request.keywords),
-                    keywords=search_request.keywords,
-                    results_count=len(final_results),
-                    execution_time=elapsed_time
-                )
-            except Exception as e:
-                logger.warning(f"Arama sorgusu loglama başarısız: {e}")
+        await log_search(search_request.keywords, len(final_results), elapsed_time)
         
         return schemas.SearchResponse(**response_data)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Arama hatası: {str(e)}")
         return schemas.SearchResponse(
@@ -240,6 +613,128 @@ async def search_yargitay_parallel(
             total_keywords=len(search_request.keywords),
             unique_results=0
         )
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        cancellation.release_all()
+
+@app.post("/search/stream", tags=["Search"])
+@limiter.limit(settings.USER_RATE_LIMIT)
+async def search_yargitay_stream(
+    request: Request,
+    search_request: schemas.SearchRequest
+):
+    """
+    /search'ün akış (NDJSON) sürümü. Her anahtar kelimenin sonuçları, araması biter bitmez
+    bir satır olarak gönderilir; daha önce gönderilmiş kararlar tekrar edilmez.
+    Son satır toplam özet kaydıdır:
+        {"type": "keyword", "keyword": ..., "results": [...], "success": ..., "count": ..., "message": ..., "cached": ...}
+        {"type": "summary", "success": ..., "message": ..., "search_details": {...}, "processing_time": ..., ...}
+    İstemci bağlantıyı keserse veya X-Request-Timeout / X-Request-Deadline süresi dolarsa
+    isteğin tuttuğu taramalar bırakılır; başka bekleyeni olmayan taramalar durdurulur ve
+    kısmi sonuçları stale olarak cache'e yazılır.
+    """
+    logger.info(f"Akışlı arama başlatıldı: {len(search_request.keywords)} anahtar kelime")
+    start_time = time.time()
+
+    keywords = unique_keywords(search_request.keywords)
+    if search_request.continue_paging:
+        results_by_keyword, search_details = {}, {}
+    else:
+        results_by_keyword, search_details, _ = await lookup_without_scraping(keywords)
+    missing_keywords = [k for k in keywords if k not in results_by_keyword]
+    budget = create_result_budget(search_request.max_results, results_by_keyword, missing_keywords)
+    missing_keywords = skip_exhausted_keywords(budget, missing_keywords, results_by_keyword, search_details)
+    max_results = search_request.max_results or None
+    request_id = uuid.uuid4().hex
+    # İstemcinin kopması üreticiyi iptal eder; süre dolumu ve kopma ayrıca izlenir, finally taramaları bırakır
+    cancellation = RequestCancellation(deadline_from_headers(request.headers))
+
+    async def search_or_report(keyword: str, future) -> tuple:
+        try:
+            return await future
+        except SchedulerFullError as e:
+            logger.warning(f"Arama reddedildi, scraper kapasitesi dolu: {e}")
+            return keyword, [], False, "Scraper kapasitesi dolu, lütfen daha sonra tekrar deneyin."
+        except Exception as e:
+            logger.error(f"Arama hatası '{keyword}': {e}")
+            return keyword, [], False, str(e)
+
+    async def generate():
+        emitted = set()
+
+        def keyword_record(keyword: str, results: list, details: dict) -> str:
+            new_results = []
+            for result_dict in results:
+                if max_results is not None and len(emitted) >= max_results:
+                    break
+                key = result_key(result_dict)
+                if key not in emitted:
+                    emitted.add(key)
+                    new_results.append(result_dict)
+            record = {"type": "keyword", "keyword": keyword, **details, "results": new_results}
+            return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+        # Tarayıcı gerektirmeyen kelimeler hemen gönderilir
+        for keyword in keywords:
+            if keyword in results_by_keyword:
+                yield keyword_record(keyword, results_by_keyword[keyword], search_details[keyword])
+
+        timings_out = {} if search_request.include_timings else None
+        futures = start_keyword_searches(
+            missing_keywords, request_id, budget, cancellation, timings_out, search_request.continue_paging
+        )
+        watcher = asyncio.create_task(watch_disconnect(request, cancellation)) if futures else None
+        try:
+            for next_done in asyncio.as_completed(
+                [search_or_report(keyword, future) for keyword, future in zip(missing_keywords, futures)]
+            ):
+                keyword, results, success, message = await next_done
+                search_details[keyword] = {
+                    "success": success,
+                    "count": len(results),
+                    "message": message,
+                    "cached": False
+                }
+                if timings_out is not None and keyword in timings_out:
+                    search_details[keyword]["timings"] = timings_out[keyword]
+                cursor = scrape_cursor(keyword)
+                if cursor:
+                    search_details[keyword]["cursor"] = cursor
+                yield keyword_record(keyword, results, search_details[keyword])
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            cancellation.release_all()
+
+        elapsed_time = time.time() - start_time
+        search_stats["total_searches"] += 1
+        search_stats["total_results"] += len(emitted)
+        logger.info(f"Akışlı arama tamamlandı: {elapsed_time:.2f} saniye. Sonuç sayısı: {len(emitted)}")
+        yield json.dumps({
+            "type": "summary",
+            "success": True,
+            "message": f"Akışlı arama {elapsed_time:.2f} saniyede tamamlandı. {len(emitted)} unique sonuç bulundu.",
+            "search_details": search_details,
+            "processing_time": elapsed_time,
+            "total_keywords": len(search_request.keywords),
+            "unique_results": len(emitted)
+        }, ensure_ascii=False) + "\n"
+
+        await log_search(search_request.keywords, len(emitted), elapsed_time)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@app.get("/metrics", tags=["Statistics"])
+async def metrics():
+    """Prometheus metrikleri (scraper aşama süreleri, tarayıcı ve kuyruk durumu)"""
+    scheduler_stats = job_scheduler.get_stats()
+    browser_stats = browser_supervisor.get_stats()
+    ACTIVE_BROWSERS.set(browser_stats["browsers"])
+    BROWSER_RSS.set(browser_stats["rss_mb"] * 1024 * 1024)
+    SLOT_LIMIT.set(scheduler_stats["slot_limit"])
+    QUEUED_JOBS.set(scheduler_stats["queued"])
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/stats", tags=["Statistics"])
 async def get_stats():
@@ -247,6 +742,17 @@ async def get_stats():
     stats = {
         "search_stats": search_stats,
         "cache_size": len(search_cache),
+        "cache": search_cache.get_stats(),
+        "in_flight": search_flights.get_stats(),
+        "precrawler": precrawler.get_stats(),
+        "corpus": corpus.get_stats(),
+        "text_index": text_index.get_stats() if text_index is not None else {"enabled": False},
+        "scheduler": job_scheduler.get_stats(),
+        "site_throttle": site_controller.get_stats(),
+        "browsers": browser_supervisor.get_stats(),
+        "network": network_profile.get_stats(),
+        "grid": grid_client.get_stats() if not settings.USE_LOCAL_CHROME else {"enabled": False},
+        "checkpoints": checkpoint_store.get_stats(),
         "service_info": {
             "name": "Yargıtay Scraper API",
             "version": "2.1.0",
@@ -269,9 +775,7 @@ async def get_stats():
 @app.delete("/cache", tags=["Cache"])
 async def clear_cache():
     """Cache'i temizler"""
-    global search_cache
-    cache_size = len(search_cache)
-    search_cache.clear()
+    cache_size = search_cache.clear()
     
     # Firestore cache'i de temizle
     firestore_cleared = 0
@@ -291,3 +795,80 @@ async def clear_cache():
         }
     }
 
+
+@app.post("/precrawl/run", tags=["Cache"])
+async def run_precrawl(budget: int = settings.PRECRAWL_BROWSER_BUDGET):
+    """Popüler anahtar kelimeler için ön-tarama turunu hemen çalıştırır"""
+    if not firestore_manager.client:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ön-tarama için Firestore sorgu günlüğü gerekli."
+        )
+    return await precrawler.run_once(budget=budget)
+
+@app.get("/corpus/stats", tags=["Corpus"])
+async def get_corpus_stats():
+    """Karar korpusu istatistiklerini döndürür"""
+    stats = {"ingest": corpus.get_stats()}
+    if firestore_manager.client:
+        stats["store"] = await firestore_manager.get_corpus_stats()
+    return stats
+
+@app.post("/corpus/crawl", tags=["Corpus"])
+async def crawl_corpus(crawl_request: schemas.CorpusCrawlRequest):
+    """
+    Anahtar kelimeleri arka plan önceliğiyle tarar ve tarih aralığındaki kararları korpusa ekler.
+    Metni değişmemiş kararlar yeniden yazılmaz.
+    """
+    if not firestore_manager.client:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Korpus taraması için Firestore gerekli."
+        )
+
+    async def crawl_keyword(idx: int, keyword: str):
+        # Korpus taraması kendi single-flight anahtarıyla çalışır; etkileşimli bir aramanın
+        # uçuşuna katılmaz ve ona arka plan önceliği de devretmez
+        def scrape(kw: str, continue_paging: bool):
+            return search_flights.run(
+                flight_key(kw, continue_paging, "corpus-crawl"),
+                lambda: scrape_keyword(
+                    kw, "corpus-crawl", idx, PRIORITY_BACKGROUND, ingest=False,
+                    continue_paging=continue_paging, private=True
+                )
+            )
+
+        return await corpus.crawl(
+            keyword,
+            scrape,
+            crawl_request.date_from,
+            crawl_request.date_to,
+            settings.CORPUS_CRAWL_MAX_SCRAPES
+        )
+
+    results = await asyncio.gather(
+        *(crawl_keyword(idx, keyword) for idx, keyword in enumerate(unique_keywords(crawl_request.keywords)))
+    )
+    return {"results": results}
+
+
+@app.get("/index/search", tags=["Corpus"])
+async def search_local_index(q: str, limit: int = 10, require_all: bool = False):
+    """Yerel korpus indeksinde BM25 sıralı tam metin araması yapar (Selenium kullanılmaz)"""
+    if text_index is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Yerel metin indeksi devre dışı.")
+    started = time.time()
+    hits = await asyncio.to_thread(text_index.search, q, max(1, min(limit, 100)), require_all)
+    return {"query": q, "results": hits, "count": len(hits), "processing_time": time.time() - started}
+
+@app.post("/index/rebuild", tags=["Corpus"])
+async def rebuild_local_index():
+    """Yerel metin indeksini Firestore korpusundan yeniden oluşturur"""
+    if text_index is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Yerel metin indeksi devre dışı.")
+    if not firestore_manager.client:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="İndeks oluşturmak için Firestore korpusu gerekli."
+        )
+    return {"documents": await rebuild_text_index()}
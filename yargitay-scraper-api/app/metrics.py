@@ -0,0 +1,121 @@
+"""
+Scraper Aşama Metrikleri (Prometheus)
+Selenium tarama yolunun her aşaması (tarayıcı başlatma, ilk sayfa yüklemesi, arama, satır
+tıklaması, karar paneli beklemesi, sayfa geçişi, tarayıcı kapatma) histogram ve hata sayacı
+olarak kaydedilir; /metrics uç noktasından sunulur.
+search_single_keyword'e bir PhaseTimings verilirse aynı ölçümler o taramanın
+search_details kaydı için de toplanır (scheduler thread'inde ContextVar ile bağlanır).
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Aşama adları
+PHASE_DRIVER_START = "driver_start"
+PHASE_INITIAL_PAGE_LOAD = "initial_page_load"
+PHASE_SEARCH_SUBMIT = "search_submit"
+PHASE_ROW_CLICK = "row_click"
+PHASE_PANEL_WAIT = "panel_wait"
+PHASE_PAGINATION = "pagination"
+PHASE_DRIVER_QUIT = "driver_quit"
+PHASE_KEYWORD_TOTAL = "keyword_total"
+
+PHASE_DURATION = Histogram(
+    'scraper_phase_duration_seconds',
+    'Selenium scraping phase duration in seconds',
+    ['phase'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+)
+
+PHASE_ERRORS = Counter(
+    'scraper_phase_errors_total',
+    'Failed or timed out scraping phases',
+    ['phase']
+)
+
+KEYWORD_SEARCHES = Counter(
+    'scraper_keyword_searches_total',
+    'Browser keyword searches by outcome',
+    ['outcome']
+)
+
+DECISIONS_SCRAPED = Counter(
+    'scraper_decisions_scraped_total',
+    'Decisions read from karararama'
+)
+
+ACTIVE_BROWSERS = Gauge('scraper_active_browsers', 'Tracked Chrome instances')
+BROWSER_RSS = Gauge('scraper_browser_rss_bytes', 'Total RSS of tracked Chrome process trees')
+SLOT_LIMIT = Gauge('scraper_slot_limit', 'Current adaptive browser slot limit')
+QUEUED_JOBS = Gauge('scraper_queued_jobs', 'Scraper jobs waiting for a browser slot')
+
+
+class PhaseTimings:
+    """Tek bir anahtar kelime taramasının aşama bazlı süre toplamları"""
+
+    def __init__(self):
+        self._phases: Dict[str, Dict[str, float]] = {}
+
+    def add(self, phase: str, seconds: float, ok: bool = True):
+        entry = self._phases.setdefault(phase, {"count": 0, "seconds": 0.0, "errors": 0})
+        entry["count"] += 1
+        entry["seconds"] += seconds
+        if not ok:
+            entry["errors"] += 1
+
+    def merge(self, phases: Dict[str, Dict[str, float]]):
+        """Başka süreçte ölçülmüş as_dict() çıktısını toplamlara ekler."""
+        for phase, other in phases.items():
+            entry = self._phases.setdefault(phase, {"count": 0, "seconds": 0.0, "errors": 0})
+            entry["count"] += other.get("count", 0)
+            entry["seconds"] += other.get("seconds", 0.0)
+            entry["errors"] += other.get("errors", 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            phase: {
+                "count": int(entry["count"]),
+                "seconds": round(entry["seconds"], 3),
+                **({"errors": int(entry["errors"])} if entry["errors"] else {}),
+            }
+            for phase, entry in self._phases.items()
+        }
+
+
+_current_timings: ContextVar[Optional[PhaseTimings]] = ContextVar("scraper_phase_timings", default=None)
+
+
+def bind_timings(timings: Optional[PhaseTimings]):
+    """Bu thread'deki aşama ölçümlerini timings'e de yazar; reset için token döner."""
+    return _current_timings.set(timings)
+
+
+def unbind_timings(token):
+    _current_timings.reset(token)
+
+
+def observe_phase(phase: str, seconds: float, ok: bool = True):
+    """Süresi ölçülmüş bir aşamayı kaydeder."""
+    PHASE_DURATION.labels(phase=phase).observe(seconds)
+    if not ok:
+        PHASE_ERRORS.labels(phase=phase).inc()
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds, ok)
+
+
+@contextmanager
+def phase(name: str):
+    """Bloğun süresini aşama olarak kaydeder; istisna hata olarak sayılır ve yeniden fırlatılır."""
+    started = time.monotonic()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        observe_phase(name, time.monotonic() - started, ok)
@@ -0,0 +1,152 @@
+"""
+Tarayıcı Ağ Filtresi
+Yeni Chrome sürümlerinde --disable-images etkisizdir; karararama sayfa açılışlarında görseller,
+fontlar, CSS ve analiz scriptleri yüklenmeye devam eder. Bu modül iki katmanlı filtre uygular:
+- İzinli alan adları (NETWORK_ALLOWED_HOSTS) dışındaki tüm alanlar --host-resolver-rules ile
+  çözümlenemez yapılır; arama için gereken script ve XHR çağrıları yalnızca bu alanlardan gelir.
+- İzinli alanlardaki ağır kaynaklar CDP Network.setBlockedURLs desenleriyle engellenir.
+Her sayfa/panel yüklemesinde aktarılan bayt (Resource Timing) ve süre ölçülür. Tarayıcıların
+NETWORK_BASELINE_SAMPLE_RATE kadarı filtresiz açılarak tasarruf karşılaştırmalı raporlanır.
+"""
+import random
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from .config import settings
+
+PROFILE_FILTERED = "filtered"
+PROFILE_FULL = "full"
+
+# Son ölçümden bu yana yüklenen kaynakların toplam aktarım boyutu; ölçülen girdiler temizlenir
+TRANSFER_SIZE_SCRIPT = """
+const entries = performance.getEntriesByType('resource').concat(
+    window.__yzNavigationMeasured ? [] : performance.getEntriesByType('navigation'));
+window.__yzNavigationMeasured = true;
+let bytes = 0;
+for (const e of entries) { bytes += e.transferSize || 0; }
+performance.clearResourceTimings();
+return [bytes, entries.length];
+"""
+
+
+def split_setting(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def host_resolver_rules(allowed_hosts: List[str]) -> str:
+    """İzinli alanlar dışındaki tüm alan adlarını çözümlenemez yapan Chrome kuralı"""
+    excludes = "".join(f", EXCLUDE {host}" for host in allowed_hosts)
+    return f"MAP * ~NOTFOUND{excludes}"
+
+
+class NetworkProfile:
+    """Chrome ağ filtresini uygulayan ve bayt/süre tasarrufunu ölçen yardımcı"""
+
+    def __init__(self, enabled: bool, allowed_hosts: List[str], blocked_patterns: List[str], baseline_rate: float):
+        self.enabled = enabled
+        self.allowed_hosts = allowed_hosts
+        self.blocked_patterns = blocked_patterns
+        self.baseline_rate = baseline_rate
+        self._lock = threading.Lock()
+        self._profiles: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+        self._totals: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._stats = {"filtered_browsers": 0, "full_browsers": 0, "cdp_unavailable": 0}
+
+    def configure_options(self, chrome_options) -> str:
+        """Yeni tarayıcının profilini seçer ve Chrome seçeneklerine uygular."""
+        if not self.enabled or random.random() < self.baseline_rate:
+            return PROFILE_FULL
+        if self.allowed_hosts:
+            chrome_options.add_argument(f"--host-resolver-rules={host_resolver_rules(self.allowed_hosts)}")
+        # --disable-images yerine görsel yüklemesini içerik ayarıyla kapat
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        return PROFILE_FILTERED
+
+    def attach(self, driver, profile: str):
+        """Tarayıcı açıldıktan sonra CDP engelleme listesini kurar ve profili kaydeder."""
+        if profile == PROFILE_FILTERED and self.blocked_patterns:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_patterns})
+            except Exception as e:
+                # Remote (Grid) sürücülerinde CDP olmayabilir; alan adı filtresi yine de geçerli
+                logger.debug(f"CDP engelleme listesi kurulamadı: {e}")
+                with self._lock:
+                    self._stats["cdp_unavailable"] += 1
+        with self._lock:
+            self._profiles[driver] = profile
+            self._stats[f"{profile}_browsers"] += 1
+
+    def measure(self, driver, kind: str, seconds: float):
+        """Son ölçümden bu yana aktarılan baytları ve yükleme süresini kaydeder."""
+        with self._lock:
+            profile = self._profiles.get(driver)
+        if profile is None:
+            return
+        try:
+            transferred, requests = driver.execute_script(TRANSFER_SIZE_SCRIPT)
+        except Exception:
+            return
+        with self._lock:
+            totals = self._totals.setdefault(profile, {}).setdefault(
+                kind, {"loads": 0, "bytes": 0, "requests": 0, "seconds": 0.0}
+            )
+            totals["loads"] += 1
+            totals["bytes"] += int(transferred or 0)
+            totals["requests"] += int(requests or 0)
+            totals["seconds"] += seconds
+
+    @staticmethod
+    def _averages(totals: Dict[str, float]) -> Dict[str, float]:
+        loads = max(1, totals["loads"])
+        return {
+            "loads": totals["loads"],
+            "avg_kb": round(totals["bytes"] / loads / 1024, 1),
+            "avg_requests": round(totals["requests"] / loads, 1),
+            "avg_seconds": round(totals["seconds"] / loads, 3),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = {
+                **self._stats,
+                "enabled": self.enabled,
+                "allowed_hosts": self.allowed_hosts,
+                "blocked_patterns": len(self.blocked_patterns),
+            }
+            totals = {profile: {kind: dict(t) for kind, t in kinds.items()} for profile, kinds in self._totals.items()}
+        for profile, kinds in totals.items():
+            stats[profile] = {kind: self._averages(t) for kind, t in kinds.items()}
+        savings = {}
+        for kind in totals.get(PROFILE_FILTERED, {}):
+            baseline: Optional[Dict[str, float]] = totals.get(PROFILE_FULL, {}).get(kind)
+            if not baseline:
+                continue
+            filtered = self._averages(totals[PROFILE_FILTERED][kind])
+            full = self._averages(baseline)
+            savings[kind] = {
+                "kb_per_load": round(full["avg_kb"] - filtered["avg_kb"], 1),
+                "seconds_per_load": round(full["avg_seconds"] - filtered["avg_seconds"], 3),
+                "bytes_pct": round(100 * (1 - filtered["avg_kb"] / full["avg_kb"]), 1) if full["avg_kb"] else 0.0,
+            }
+        if savings:
+            stats["savings"] = savings
+        return stats
+
+
+# Global ağ filtresi
+network_profile = NetworkProfile(
+    enabled=settings.NETWORK_BLOCKING_ENABLED,
+    # Arama sayfasının alanı (ör. yerel fixture sunucusu) her zaman izinlidir
+    allowed_hosts=[
+        host for host in dict.fromkeys(
+            split_setting(settings.NETWORK_ALLOWED_HOSTS) + [urlparse(settings.YARGITAY_BASE_URL).hostname]
+        ) if host
+    ],
+    blocked_patterns=split_setting(settings.NETWORK_BLOCKED_URL_PATTERNS),
+    baseline_rate=settings.NETWORK_BASELINE_SAMPLE_RATE
+)
@@ -0,0 +1,178 @@
+"""
+Popüler Anahtar Kelime Ön-Tarayıcısı
+search_queries kayıtlarından en sık ve yükselen anahtar kelimeleri çıkarır, bunların
+cache kayıtlarını yoğun olmayan saatlerde sınırlı bir tarayıcı bütçesiyle yeniler.
+Böylece kullanıcı aramalarının çoğu canlı Selenium gecikmesi yerine sıcak cache'e düşer.
+"""
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from loguru import logger
+
+from .cache import normalize_keyword
+from .config import settings
+from .scheduler import PRIORITY_BACKGROUND
+
+
+def parse_hour_range(value: str) -> Tuple[int, int]:
+    """'1-6' biçimindeki saat aralığını (başlangıç, bitiş) olarak döndürür."""
+    start, end = (int(part) for part in value.split("-", 1))
+    return start % 24, end % 24
+
+
+def in_hour_range(hour: int, hour_range: Tuple[int, int]) -> bool:
+    """Saat aralık içinde mi? Bitiş hariçtir; aralık gece yarısını aşabilir."""
+    start, end = hour_range
+    if start == end:
+        return True
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    if not isinstance(value, datetime):
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def rank_keywords(
+    queries: Iterable[Dict[str, Any]],
+    now: datetime,
+    rising_window: timedelta,
+    lookback: timedelta
+) -> List[Tuple[str, float]]:
+    """
+    Sorgu kayıtlarından anahtar kelime puanları üretir (yüksekten düşüğe).
+    Puan = toplam sorgu sayısı + son penceredeki sayının, önceki dönemin aynı
+    uzunluktaki pencere ortalamasını aşan kısmının iki katı (yükselen kelimeler öne çıkar).
+    """
+    now = _as_utc(now)
+    total: Counter = Counter()
+    recent: Counter = Counter()
+    for query in queries:
+        created_at = _as_utc(query.get("created_at"))
+        for keyword in {normalize_keyword(k) for k in query.get("keywords") or []}:
+            if not keyword:
+                continue
+            total[keyword] += 1
+            if created_at and now - created_at <= rising_window:
+                recent[keyword] += 1
+
+    previous_windows = max((lookback - rising_window) / rising_window, 1.0)
+    scores = {}
+    for keyword, count in total.items():
+        baseline = (count - recent[keyword]) / previous_windows
+        scores[keyword] = count + 2 * max(0.0, recent[keyword] - baseline)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class PreCrawler:
+    """Sorgu günlüğüne dayalı, bütçe sınırlı arka plan cache ısıtıcısı"""
+
+    def __init__(
+        self,
+        cache,
+        flights,
+        scrape_fn: Callable[..., Awaitable[tuple]],
+        query_source
+    ):
+        self.cache = cache
+        self.flights = flights
+        self.scrape_fn = scrape_fn
+        self.query_source = query_source
+        self._task: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Any] = {"runs": 0, "refreshed": 0, "skipped_fresh": 0, "failed": 0, "last_run": None}
+
+    def is_offpeak(self, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(ZoneInfo(settings.PRECRAWL_TIMEZONE))
+        return in_hour_range(now.hour, parse_hour_range(settings.PRECRAWL_OFFPEAK_HOURS))
+
+    async def select_keywords(self, budget: int) -> List[str]:
+        """Puanı en yüksek, cache'i taze olmayan en fazla `budget` anahtar kelimeyi seçer."""
+        now = datetime.now(timezone.utc)
+        lookback = timedelta(days=settings.PRECRAWL_LOOKBACK_DAYS)
+        queries = await self.query_source.get_recent_search_queries(now - lookback)
+        ranked = rank_keywords(queries, now, timedelta(hours=settings.PRECRAWL_RISING_WINDOW_HOURS), lookback)
+
+        candidates = [keyword for keyword, _ in ranked[:budget * 3]]
+        cached = await self.cache.get_many(candidates, track=False) if candidates else {}
+
+        selected = []
+        for keyword in candidates:
+            entry = cached.get(keyword)
+            if entry and not entry["stale"]:
+                self._stats["skipped_fresh"] += 1
+                continue
+            selected.append(keyword)
+            if len(selected) >= budget:
+                break
+        return selected
+
+    async def run_once(self, budget: Optional[int] = None) -> Dict[str, Any]:
+        """Tek bir ön-tarama turu çalıştırır ve özetini döndürür."""
+        budget = budget if budget is not None else settings.PRECRAWL_BROWSER_BUDGET
+        started = time.time()
+        keywords = await self.select_keywords(budget)
+        semaphore = asyncio.Semaphore(max(1, settings.PRECRAWL_MAX_CONCURRENCY))
+        refreshed, failed = [], []
+
+        async def refresh(idx: int, keyword: str):
+            async with semaphore:
+                try:
+                    _, _, success, _ = await self.flights.run(
+                        keyword,
+                        lambda: self.scrape_fn(keyword, "precrawl", idx, PRIORITY_BACKGROUND)
+                    )
+                    (refreshed if success else failed).append(keyword)
+                except Exception as e:
+                    logger.warning(f"Ön-tarama başarısız '{keyword}': {e}")
+                    failed.append(keyword)
+
+        await asyncio.gather(*(refresh(idx, keyword) for idx, keyword in enumerate(keywords)))
+
+        self._stats["runs"] += 1
+        self._stats["refreshed"] += len(refreshed)
+        self._stats["failed"] += len(failed)
+        self._stats["last_run"] = datetime.utcnow().isoformat()
+        summary = {
+            "selected": keywords,
+            "refreshed": len(refreshed),
+            "failed": len(failed),
+            "duration": round(time.time() - started, 2),
+        }
+        logger.info(f"Ön-tarama turu tamamlandı: {summary['refreshed']}/{len(keywords)} anahtar kelime yenilendi")
+        return summary
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(settings.PRECRAWL_INTERVAL_SECONDS)
+            if not self.is_offpeak():
+                continue
+            if getattr(self.query_source, "client", None) is None:
+                continue
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Ön-tarama turu hatası: {e}")
+
+    def start(self):
+        if self._task is None and settings.PRECRAWL_ENABLED:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"Ön-tarayıcı başlatıldı (yoğun olmayan saatler: {settings.PRECRAWL_OFFPEAK_HOURS})")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "enabled": settings.PRECRAWL_ENABLED, "running": self._task is not None}
@@ -0,0 +1,193 @@
+"""
+Süreç Genelinde Scraper Zamanlayıcısı
+Tüm /search istekleri tarayıcı gerektiren işleri tek bir slot havuzuna gönderir.
+Aynı anda çalışan Chrome oturumu sayısı MAX_BROWSER_SLOTS ile sınırlıdır; bekleyen işler
+öncelik seviyesine göre, aynı seviyede ise istekler arasında sırayla (round-robin) dağıtılır.
+Bir eşzamanlılık denetleyicisi (throttle.AIMDController) verilirse etkin slot sayısı
+site gecikmelerine göre MAX_BROWSER_SLOTS altında dinamik olarak sınırlanır.
+"""
+import threading
+import time
+import concurrent.futures
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from .config import settings
+from .throttle import site_controller
+
+# Öncelik seviyeleri (küçük değer önce çalışır)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class SchedulerFullError(Exception):
+    """Kuyruk kapasitesi dolduğunda fırlatılır."""
+
+
+@dataclass
+class ScraperJob:
+    request_id: str
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    future: concurrent.futures.Future
+    priority: int = PRIORITY_INTERACTIVE
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class ScraperScheduler:
+    """Global tarayıcı slot limiti, öncelikli ve adil iş kuyruğu"""
+
+    def __init__(self, max_slots: int, max_queue: int, concurrency=None):
+        self.max_slots = max(1, max_slots)
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self._cond = threading.Condition()
+        # priority -> OrderedDict[request_id, deque[ScraperJob]]
+        self._queues: Dict[int, "OrderedDict[str, deque]"] = {}
+        self._queued = 0
+        self._active = 0
+        self._workers: list[threading.Thread] = []
+        self._running = False
+        self._wait_samples: deque = deque(maxlen=500)
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    # Yaşam döngüsü
+    def start(self):
+        """Worker thread'lerini başlatır (idempotent)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            for idx in range(self.max_slots):
+                worker = threading.Thread(target=self._worker_loop, name=f"scraper-slot-{idx}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        logger.info(f"Scraper zamanlayıcısı başlatıldı: {self.max_slots} tarayıcı slotu")
+
+    def shutdown(self, wait: bool = True):
+        """Yeni iş kabulünü durdurur, bekleyen işleri iptal eder."""
+        with self._cond:
+            self._running = False
+            for level in self._queues.values():
+                for jobs in level.values():
+                    for job in jobs:
+                        job.future.cancel()
+            self._queues.clear()
+            self._queued = 0
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join(timeout=5)
+        self._workers.clear()
+        logger.info("Scraper zamanlayıcısı durduruldu")
+
+    # İş gönderme
+    def submit(
+        self,
+        request_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> concurrent.futures.Future:
+        """İşi kuyruğa ekler ve sonucu taşıyacak Future'ı döndürür."""
+        if not self._running:
+            self.start()
+
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        job = ScraperJob(request_id=request_id, fn=fn, args=args, future=future, priority=priority)
+
+        with self._cond:
+            if self._queued >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise SchedulerFullError(f"Scraper kuyruğu dolu ({self._queued}/{self.max_queue})")
+            level = self._queues.setdefault(priority, OrderedDict())
+            level.setdefault(request_id, deque()).append(job)
+            self._queued += 1
+            self._stats["submitted"] += 1
+            self._cond.notify()
+        return future
+
+    @property
+    def slot_limit(self) -> int:
+        """Şu an kullanılabilecek tarayıcı slotu sayısı"""
+        if self.concurrency is None:
+            return self.max_slots
+        return max(1, min(self.max_slots, self.concurrency.limit))
+
+    def _next_job(self) -> Optional[ScraperJob]:
+        """En yüksek öncelikli seviyede sıradaki isteğin ilk işini alır (lock altında çağrılır)."""
+        for priority in sorted(self._queues):
+            level = self._queues[priority]
+            while level:
+                request_id, jobs = level.popitem(last=False)
+                job = jobs.popleft()
+                if jobs:
+                    # İsteğin kalan işleri sıranın sonuna gider (istekler arası adalet)
+                    level[request_id] = jobs
+                self._queued -= 1
+                if job.future.set_running_or_notify_cancel():
+                    return job
+            del self._queues[priority]
+        return None
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                job = None
+                while self._running:
+                    if self._active < self.slot_limit:
+                        job = self._next_job()
+                        if job:
+                            break
+                    # Denetleyici sınırı lock dışında artırabildiğinden bekleme süreli yapılır
+                    self._cond.wait(timeout=0.5 if self.concurrency else None)
+                if not job:
+                    return
+                self._active += 1
+                self._wait_samples.append(time.monotonic() - job.enqueued_at)
+
+            try:
+                result = job.fn(*job.args)
+                job.future.set_result(result)
+                ok = True
+            except BaseException as e:
+                job.future.set_exception(e)
+                ok = False
+            finally:
+                with self._cond:
+                    self._active -= 1
+                    self._stats["completed" if ok else "failed"] += 1
+                    self._cond.notify()
+
+    # Metrikler
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            samples = sorted(self._wait_samples)
+            pending_requests = len({rid for level in self._queues.values() for rid in level})
+            stats = {
+                **self._stats,
+                "max_slots": self.max_slots,
+                "slot_limit": self.slot_limit,
+                "active": self._active,
+                "queued": self._queued,
+                "pending_requests": pending_requests,
+            }
+        if samples:
+            stats["queue_wait"] = {
+                "avg": round(sum(samples) / len(samples), 4),
+                "p50": round(samples[len(samples) // 2], 4),
+                "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+                "max": round(samples[-1], 4),
+            }
+        return stats
+
+
+# Global scheduler instance
+scraper_scheduler = ScraperScheduler(
+    max_slots=settings.MAX_BROWSER_SLOTS,
+    max_queue=settings.SCRAPER_MAX_QUEUE,
+    concurrency=site_controller if settings.ADAPTIVE_CONCURRENCY_ENABLED else None
+)
@@ -1,5 +1,6 @@
 # /yargitay-scraper-api/app/schemas.py (MongoDB'siz)
 
+from datetime import date
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 
@@ -21,6 +22,8 @@ class ResultItem(BaseModel):
 class SearchRequest(BaseModel):
     keywords: List[str]
     max_results: Optional[int] = 50
+    include_timings: bool = False  # search_details içine taranan kelimelerin aşama sürelerini ekle
+    continue_paging: bool = False  # Cache'i atla, önceki taramanın kaldığı sayfadan yeni kararları getir
 
 class SearchResponse(BaseModel):
     results: List[ResultItem]
@@ -29,4 +32,10 @@ class SearchResponse(BaseModel):
     search_details: Dict[str, Any]
     processing_time: Optional[float] = None
     total_keywords: Optional[int] = None
-    unique_results: Optional[int] = None
\ No newline at end of file
+    unique_results: Optional[int] = None
+
+# --- Korpus Şemaları ---
+class CorpusCrawlRequest(BaseModel):
+    keywords: List[str]
+    date_from: Optional[date] = None  # Verilmezse önceki taramanın en yeni karar tarihinden devam edilir
+    date_to: Optional[date] = None
@@ -1,12 +1,13 @@
 # /yargitay-scraper-api/app/search_logic.py
 # KULLANICI GÖRSELİNE GÖRE GÜNCELLENMİŞ VE DOĞRULANMIŞ VERSİYON
 
+import hashlib
 import threading
 import time
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_fixed
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support import expected_conditions as EC
@@ -14,15 +15,97 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 from .schemas import ResultItem
 from .config import settings
+from .throttle import site_controller
+from .browser_supervisor import browser_supervisor
+from .network_profile import network_profile
+from .grid_client import grid_client
+from .checkpoint import STATUS_COMPLETE, checkpoint_store
+from .metrics import (
+    PHASE_DRIVER_QUIT, PHASE_DRIVER_START, PHASE_INITIAL_PAGE_LOAD, PHASE_KEYWORD_TOTAL, PHASE_PAGINATION,
+    PHASE_PANEL_WAIT, PHASE_ROW_CLICK, PHASE_SEARCH_SUBMIT, bind_timings, observe_phase, phase, unbind_timings,
+)
+
+# Panel zamanında yüklenmediğinde karar metni yerine kaydedilen ifade
+DECISION_TEXT_MISSING = "Karar metni bulunamadı."
+
+# Sonraki sayfaya geçiş sonuçları: yalnızca PAGE_LAST taramayı tükenmiş sayar;
+# PAGE_FAILED geçici bir hatadır ve tarama kaydı sonraki denemede devam etmek üzere açık kalır.
+PAGE_ADVANCED = "advanced"
+PAGE_LAST = "last"
+PAGE_FAILED = "failed"
+
+# #kararAlani içeriği önceki karardan farklı hale gelene kadar bekleyen MutationObserver.
+# Metin değiştikten sonra PANEL_SETTLE_MS boyunca yeni mutasyon gelmezse çözülür;
+# aynı metinli bir karar yeniden render edilirse son mutasyondan kısa süre sonra kabul edilir.
+PANEL_CHANGE_SCRIPT = """
+const previous = arguments[0];
+const timeoutMs = arguments[1];
+const settleMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const readPanel = () => {
+    const el = document.getElementById('kararAlani');
+    return el ? (el.innerText || '').trim() : '';
+};
+let settleTimer = null;
+let mutated = false;
+const finish = (value) => {
+    observer.disconnect();
+    clearTimeout(settleTimer);
+    clearTimeout(deadline);
+    done(value);
+};
+const check = () => {
+    const text = readPanel();
+    if (!text) { return; }
+    if (text !== previous) {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(() => finish(readPanel()), settleMs);
+    } else if (mutated) {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(() => finish(readPanel()), settleMs * 4);
+    }
+};
+const observer = new MutationObserver(() => { mutated = true; check(); });
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+const deadline = setTimeout(() => finish(null), timeoutMs);
+check();
+"""
+
+
+def new_wait(driver, timeout: float | None = None) -> WebDriverWait:
+    """Kısa aralıklarla yoklayan WebDriverWait oluşturur (varsayılan 0.5 sn yerine)."""
+    return WebDriverWait(
+        driver,
+        timeout or settings.PANEL_WAIT_TIMEOUT,
+        poll_frequency=settings.PANEL_POLL_MIN_INTERVAL
+    )
+
+
+def text_fingerprint(text: str) -> str:
+    """Panel metinlerini karşılaştırmak için kısa bir özet üretir."""
+    return hashlib.md5(text.encode("utf-8")).hexdigest() if text else ""
+
 
 @retry(stop=stop_after_attempt(3), wait=wait_fixed(2), reraise=True)
 def initial_page_load(driver, url: str):
     """Sadece ilk sayfa yüklemesi için kullanılır"""
     logger.info(f"İlk sayfa yükleniyor: {url}")
-    driver.get(url)
-    WebDriverWait(driver, 20).until(
-        lambda d: d.execute_script("return document.readyState") == "complete"
-    )
+    site_controller.acquire_site_request()
+    started = time.monotonic()
+    try:
+        driver.get(url)
+        new_wait(driver).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    except Exception:
+        site_controller.observe("page", time.monotonic() - started, ok=False)
+        observe_phase(PHASE_INITIAL_PAGE_LOAD, time.monotonic() - started, ok=False)
+        raise
+    elapsed = time.monotonic() - started
+    site_controller.observe("page", elapsed)
+    observe_phase(PHASE_INITIAL_PAGE_LOAD, elapsed)
+    network_profile.measure(driver, "page", elapsed)
+    browser_supervisor.record_page(driver)
 
 def extract_row_data(row) -> dict | None:
     """Bir satır elementinden temel verileri çıkarır."""
@@ -40,23 +123,78 @@ def extract_row_data(row) -> dict | None:
         logger.warning(f"Satır verisi çıkarılamadı: {e}")
         return None
 
-def get_decision_text(driver, wait) -> str:
+def read_panel_text(driver) -> str:
+    """#kararAlani panelinde o an görünen metni döndürür (panel yoksa boş metin)."""
+    try:
+        return (driver.execute_script(
+            "const el = document.getElementById('kararAlani');"
+            "return el ? (el.innerText || '').trim() : '';"
+        ) or "").strip()
+    except Exception:
+        return ""
+
+
+def _poll_for_panel_change(driver, previous_fingerprint: str, timeout: float) -> str | None:
+    """
+    MutationObserver kullanılamadığında yedek yol: panel metninin özetini
+    artan aralıklarla (PANEL_POLL_MIN_INTERVAL -> PANEL_POLL_MAX_INTERVAL) karşılaştırır.
+    """
+    deadline = time.monotonic() + timeout
+    interval = settings.PANEL_POLL_MIN_INTERVAL
+    while time.monotonic() < deadline:
+        text = read_panel_text(driver)
+        if text and text_fingerprint(text) != previous_fingerprint:
+            # Metnin tamamen dolduğundan emin olmak için bir kez daha oku
+            time.sleep(settings.PANEL_SETTLE_MS / 1000)
+            settled = read_panel_text(driver)
+            if settled == text:
+                return text
+            interval = settings.PANEL_POLL_MIN_INTERVAL
+            continue
+        time.sleep(interval)
+        interval = min(interval * 2, settings.PANEL_POLL_MAX_INTERVAL)
+    return None
+
+
+def get_decision_text(driver, wait, previous_text: str = "") -> str:
     """
     Sağ panelde görüntülenen karar metnini alır.
-    Her tıklamadan sonra bu panelin içeriği güncellenir.
+    Her tıklamadan sonra bu panelin içeriği güncellenir; sabit bir süre beklemek yerine
+    panel metni bir önceki karardan farklı hale gelip durulana kadar beklenir.
     """
+    timeout = settings.PANEL_WAIT_TIMEOUT
+    started = time.monotonic()
     try:
-        # Karar metni alanının yüklenmesini ve görünür olmasını bekle
-        decision_element = wait.until(EC.visibility_of_element_located((By.ID, "kararAlani")))
-        # İçeriğin tam olarak dolması için küçük bir ek bekleme faydalı olabilir
-        time.sleep(0.5) 
-        return decision_element.text.strip()
+        text = driver.execute_async_script(
+            PANEL_CHANGE_SCRIPT,
+            previous_text,
+            int(timeout * 1000),
+            settings.PANEL_SETTLE_MS
+        )
     except TimeoutException:
-        logger.warning("Karar metni elementi bulunamadı veya zamanında yüklenmedi.")
-        return "Karar metni bulunamadı."
+        text = None
     except Exception as e:
-        logger.error(f"Karar metni alınırken beklenmedik bir hata oluştu: {e}")
-        return "Karar metni alınamadı."
+        logger.debug(f"MutationObserver beklemesi kullanılamadı, yoklamaya geçiliyor: {e}")
+        text = _poll_for_panel_change(driver, text_fingerprint(previous_text), timeout)
+
+    elapsed = time.monotonic() - started
+    site_controller.observe("panel", elapsed, ok=bool(text))
+    observe_phase(PHASE_PANEL_WAIT, elapsed, ok=bool(text))
+    network_profile.measure(driver, "panel", elapsed)
+    browser_supervisor.record_page(driver)
+    if text:
+        return text.strip()
+
+    logger.warning("Karar metni elementi bulunamadı veya zamanında yüklenmedi.")
+    return DECISION_TEXT_MISSING
+
+
+def panel_baseline(driver, karar_metni: str) -> str:
+    """
+    Sonraki satırın karşılaştırılacağı panel metni. Zaman aşımında panelde hâlâ önceki
+    karar durabilir; bu yüzden yedek ifade değil, panelin o anki metni kullanılır.
+    """
+    return read_panel_text(driver) if karar_metni == DECISION_TEXT_MISSING else karar_metni
 
 def wait_for_page_load(driver, wait, page_identifier_element_locator):
     """Sayfa geçişlerinde (örneğin sonraki sayfaya tıklayınca) sayfanın tam olarak yüklenmesini bekler."""
@@ -69,11 +207,25 @@ def wait_for_page_load(driver, wait, page_identifier_element_locator):
         logger.warning("Sayfa yüklenirken veya sayfa kimlik öğesi beklenirken zaman aşımına uğradı.")
         return False
 
-def process_page_rows(driver, wait, thread_name, found_count, processed_cases, results, keyword):
+def wants_more(found_count: int, keyword: str, budget=None, cancel_token=None, pending: int = 0) -> bool:
+    """
+    Kelime için bir karar daha okunmalı mı? Kelime hedefi, isteğin paylaşılan bütçesi ve
+    iptal token'ı (istemci ayrıldı / süre doldu) her satır ve sayfa öncesinde kontrol edilir.
+    found_count kelimenin okuduğu karar sayısıdır; bütçe kotası yalnızca yeni kararlarla dolar.
+    pending, tıklanmış ama henüz okunmamış satırlardır.
+    """
+    if cancel_token is not None and cancel_token.cancelled:
+        return False
+    if found_count + pending >= settings.TARGET_RESULTS_PER_KEYWORD:
+        return False
+    return budget is None or budget.wants_more(keyword, found_count, pending)
+
+def process_page_rows(driver, wait, thread_name, found_count, processed_cases, results, keyword, budget=None, cancel_token=None):
     """
     Mevcut sayfadaki satırları tek tek işler.
     Her satıra tıklandığında, karar metni aynı sayfanın sağ panelinde belirir.
     Bu nedenle sayfa yenileme veya geri dönme işlemi GEREKMEZ.
+    budget verilirse her satırdan önce isteğin paylaşılan sonuç bütçesi kontrol edilir.
     """
     try:
         # Sayfadaki tüm satırları döngüden önce BİR KEZ alıyoruz.
@@ -85,9 +237,12 @@ def process_page_rows(driver, wait, thread_name, found_count, processed_cases, r
 
         logger.info(f"[{thread_name}] Sayfada {len(rows)} adet satır bulundu. İşlem başlıyor...")
 
+        # Panelde halihazırda görünen karar; yeni tıklamada bundan farklı bir metin beklenir
+        previous_text = read_panel_text(driver)
+
         for i, row in enumerate(rows):
-            if found_count >= settings.TARGET_RESULTS_PER_KEYWORD:
-                logger.info(f"[{thread_name}] Hedeflenen sonuç sayısına ulaşıldı. Bu sayfanın işlenmesi durduruluyor.")
+            if not wants_more(found_count, keyword, budget, cancel_token):
+                logger.info(f"[{thread_name}] Hedeflenen sonuç sayısına ulaşıldı veya arama iptal edildi. Bu sayfanın işlenmesi durduruluyor.")
                 break
 
             try:
@@ -105,18 +260,22 @@ def process_page_rows(driver, wait, thread_name, found_count, processed_cases, r
                 logger.info(f"[{thread_name}] Satır {i + 1}/{len(rows)} işleniyor: {case_id}")
 
                 # Satıra tıkla ve sağdaki panelin güncellenmesini tetikle
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
-                time.sleep(0.2)
-                row.click()
+                with phase(PHASE_ROW_CLICK):
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
+                    site_controller.acquire_site_request()
+                    row.click()
 
-                # Karar metnini al (get_decision_text fonksiyonu panelin yüklenmesini bekleyecektir)
-                karar_metni = get_decision_text(driver, wait)
+                # Karar metnini al (get_decision_text panelin yeni karara geçmesini bekler)
+                karar_metni = get_decision_text(driver, wait, previous_text)
+                previous_text = panel_baseline(driver, karar_metni)
                 
                 # Sonucu listeye ekle
                 result_item = ResultItem(**row_data, karar_metni=karar_metni, keyword=keyword)
                 results.append(result_item)
                 processed_cases.add(case_id)
                 found_count += 1
+                if budget is not None:
+                    budget.record(keyword, row_data["esas_no"])
                 logger.success(f"[{thread_name}] Karar {case_id} başarıyla işlendi. Toplam bulunan: {found_count}/{settings.TARGET_RESULTS_PER_KEYWORD}")
 
             except Exception as e:
@@ -131,109 +290,490 @@ def process_page_rows(driver, wait, thread_name, found_count, processed_cases, r
         logger.error(f"[{thread_name}] Sayfa işlenirken genel bir hata oluştu: {e}")
         return found_count
 
-# search_single_keyword fonksiyonu, sayfalama (pagination) mantığı doğru olduğu için
-# büyük ölçüde aynı kalabilir. Sadece process_page_rows'u doğru çağırması yeterlidir.
+def process_page_rows_multi_tab(driver, tab_handles, thread_name, found_count, processed_cases, results, keyword, budget=None, cancel_token=None):
+    """
+    Aynı sonuç sayfası açık olan birden çok sekmede satırları eşzamanlı işler.
+    Satırlar sekmelere sırayla dağıtılır (i % sekme_sayısı). Her turda önce tüm sekmelerde
+    birer satıra tıklanır, ardından panel metinleri sırayla okunur; böylece karar
+    yüklemeleri tarayıcı içinde paralel ilerler.
+    """
+    tab_count = len(tab_handles)
+    queues = {}
+    previous_texts = {}
+    try:
+        for tab_index, handle in enumerate(tab_handles):
+            driver.switch_to.window(handle)
+            rows = driver.find_elements(By.CSS_SELECTOR, "#detayAramaSonuclar tbody tr")
+            queues[handle] = [(i, row) for i, row in enumerate(rows) if i % tab_count == tab_index]
+            previous_texts[handle] = read_panel_text(driver)
 
-def search_single_keyword(keyword: str, thread_id: int) -> tuple:
-    """Tek bir anahtar kelime için Yargıtay sitesinde arama yapar ve sonuçları toplar."""
-    driver = None
-    thread_name = f"Thread-{thread_id}-{keyword}"
-    threading.current_thread().name = thread_name
+        if not any(queues.values()):
+            logger.warning(f"[{thread_name}] Bu sayfada işlenecek satır bulunamadı.")
+            return found_count
 
+        logger.info(f"[{thread_name}] Sayfadaki satırlar {tab_count} sekmede işleniyor...")
+
+        while any(queues.values()) and wants_more(found_count, keyword, budget, cancel_token):
+            pending = []
+
+            # 1. Aşama: her sekmede bir satıra tıkla (yüklemeler paralel başlar)
+            for handle in tab_handles:
+                if pending and not wants_more(found_count, keyword, budget, cancel_token, len(pending)):
+                    break
+                driver.switch_to.window(handle)
+                while queues[handle]:
+                    i, row = queues[handle].pop(0)
+                    try:
+                        row_data = extract_row_data(row)
+                        if not row_data:
+                            logger.warning(f"[{thread_name}] Satır {i + 1} için veri çıkarılamadı, atlanıyor.")
+                            continue
+                        case_id = f"{row_data['esas_no']}-{row_data['karar_no']}"
+                        if case_id in processed_cases or any(p[2] == case_id for p in pending):
+                            logger.info(f"[{thread_name}] Karar {case_id} daha önce işlenmiş, atlanıyor.")
+                            continue
+                        with phase(PHASE_ROW_CLICK):
+                            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", row)
+                            site_controller.acquire_site_request()
+                            row.click()
+                        pending.append((handle, row_data, case_id))
+                        break
+                    except Exception as e:
+                        logger.error(f"[{thread_name}] Satır {i + 1} tıklanırken bir hata oluştu: {e}")
+                        continue
+
+            # 2. Aşama: tıklanan sekmelerden karar metinlerini topla
+            for handle, row_data, case_id in pending:
+                try:
+                    driver.switch_to.window(handle)
+                    karar_metni = get_decision_text(driver, None, previous_texts[handle])
+                    previous_texts[handle] = panel_baseline(driver, karar_metni)
+                    results.append(ResultItem(**row_data, karar_metni=karar_metni, keyword=keyword))
+                    processed_cases.add(case_id)
+                    found_count += 1
+                    if budget is not None:
+                        budget.record(keyword, row_data["esas_no"])
+                    logger.success(f"[{thread_name}] Karar {case_id} başarıyla işlendi. Toplam bulunan: {found_count}/{settings.TARGET_RESULTS_PER_KEYWORD}")
+                except Exception as e:
+                    logger.error(f"[{thread_name}] Karar {case_id} okunurken bir hata oluştu: {e}")
+
+        logger.info(f"[{thread_name}] Sayfa işleme tamamlandı.")
+        return found_count
+
+    except Exception as e:
+        logger.error(f"[{thread_name}] Sayfa işlenirken genel bir hata oluştu: {e}")
+        return found_count
+
+
+def chrome_options_for(tabs: int = 1):
+    """Tarayıcı seçeneklerini ve ağ filtresi profilini hazırlar."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--window-size=1920,1080")
+    if tabs > 1:
+        # Arka plandaki sekmelerin zamanlayıcıları ve render'ı yavaşlatılmasın
+        chrome_options.add_argument("--disable-background-timer-throttling")
+        chrome_options.add_argument("--disable-renderer-backgrounding")
+        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    profile = network_profile.configure_options(chrome_options)
+    return chrome_options, profile
+
+
+def start_local_chrome(chrome_options):
+    """Sistem paketindeki Chromium + chromedriver ile tarayıcı başlatır."""
+    from selenium.webdriver.chrome.service import Service
+
+    # Chromium binary path
+    chrome_options.binary_location = "/usr/bin/chromium"
+
+    # ChromeDriver service (sistem paketinden)
+    service = Service("/usr/bin/chromedriver")
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+def start_grid_session(chrome_options, thread_name: str, session_key: str):
+    """
+    Grid'de boş slot varsa oturum açar; Grid doluysa veya oturum açılamazsa
+    GRID_LOCAL_FALLBACK ile yerel Chromium başlatılır. Kapasite bilinmiyorsa Grid denenir.
+    """
+    reserved = grid_client.reserve()
+    if reserved is False and settings.GRID_LOCAL_FALLBACK:
+        grid_client.note_local_fallback()
+        logger.info(f"[{thread_name}] Selenium Grid dolu, yerel Chromium başlatılıyor")
+        return start_local_chrome(chrome_options)
+
+    started = time.monotonic()
     try:
-        logger.info(f"[{thread_name}] ARAMA BAŞLATILIYOR: '{keyword}'")
-
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
+        driver = webdriver.Remote(command_executor=settings.SELENIUM_GRID_URL, options=chrome_options)
+    except Exception as e:
+        if reserved:
+            grid_client.cancel_reservation()
+        if not settings.GRID_LOCAL_FALLBACK:
+            raise
+        grid_client.note_local_fallback()
+        logger.warning(f"[{thread_name}] Grid oturumu açılamadı, yerel Chromium başlatılıyor: {e}")
+        return start_local_chrome(chrome_options)
+    grid_client.adopt(driver, session_key, started, bool(reserved))
+    logger.info(f"[{thread_name}] Selenium Grid oturumu açıldı ({time.monotonic() - started:.2f} sn)")
+    return driver
+
+
+def create_driver(thread_name: str, tabs: int = 1):
+    """
+    Yapılandırmaya göre yerel Chromium veya Selenium Grid WebDriver'ı başlatır.
+    Grid modunda önce önceki işlerden kalan boş oturum kullanılır.
+    """
+    if not settings.USE_LOCAL_CHROME:
+        session_key = f"tabs-{tabs}"
+        grid_client.prune()
+        driver = grid_client.acquire(session_key)
+        if driver is not None:
+            logger.info(f"[{thread_name}] Boştaki Selenium Grid oturumu yeniden kullanılıyor")
+            browser_supervisor.register(driver, thread_name)
+            return driver
+        chrome_options, profile = chrome_options_for(tabs)
+        driver = start_grid_session(chrome_options, thread_name, session_key)
+    else:
+        chrome_options, profile = chrome_options_for(tabs)
         # Google Cloud için yerel Chromium kullan
-        if settings.USE_LOCAL_CHROME:
-            try:
-                from selenium.webdriver.chrome.service import Service
-                
-                # Chromium binary path
-                chrome_options.binary_location = "/usr/bin/chromium"
-                
-                # ChromeDriver service (sistem paketinden)
-                service = Service("/usr/bin/chromedriver")
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-                logger.info(f"[{thread_name}] Yerel Chromium WebDriver başlatıldı")
-            except Exception as e:
-                logger.warning(f"[{thread_name}] Yerel Chromium başlatılamadı, Remote Grid deneniyor: {e}")
-                # Fallback to remote grid
-                driver = webdriver.Remote(
-                    command_executor=settings.SELENIUM_GRID_URL,
-                    options=chrome_options
-                )
-        else:
+        try:
+            driver = start_local_chrome(chrome_options)
+            logger.info(f"[{thread_name}] Yerel Chromium WebDriver başlatıldı")
+        except Exception as e:
+            logger.warning(f"[{thread_name}] Yerel Chromium başlatılamadı, Remote Grid deneniyor: {e}")
+            # Fallback to remote grid
             driver = webdriver.Remote(
                 command_executor=settings.SELENIUM_GRID_URL,
                 options=chrome_options
             )
-        wait = WebDriverWait(driver, 20)
-
-        results = []
-        found_count = 0
-        processed_cases = set()
-
-        initial_page_load(driver, "https://karararama.yargitay.gov.tr")
-        
-        search_box = wait.until(EC.element_to_be_clickable((By.ID, "aranan")))
-        search_box.clear()
-        search_box.send_keys(keyword)
-        
-        # Ekran görüntüsündeki arama butonu "Ara" yazıyor, ID'si "aramaG" olmayabilir.
-        # "Ara" metnini içeren bir butonu bulmak daha sağlam olabilir.
-        # XPath //button[normalize-space()='Ara']
-        search_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Ara']")))
-        search_button.click()
-        
+
+    # Panel beklemesi execute_async_script ile yapıldığı için script timeout'u ondan uzun olmalı
+    driver.set_script_timeout(settings.PANEL_WAIT_TIMEOUT + 5)
+    network_profile.attach(driver, profile)
+    browser_supervisor.register(driver, thread_name)
+    return driver
+
+
+def close_driver(driver, thread_name: str, reuse: bool = True):
+    """
+    WebDriver'ı kapatır; watchdog tarafından öldürülmüş tarayıcılarda hata yutulur.
+    reuse True ise sağlıklı Grid oturumları kapatılmak yerine sonraki işler için boşta tutulur.
+    """
+    browser_supervisor.unregister(driver)
+    if reuse and grid_client.owns(driver) and grid_client.release(driver):
+        logger.info(f"[{thread_name}] Selenium Grid oturumu sonraki iş için boşta tutuluyor.")
+        return
+    try:
+        with phase(PHASE_DRIVER_QUIT):
+            driver.quit()
+        logger.info(f"[{thread_name}] WebDriver kapatıldı.")
+    except Exception as e:
+        logger.warning(f"[{thread_name}] WebDriver kapatılırken hata: {e}")
+
+
+def submit_search(driver, wait, keyword: str, thread_name: str) -> bool:
+    """Arama sayfasını açar, anahtar kelimeyi arar. Sonuç tablosu geldiyse True döner."""
+    initial_page_load(driver, settings.YARGITAY_BASE_URL)
+
+    search_box = wait.until(EC.element_to_be_clickable((By.ID, "aranan")))
+    search_box.clear()
+    search_box.send_keys(keyword)
+
+    # Ekran görüntüsündeki arama butonu "Ara" yazıyor, ID'si "aramaG" olmayabilir.
+    # "Ara" metnini içeren bir butonu bulmak daha sağlam olabilir.
+    # XPath //button[normalize-space()='Ara']
+    search_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Ara']")))
+    site_controller.acquire_site_request()
+    started = time.monotonic()
+    search_button.click()
+
+    try:
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#detayAramaSonuclar tbody tr")))
+        elapsed = time.monotonic() - started
+        site_controller.observe("page", elapsed)
+        observe_phase(PHASE_SEARCH_SUBMIT, elapsed)
+        network_profile.measure(driver, "search", elapsed)
+        logger.info(f"[{thread_name}] Arama sonuçları başarıyla yüklendi.")
+        return True
+    except TimeoutException:
+        # Sonuçsuz aramalar da zaman aşımıyla biter; site yavaşlığı sinyali olarak sayılmaz
+        observe_phase(PHASE_SEARCH_SUBMIT, time.monotonic() - started)
+        return False
+
+
+def go_to_next_page(driver, wait, thread_name: str, page_number: int) -> str:
+    """
+    Sonraki sonuç sayfasına geçer. PAGE_ADVANCED, "sonraki" butonu yoksa veya devre dışıysa
+    PAGE_LAST, geçiş geçici bir hatayla başarısız olursa PAGE_FAILED döner.
+    """
+    try:
+        # Sonraki sayfa butonunu bul
+        next_button = driver.find_element(By.CSS_SELECTOR, "a.paginate_button.next")
+
+        # Buton tıklanabilir değilse (disabled ise), son sayfadayız demektir.
+        if "disabled" in next_button.get_attribute("class"):
+            logger.info(f"[{thread_name}] Son sayfaya ulaşıldı. Başka sayfa yok.")
+            return PAGE_LAST
+
+        logger.info(f"[{thread_name}] Sayfa {page_number + 1}'e geçiliyor...")
+        previous_rows = driver.find_elements(By.CSS_SELECTOR, "#detayAramaSonuclar tbody tr")
+        site_controller.acquire_site_request()
+        started = time.monotonic()
+        driver.execute_script("arguments[0].click();", next_button)
+        # Yeni sayfanın tablosunun yüklenmesini bekle; önceki sayfanın satırları yerinde kalmışsa
+        # (tablo XHR ile yenileniyorsa) eski satırlar DOM'dan kalkana kadar beklenir
+        loaded = wait_for_page_load(driver, wait, (By.ID, "detayAramaSonuclar"))
+        if loaded and previous_rows:
+            try:
+                wait.until(EC.staleness_of(previous_rows[0]))
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#detayAramaSonuclar tbody tr")))
+            except TimeoutException:
+                loaded = False
+        elapsed = time.monotonic() - started
+        site_controller.observe("page", elapsed, ok=loaded)
+        observe_phase(PHASE_PAGINATION, elapsed, ok=loaded)
+        network_profile.measure(driver, "page", elapsed)
+        browser_supervisor.record_page(driver)
+        return PAGE_ADVANCED
+
+    except NoSuchElementException:
+        logger.info(f"[{thread_name}] 'Sonraki sayfa' butonu bulunamadı. Muhtemelen tek sayfa sonuç var.")
+        return PAGE_LAST
+    except Exception as e:
+        logger.error(f"[{thread_name}] Sonraki sayfaya geçerken bir hata oluştu: {e}")
+        site_controller.observe("page", 0.0, ok=False)
+        observe_phase(PHASE_PAGINATION, 0.0, ok=False)
+        return PAGE_FAILED
+
+
+def open_search_tabs(driver, wait, keyword: str, thread_name: str, tabs: int) -> list:
+    """
+    İlk sekmeye ek olarak aynı aramayı yapan sekmeler açar.
+    Aramayı tamamlayamayan sekmeler kapatılır; kullanılabilir sekme handle'ları döner.
+    """
+    handles = [driver.current_window_handle]
+    for _ in range(tabs - 1):
         try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#detayAramaSonuclar tbody tr")))
-            logger.info(f"[{thread_name}] Arama sonuçları başarıyla yüklendi.")
-        except TimeoutException:
-            logger.warning(f"[{thread_name}] '{keyword}' için herhangi bir sonuç bulunamadı.")
-            return (keyword, [], True, "Sonuç bulunamadı")
-
-        page_number = 1
-        while found_count < settings.TARGET_RESULTS_PER_KEYWORD and page_number <= settings.MAX_PAGES_TO_SEARCH:
+            driver.switch_to.new_window("tab")
+            if submit_search(driver, wait, keyword, thread_name):
+                handles.append(driver.current_window_handle)
+            else:
+                driver.close()
+        except Exception as e:
+            logger.warning(f"[{thread_name}] Ek sekme açılamadı: {e}")
+    driver.switch_to.window(handles[0])
+    logger.info(f"[{thread_name}] {len(handles)} sekme ile paralel karar okuma etkin.")
+    return handles
+
+
+def advance_tabs(driver, wait, thread_name: str, tab_handles, target_page: int) -> str:
+    """Tüm sekmeleri ilk sonuç sayfasından target_page'e getirir; go_to_next_page durumlarını döner."""
+    for handle in tab_handles or [driver.current_window_handle]:
+        driver.switch_to.window(handle)
+        for page in range(1, target_page):
+            state = go_to_next_page(driver, wait, thread_name, page)
+            if state != PAGE_ADVANCED:
+                return state
+    if tab_handles:
+        driver.switch_to.window(tab_handles[0])
+    return PAGE_ADVANCED
+
+
+def next_page_all_tabs(driver, wait, thread_name: str, tab_handles, page_number: int) -> str:
+    """
+    Tüm sekmeleri bir sonraki sayfaya geçirir. Herhangi bir sekmede geçiş başarısızsa
+    PAGE_FAILED, aksi halde bir sekme son sayfadaysa PAGE_LAST döner.
+    """
+    states = set()
+    for handle in tab_handles:
+        driver.switch_to.window(handle)
+        states.add(go_to_next_page(driver, wait, thread_name, page_number))
+    if PAGE_FAILED in states:
+        return PAGE_FAILED
+    return PAGE_LAST if PAGE_LAST in states else PAGE_ADVANCED
+
+
+def open_search(keyword: str, thread_name: str, tabs: int, target_page: int = 1):
+    """
+    Yeni tarayıcı açar, aramayı yapar ve sekmeleri target_page'e getirir.
+    (driver, wait, tab_handles, has_results, reached) döner; has_results False ise arama sonuç
+    vermemiştir, reached hedef sayfaya geçişin durumudur (PAGE_ADVANCED, PAGE_LAST, PAGE_FAILED).
+    """
+    with phase(PHASE_DRIVER_START):
+        driver = create_driver(thread_name, tabs)
+    wait = new_wait(driver)
+    if not submit_search(driver, wait, keyword, thread_name):
+        return driver, wait, None, False, PAGE_LAST
+    tab_handles = open_search_tabs(driver, wait, keyword, thread_name, tabs) if tabs > 1 else None
+    reached = advance_tabs(driver, wait, thread_name, tab_handles, target_page)
+    return driver, wait, tab_handles, True, reached
+
+
+def restart_driver(driver, keyword: str, thread_name: str, tabs: int, target_page: int):
+    """
+    Tarayıcıyı kapatıp yenisini açar, aramayı tekrarlar ve tüm sekmeleri target_page'e getirir.
+    (driver, wait, tab_handles, state) döner; state hedef sayfaya geçişin durumudur. Daha önce
+    sonuç veren arama bu kez sonuçsuz dönerse geçici hata sayılır (PAGE_FAILED).
+    """
+    close_driver(driver, thread_name, reuse=False)
+    browser_supervisor.note_recycled()
+    driver, wait, tab_handles, has_results, reached = open_search(keyword, thread_name, tabs, target_page)
+    return driver, wait, tab_handles, reached if has_results else PAGE_FAILED
+
+
+def driver_alive(driver) -> bool:
+    """Tarayıcı oturumu hâlâ komut kabul ediyor mu? (çöken veya watchdog'un öldürdüğü tarayıcıda False)"""
+    try:
+        driver.current_window_handle
+        return True
+    except WebDriverException:
+        return False
+
+
+def save_progress(checkpoint, page_number: int, processed_cases: set, results: list):
+    """Taramanın ilerlemesini kaydeder; yeni tarayıcı veya sonraki istek buradan devam eder."""
+    checkpoint.page_number = page_number
+    checkpoint.processed_cases = sorted(processed_cases)
+    checkpoint.results = [result.model_dump() for result in results]
+    checkpoint_store.save(checkpoint)
+
+
+def search_single_keyword(
+    keyword: str,
+    thread_id: int,
+    tabs: int | None = None,
+    budget=None,
+    cancel_token=None,
+    timings=None,
+    continue_paging: bool = False
+) -> tuple:
+    """
+    Tek bir anahtar kelime için Yargıtay sitesinde arama yapar ve sonuçları toplar.
+    tabs > 1 ise aynı tarayıcıda birden çok sekme açılarak karar metinleri eşzamanlı okunur
+    (varsayılan: DECISION_TABS_PER_DRIVER).
+    budget (ResultBudget) verilirse istek genelindeki max_results bütçesi dolunca arama
+    bir sonraki satırda durur; bütçe kuyrukta beklerken dolduysa tarayıcı hiç açılmaz.
+    cancel_token (CancelToken) iptal edilirse arama satır/sayfa arasında durur ve o ana
+    kadar toplanan kısmi sonuçlar döner.
+    timings (PhaseTimings) verilirse aşama süreleri Prometheus'a ek olarak buraya da toplanır.
+    Her sayfadan sonra ilerleme kaydedilir: çöken tarayıcının yerine açılan tarayıcı aynı
+    sayfadan, yarım kalmış bir tarama ise sonraki çağrıda kaldığı yerden devam eder.
+    continue_paging True ise önceki tamamlanmış taramanın imlecinden devam edilir ve
+    yalnızca yeni kararlar döner.
+    """
+    driver = None
+    started = time.monotonic()
+    timings_token = bind_timings(timings)
+    thread_name = f"Thread-{thread_id}-{keyword}"
+    threading.current_thread().name = thread_name
+    tabs = max(1, tabs or settings.DECISION_TABS_PER_DRIVER)
+    found_count = 0
+
+    try:
+        if cancel_token is not None and cancel_token.cancelled:
+            logger.info(f"[{thread_name}] Arama başlamadan iptal edildi ({cancel_token.reason}).")
+            return (keyword, [], True, f"İptal edildi: {cancel_token.reason}")
+        if not wants_more(0, keyword, budget):
+            logger.info(f"[{thread_name}] İstek sonuç bütçesi doldu, '{keyword}' için tarayıcı açılmadı.")
+            return (keyword, [], True, "Sonuç bütçesi doldu")
+
+        checkpoint = checkpoint_store.start(keyword, continue_paging)
+        if checkpoint is None:
+            logger.info(f"[{thread_name}] '{keyword}' için devam edilecek başka sonuç sayfası yok.")
+            return (keyword, [], True, "Devam edilecek başka sonuç sayfası yok")
+
+        results = [ResultItem(**result) for result in checkpoint.results]
+        processed_cases = set(checkpoint.processed_cases)
+        found_count = len(results)
+        if budget is not None:
+            for result in results:
+                budget.record(keyword, result.esas_no)
+        start_page = page_number = checkpoint.page_number
+        if start_page > 1 or processed_cases:
+            logger.info(
+                f"[{thread_name}] ARAMA KALDIĞI YERDEN SÜRÜYOR: '{keyword}' sayfa {start_page}, "
+                f"{len(processed_cases)} işlenmiş karar, {found_count} kayıtlı sonuç"
+            )
+        else:
+            logger.info(f"[{thread_name}] ARAMA BAŞLATILIYOR: '{keyword}'")
+
+        driver, wait, tab_handles, has_results, reached = open_search(keyword, thread_name, tabs, start_page)
+        if has_results and reached == PAGE_FAILED:
+            # Kayıtlı sayfaya geçilemedi; kayıt açık kalır, sonraki tarama aynı sayfadan yeniden dener
+            save_progress(checkpoint, page_number, processed_cases, results)
+            return (keyword, results, True, f"{found_count} sonuç bulundu ({page_number}. sayfaya geçilemedi).")
+        if not has_results or reached == PAGE_LAST:
+            checkpoint.status, checkpoint.exhausted = STATUS_COMPLETE, True
+            save_progress(checkpoint, page_number, processed_cases, [])
+            if not has_results and not results:
+                logger.warning(f"[{thread_name}] '{keyword}' için herhangi bir sonuç bulunamadı.")
+                return (keyword, [], True, "Sonuç bulunamadı")
+            return (keyword, results, True, f"{found_count} sonuç bulundu (başka sonuç sayfası yok).")
+
+        restarts = 0
+        exhausted = stalled = False
+        while page_number < start_page + settings.MAX_PAGES_TO_SEARCH and wants_more(found_count, keyword, budget, cancel_token):
             logger.info(f"[{thread_name}] Sayfa {page_number} işleniyor... (Bulunan: {found_count}/{settings.TARGET_RESULTS_PER_KEYWORD})")
 
-            found_count = process_page_rows(driver, wait, thread_name, found_count, processed_cases, results, keyword)
+            if tab_handles and len(tab_handles) > 1:
+                found_count = process_page_rows_multi_tab(driver, tab_handles, thread_name, found_count, processed_cases, results, keyword, budget, cancel_token)
+            else:
+                found_count = process_page_rows(driver, wait, thread_name, found_count, processed_cases, results, keyword, budget, cancel_token)
+            save_progress(checkpoint, page_number, processed_cases, results)
+
+            if not driver_alive(driver):
+                # Tarayıcı sayfa ortasında çöktü: yenisi aynı sayfayı açar, işlenmiş satırlar atlanır
+                restarts += 1
+                if restarts > settings.CHECKPOINT_MAX_DRIVER_RESTARTS:
+                    raise WebDriverException(f"Tarayıcı {restarts} kez çöktü, tarama {page_number}. sayfada bırakıldı")
+                logger.warning(f"[{thread_name}] Tarayıcı yanıt vermiyor, {page_number}. sayfadan yeni tarayıcıyla devam ediliyor.")
+                driver, wait, tab_handles, advanced = restart_driver(driver, keyword, thread_name, tabs, page_number)
+                if advanced != PAGE_ADVANCED:
+                    stalled = True
+                    break
+                continue
 
-            if found_count >= settings.TARGET_RESULTS_PER_KEYWORD:
+            if not wants_more(found_count, keyword, budget, cancel_token):
                 logger.success(f"[{thread_name}] Hedeflenen sonuç sayısına ({found_count}) ulaşıldı. Arama tamamlandı.")
                 break
 
-            try:
-                # Sonraki sayfa butonunu bul
-                next_button = driver.find_element(By.CSS_SELECTOR, "a.paginate_button.next")
-                
-                # Buton tıklanabilir değilse (disabled ise), son sayfadayız demektir.
-                if "disabled" in next_button.get_attribute("class"):
-                    logger.info(f"[{thread_name}] Son sayfaya ulaşıldı. Başka sayfa yok.")
-                    break
-                
-                logger.info(f"[{thread_name}] Sayfa {page_number + 1}'e geçiliyor...")
-                driver.execute_script("arguments[0].click();", next_button)
-                # Yeni sayfanın tablosunun yüklenmesini bekle
-                wait_for_page_load(driver, wait, (By.ID, "detayAramaSonuclar"))
-                page_number += 1
-
-            except NoSuchElementException:
-                logger.info(f"[{thread_name}] 'Sonraki sayfa' butonu bulunamadı. Muhtemelen tek sayfa sonuç var.")
-                break
-            except Exception as e:
-                logger.error(f"[{thread_name}] Sonraki sayfaya geçerken bir hata oluştu: {e}")
+            recycle_reason = browser_supervisor.recycle_reason(driver)
+            if recycle_reason:
+                # Bellek büyüyen veya çok sayfa açan tarayıcı, sonraki sayfadan devam edecek şekilde yenilenir
+                logger.info(f"[{thread_name}] Tarayıcı yeniden başlatılıyor: {recycle_reason}")
+                driver, wait, tab_handles, advanced = restart_driver(driver, keyword, thread_name, tabs, page_number + 1)
+            elif tab_handles and len(tab_handles) > 1:
+                advanced = next_page_all_tabs(driver, wait, thread_name, tab_handles, page_number)
+            else:
+                advanced = go_to_next_page(driver, wait, thread_name, page_number)
+            if advanced != PAGE_ADVANCED:
+                if not driver_alive(driver):
+                    # Sayfa geçişinde çöktü; sonraki çağrı kayıttan devam eder
+                    raise WebDriverException(f"Tarayıcı {page_number + 1}. sayfaya geçerken çöktü")
+                # Yalnızca "sonraki" butonu yoksa/devre dışıysa tarama tükenmiştir
+                exhausted = advanced == PAGE_LAST
+                stalled = not exhausted
                 break
+            page_number += 1
+
+        interrupted = stalled or (cancel_token is not None and cancel_token.cancelled) or (
+            budget is not None and budget.was_truncated(keyword)
+        )
+        if interrupted:
+            # Yarım kalan tarama sonuçlarıyla birlikte saklanır; sonraki tarama buradan sürer
+            save_progress(checkpoint, page_number, processed_cases, results)
+        else:
+            checkpoint.status, checkpoint.exhausted = STATUS_COMPLETE, exhausted
+            save_progress(checkpoint, page_number, processed_cases, [])
 
+        if cancel_token is not None and cancel_token.cancelled:
+            logger.warning(f"[{thread_name}] Arama iptal edildi ({cancel_token.reason}). Kısmi sonuç: {found_count}")
+            return (keyword, results, True, f"İptal edildi: {cancel_token.reason} ({found_count} kısmi sonuç)")
         logger.success(f"[{thread_name}] Arama tamamlandı! Toplam {found_count} sonuç bulundu.")
         return (keyword, results, True, f"{found_count} sonuç bulundu.")
 
@@ -242,6 +782,10 @@ def search_single_keyword(keyword: str, thread_id: int) -> tuple:
         return (keyword, [], False, str(e))
 
     finally:
+        if budget is not None:
+            # Kullanılmayan kota, hâlâ çalışan diğer kelimelere devredilir
+            budget.finish(keyword)
         if driver:
-            driver.quit()
-            logger.info(f"[{thread_name}] WebDriver kapatıldı.")
\ No newline at end of file
+            close_driver(driver, thread_name)
+        observe_phase(PHASE_KEYWORD_TOTAL, time.monotonic() - started)
+        unbind_timings(timings_token)
@@ -0,0 +1,358 @@
+"""
+Yerel Tam Metin Arama İndeksi
+Korpustaki karar metinleri üzerinde diskte duran kompakt bir ters indeks (inverted index).
+Posting listeleri tek bir ikili dosyada tutulur ve memory-map ile okunur; sıralama BM25'tir.
+Türkçe için büyük/küçük harf dönüşümü, durak kelime ayıklama ve ilk-5-harf kökleme
+(F5 stemming) uygulanır. Yeni kararlar önce bellekteki bekleyen kümeye eklenir ve
+flush() ile disk segmentine birleştirilir.
+
+Disk düzeni (TEXT_INDEX_DIR):
+    lexicon.json    terim -> [posting başlangıcı, belge frekansı]
+    postings.bin    (doc: uint32, tf: uint16) kayıtları, terim sırasıyla
+    doclens.npy     belge uzunlukları (token)
+    docoffsets.npy  docs.jsonl içindeki bayt ofsetleri
+    docs.jsonl      belge meta verisi ve metni
+    meta.json       belge sayısı, ortalama uzunluk, decision_id listesi
+"""
+import json
+import mmap
+import re
+import shutil
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from loguru import logger
+
+POSTING_DTYPE = np.dtype([("doc", "<u4"), ("tf", "<u2")])
+STEM_LENGTH = 5
+
+_TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_TOKEN = re.compile(r"[0-9a-zçğıöşüâîû]+")
+STOPWORDS = {
+    "ve", "veya", "ile", "bir", "bu", "şu", "o", "da", "de", "ki", "mi", "mı", "mu", "mü",
+    "için", "gibi", "daha", "çok", "ancak", "ise", "olarak", "olan", "olup", "ne", "her",
+    "ya", "hem", "göre", "kadar", "sonra", "önce", "üzere", "dair", "ait", "tarafından",
+}
+
+# Metni saklanan belge alanları
+DOCUMENT_FIELDS = ("decision_id", "court", "esas_no", "karar_no", "karar_tarihi", "content", "keywords", "source_url")
+
+
+def tokenize(text: str) -> List[str]:
+    """Metni Türkçe kurallarıyla küçültür, durak kelimeleri atar ve ilk 5 harfe köklendirir."""
+    lowered = (text or "").translate(_TURKISH_LOWER).lower()
+    return [
+        token[:STEM_LENGTH]
+        for token in _TOKEN.findall(lowered)
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _document_record(document: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: document.get(field) for field in DOCUMENT_FIELDS}
+
+
+class _Segment:
+    """Diskteki salt okunur indeks segmenti"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(path / "lexicon.json", encoding="utf-8") as f:
+            self.lexicon: Dict[str, List[int]] = json.load(f)
+        self.doc_count: int = meta["doc_count"]
+        self.total_length: int = meta["total_length"]
+        self.decision_ids: List[str] = meta["decision_ids"]
+        self.built_at: float = meta.get("built_at", 0)
+
+        postings_path = path / "postings.bin"
+        if postings_path.stat().st_size:
+            self.postings = np.memmap(postings_path, dtype=POSTING_DTYPE, mode="r")
+        else:
+            self.postings = np.zeros(0, dtype=POSTING_DTYPE)
+        self.doc_lengths = np.load(path / "doclens.npy", mmap_mode="r")
+        self.doc_offsets = np.load(path / "docoffsets.npy", mmap_mode="r")
+        self._docs_file = open(path / "docs.jsonl", "rb")
+        self._docs = (
+            mmap.mmap(self._docs_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.doc_count else None
+        )
+
+    def postings_for(self, term: str) -> np.ndarray:
+        entry = self.lexicon.get(term)
+        if not entry:
+            return self.postings[:0]
+        start, df = entry
+        return self.postings[start:start + df]
+
+    def document(self, doc: int) -> Dict[str, Any]:
+        start, end = int(self.doc_offsets[doc]), int(self.doc_offsets[doc + 1])
+        return json.loads(self._docs[start:end])
+
+    def documents(self) -> Iterable[Dict[str, Any]]:
+        for doc in range(self.doc_count):
+            yield self.document(doc)
+
+    def close(self):
+        if self._docs is not None:
+            self._docs.close()
+        self._docs_file.close()
+        self.postings = None
+
+
+def build_segment(documents: Iterable[Dict[str, Any]], path: Path) -> int:
+    """Belgelerden yeni bir segment yazar; önce geçici dizine yazıp atomik olarak yer değiştirir."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    postings: Dict[str, List[tuple]] = defaultdict(list)
+    lengths: List[int] = []
+    offsets: List[int] = [0]
+    decision_ids: List[str] = []
+    with open(tmp_path / "docs.jsonl", "wb") as docs_file:
+        for document in documents:
+            doc = len(decision_ids)
+            tokens = tokenize(document.get("content", ""))
+            for term, tf in Counter(tokens).items():
+                postings[term].append((doc, min(tf, 65535)))
+            lengths.append(len(tokens))
+            decision_ids.append(document["decision_id"])
+            line = json.dumps(_document_record(document), ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+            docs_file.write(line)
+            offsets.append(offsets[-1] + len(line))
+
+    lexicon = {}
+    position = 0
+    with open(tmp_path / "postings.bin", "wb") as postings_file:
+        for term in sorted(postings):
+            entries = np.array(postings[term], dtype=POSTING_DTYPE)
+            entries.tofile(postings_file)
+            lexicon[term] = [position, len(entries)]
+            position += len(entries)
+
+    np.save(tmp_path / "doclens.npy", np.array(lengths, dtype=np.uint32))
+    np.save(tmp_path / "docoffsets.npy", np.array(offsets, dtype=np.uint64))
+    with open(tmp_path / "lexicon.json", "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, ensure_ascii=False)
+    with open(tmp_path / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "doc_count": len(decision_ids),
+            "total_length": int(sum(lengths)),
+            "decision_ids": decision_ids,
+            "built_at": time.time(),
+        }, f)
+
+    old_path = path.with_name(path.name + ".old")
+    shutil.rmtree(old_path, ignore_errors=True)
+    if path.exists():
+        path.rename(old_path)
+    tmp_path.rename(path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return len(decision_ids)
+
+
+class TextIndex:
+    """BM25 sıralamalı, disk segmenti + bellek içi bekleyen kümeden oluşan ters indeks"""
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        # _lock yalnızca kısa okuma/değiştirmeleri korur; segment yazımı _build_lock altında kilitsiz yapılır
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._segment: Optional[_Segment] = None
+        self._segment_ids: Dict[str, int] = {}
+        # decision_id -> (belge, terim sayıları, uzunluk)
+        self._pending: Dict[str, tuple] = {}
+        self._stats = {"queries": 0, "flushes": 0}
+        self._segment, self._segment_ids = self._load_segment()
+
+    def _load_segment(self) -> tuple:
+        """Diskteki segmenti açar; (segment, decision_id -> belge no) döner."""
+        if (self.path / "meta.json").exists():
+            try:
+                segment = _Segment(self.path)
+                logger.info(f"Yerel metin indeksi yüklendi: {segment.doc_count} karar")
+                return segment, {d: i for i, d in enumerate(segment.decision_ids)}
+            except Exception as e:
+                logger.error(f"Yerel metin indeksi açılamadı: {e}")
+        return None, {}
+
+    def _swap_segment(self) -> Optional[_Segment]:
+        """Yeni yazılan segmenti açar ve kilit altında devreye alır; eski segmenti döndürür."""
+        segment, segment_ids = self._load_segment()
+        with self._lock:
+            old_segment = self._segment
+            self._segment, self._segment_ids = segment, segment_ids
+        return old_segment
+
+    def __len__(self) -> int:
+        with self._lock:
+            overridden = sum(1 for d in self._pending if d in self._segment_ids)
+            segment_count = self._segment.doc_count if self._segment else 0
+            return segment_count - overridden + len(self._pending)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def add_documents(self, documents: Iterable[Dict[str, Any]]):
+        """Belgeleri bekleyen kümeye ekler; aynı decision_id'li eski kayıt aramada gizlenir."""
+        entries = {}
+        for document in documents:
+            if not document.get("decision_id") or not document.get("content"):
+                continue
+            tokens = tokenize(document["content"])
+            entries[document["decision_id"]] = (_document_record(document), Counter(tokens), len(tokens))
+        with self._lock:
+            self._pending.update(entries)
+
+    def search(self, query: str, top_k: int = 10, require_all: bool = False) -> List[Dict[str, Any]]:
+        """
+        Sorgu için BM25 puanına göre en iyi top_k belgeyi döndürür.
+        require_all=True ise yalnızca tüm sorgu terimlerini içeren belgeler döner.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            self._stats["queries"] += 1
+            segment = self._segment
+            pending = self._pending
+            seg_count = segment.doc_count if segment else 0
+            doc_count = len(self)
+            if doc_count == 0:
+                return []
+            total_length = (segment.total_length if segment else 0) + sum(p[2] for p in pending.values())
+            avg_length = max(total_length / doc_count, 1.0)
+
+            seg_scores = np.zeros(seg_count, dtype=np.float32)
+            seg_matches = np.zeros(seg_count, dtype=np.uint16)
+            pending_scores: Dict[str, float] = defaultdict(float)
+            pending_matches: Dict[str, int] = defaultdict(int)
+
+            for term in terms:
+                seg_postings = segment.postings_for(term) if segment else None
+                pending_hits = [(d, p[1][term], p[2]) for d, p in pending.items() if term in p[1]]
+                df = (len(seg_postings) if seg_postings is not None else 0) + len(pending_hits)
+                if df == 0:
+                    continue
+                idf = np.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+                if seg_postings is not None and len(seg_postings):
+                    docs = seg_postings["doc"].astype(np.int64)
+                    tf = seg_postings["tf"].astype(np.float32)
+                    lengths = segment.doc_lengths[docs].astype(np.float32)
+                    seg_scores[docs] += idf * tf * (self.k1 + 1) / (
+                        tf + self.k1 * (1 - self.b + self.b * lengths / avg_length)
+                    )
+                    seg_matches[docs] += 1
+
+                for decision_id, tf, length in pending_hits:
+                    pending_scores[decision_id] += float(idf * tf * (self.k1 + 1) / (
+                        tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    ))
+                    pending_matches[decision_id] += 1
+
+            # Bekleyen kümede yenisi olan segment belgelerini gizle
+            for decision_id in pending:
+                doc = self._segment_ids.get(decision_id)
+                if doc is not None:
+                    seg_scores[doc] = 0
+                    seg_matches[doc] = 0
+
+            min_matches = len(terms) if require_all else 1
+            candidates = np.nonzero(seg_matches >= min_matches)[0]
+            if len(candidates) > top_k:
+                best = np.argpartition(-seg_scores[candidates], top_k)[:top_k]
+                candidates = candidates[best]
+            ranked = [(float(seg_scores[doc]), "segment", int(doc)) for doc in candidates]
+            ranked += [
+                (score, "pending", decision_id)
+                for decision_id, score in pending_scores.items()
+                if pending_matches[decision_id] >= min_matches
+            ]
+            ranked.sort(key=lambda item: -item[0])
+
+            results = []
+            for score, source, ref in ranked[:top_k]:
+                document = segment.document(ref) if source == "segment" else dict(pending[ref][0])
+                document["score"] = round(score, 4)
+                results.append(document)
+            return results
+
+    def flush(self) -> int:
+        """
+        Bekleyen belgeleri disk segmentine birleştirir (segment yeniden yazılır).
+        Yeni segment kilit dışında yazılır; bu sürede aramalar eski segment ve bekleyen
+        küme üzerinden devam eder, yalnızca segment değişimi kilit altında yapılır.
+        """
+        with self._build_lock:
+            with self._lock:
+                pending = dict(self._pending)
+                segment = self._segment
+            if not pending:
+                return 0
+
+            def documents():
+                if segment:
+                    for document in segment.documents():
+                        if document["decision_id"] not in pending:
+                            yield document
+                for document, _, _ in pending.values():
+                    yield document
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            count = build_segment(documents(), self.path)
+            old_segment = self._swap_segment()
+            with self._lock:
+                # Yazım sırasında eklenen veya güncellenen belgeler bekleyen kümede kalır
+                for decision_id, entry in pending.items():
+                    if self._pending.get(decision_id) is entry:
+                        del self._pending[decision_id]
+                self._stats["flushes"] += 1
+            if old_segment:
+                old_segment.close()
+            logger.info(f"Yerel metin indeksi güncellendi: {count} karar")
+            return len(pending)
+
+    def rebuild(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        İndeksi verilen belgelerden sıfırdan oluşturur. Yazım kilit dışında yapılır;
+        bu sırada bekleyen kümeye eklenen belgeler korunur.
+        """
+        with self._build_lock:
+            with self._lock:
+                pending = dict(self._pending)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            count = build_segment(
+                (d for d in documents if d.get("decision_id") and d.get("content")),
+                self.path
+            )
+            old_segment = self._swap_segment()
+            with self._lock:
+                for decision_id, entry in pending.items():
+                    if self._pending.get(decision_id) is entry:
+                        del self._pending[decision_id]
+            if old_segment:
+                old_segment.close()
+            return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "documents": len(self),
+                "pending": len(self._pending),
+                "terms": len(self._segment.lexicon) if self._segment else 0,
+                "path": str(self.path),
+            }
@@ -0,0 +1,164 @@
+"""
+Yargıtay Sitesine Yönelik Uyarlanabilir Yük Kontrolü
+- AIMD eşzamanlılık: sayfa yükleme ve karar paneli gecikmeleri ile hata oranı izlenir.
+  Pencere sağlıklıysa eşzamanlı tarayıcı sınırı 1 artırılır (additive increase), gecikme
+  hedefi aşılırsa veya hata oranı yükselirse sınır çarpanla küçültülür (multiplicative decrease).
+- Hız tavanı: tüm tarayıcıların siteye yaptığı istekler (sayfa açma, arama, sayfa geçişi,
+  satır tıklaması) tek bir token bucket ile saniye başına sınırlanır.
+Scheduler slot sınırını her iş öncesinde controller.limit'ten okur.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+from loguru import logger
+
+from .config import settings
+
+OBSERVATION_KINDS = ("page", "panel")
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() token gelene kadar bekler"""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+                self.waited_seconds += delay
+            time.sleep(delay)
+
+
+class AIMDController:
+    """Gecikme ve hata sinyallerine göre eşzamanlı tarayıcı sınırını ayarlayan denetleyici"""
+
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        initial_limit: int,
+        window: int,
+        decrease_factor: float,
+        page_latency_target: float,
+        panel_latency_target: float,
+        error_rate_threshold: float,
+        rate_per_second: float,
+        burst: int
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.window = max(1, window)
+        self.decrease_factor = decrease_factor
+        self.targets = {"page": page_latency_target, "panel": panel_latency_target}
+        self.error_rate_threshold = error_rate_threshold
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self._lock = threading.Lock()
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self._recent: deque = deque(maxlen=self.window)
+        self._since_adjust = 0
+        self._stats = {"increases": 0, "decreases": 0, "observations": 0, "errors": 0, "site_requests": 0}
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire_site_request(self):
+        """Siteye yeni bir istek yapmadan önce çağrılır (global hız tavanı)."""
+        self.bucket.acquire()
+        with self._lock:
+            self._stats["site_requests"] += 1
+
+    def observe(self, kind: str, latency: float, ok: bool = True):
+        """Sayfa yükleme ('page') veya karar paneli ('panel') ölçümü kaydeder."""
+        with self._lock:
+            self._recent.append((kind, latency, ok))
+            self._stats["observations"] += 1
+            if not ok:
+                self._stats["errors"] += 1
+            self._since_adjust += 1
+            if self._since_adjust >= self.window:
+                self._since_adjust = 0
+                self._adjust_locked()
+
+    def _adjust_locked(self):
+        samples = list(self._recent)
+        error_rate = sum(1 for _, _, ok in samples if not ok) / len(samples)
+        slow = [
+            kind for kind in OBSERVATION_KINDS
+            if percentile([lat for k, lat, ok in samples if k == kind and ok], 0.95) > self.targets[kind]
+        ]
+        previous = self.limit
+        if error_rate > self.error_rate_threshold or slow:
+            self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+            self._stats["decreases"] += 1
+            if self.limit != previous:
+                logger.warning(
+                    f"Site yavaşlıyor (hata oranı {error_rate:.0%}, yavaş: {slow or '-'}), "
+                    f"eşzamanlı tarayıcı sınırı {previous} -> {self.limit}"
+                )
+        else:
+            self._limit = min(self.max_limit, self._limit + 1)
+            self._stats["increases"] += 1
+            if self.limit != previous:
+                logger.info(f"Site sağlıklı, eşzamanlı tarayıcı sınırı {previous} -> {self.limit}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = list(self._recent)
+            stats = {
+                **self._stats,
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "rate_limit_per_second": self.bucket.rate,
+                "rate_limit_waited_seconds": round(self.bucket.waited_seconds, 2),
+            }
+        for kind in OBSERVATION_KINDS:
+            latencies = [lat for k, lat, ok in samples if k == kind and ok]
+            if latencies:
+                stats[f"{kind}_latency"] = {
+                    "p50": round(percentile(latencies, 0.5), 3),
+                    "p95": round(percentile(latencies, 0.95), 3),
+                }
+        if samples:
+            stats["window_error_rate"] = round(sum(1 for _, _, ok in samples if not ok) / len(samples), 3)
+        return stats
+
+
+# Global site yük denetleyicisi
+site_controller = AIMDController(
+    min_limit=settings.ADAPTIVE_MIN_SLOTS,
+    max_limit=settings.MAX_BROWSER_SLOTS,
+    initial_limit=settings.ADAPTIVE_INITIAL_SLOTS,
+    window=settings.ADAPTIVE_WINDOW,
+    decrease_factor=settings.ADAPTIVE_DECREASE_FACTOR,
+    page_latency_target=settings.ADAPTIVE_PAGE_LATENCY_TARGET,
+    panel_latency_target=settings.ADAPTIVE_PANEL_LATENCY_TARGET,
+    error_rate_threshold=settings.ADAPTIVE_ERROR_RATE_THRESHOLD,
+    rate_per_second=settings.SITE_MAX_REQUESTS_PER_SECOND,
+    burst=settings.SITE_REQUEST_BURST
+)
@@ -0,0 +1,187 @@
+"""
+Scraper Worker Süreci
+Broker'daki tarayıcı işlerini alır ve bu düğümün ScraperScheduler'ında (MAX_BROWSER_SLOTS,
+AIMD sınırı, tarayıcı denetçisi dahil) çalıştırır; sonuçları işi gönderen API örneğine yazar.
+Yalnızca boş slot varken kuyruktan iş alınır; böylece bekleyen işler kapasitesi olan
+worker'lara kalır. Düzenli heartbeat ile slot ve aktif iş sayısı yayımlanır.
+
+Kullanım (yargitay-scraper-api dizininden, REDIS_URL ayarlı):
+    python -m app.worker
+"""
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from .budget import ResultBudget
+from .cancellation import CancelToken
+from .checkpoint import checkpoint_store
+from .config import settings
+from .metrics import PhaseTimings
+from .search_logic import search_single_keyword
+
+# Kuyruk üzerinden çalıştırılabilen işler (iş kaydındaki "fn" alanı)
+JOB_FUNCTIONS = {
+    "search_single_keyword": search_single_keyword,
+}
+
+
+class ScraperWorker:
+    """Broker'dan iş alıp yerel zamanlayıcıda çalıştıran worker"""
+
+    def __init__(self, broker, scheduler, worker_id: str | None = None, heartbeat_seconds: float = 5.0):
+        self.broker = broker
+        self.scheduler = scheduler
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.heartbeat_seconds = heartbeat_seconds
+        self._lock = threading.Lock()
+        self._active: Dict[str, CancelToken] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_heartbeat = 0.0
+        self._stats = {"received": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    def start(self) -> "ScraperWorker":
+        """Worker döngüsünü arka plan thread'inde başlatır (API sürecine gömülü çalışma için)."""
+        self._thread = threading.Thread(target=self.run, name=f"scraper-worker-{self.worker_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def run(self):
+        logger.info(f"Scraper worker başlatıldı: {self.worker_id}")
+        while not self._stop.is_set():
+            try:
+                self._heartbeat()
+                self._check_cancellations()
+                if not self._has_capacity():
+                    self._stop.wait(0.2)
+                    continue
+                job = self.broker.dequeue(timeout=min(1.0, self.heartbeat_seconds))
+                if job is not None:
+                    self._dispatch(job)
+            except Exception as e:
+                logger.error(f"Worker döngüsü hatası: {e}")
+                self._stop.wait(1.0)
+        logger.info(f"Scraper worker durduruldu: {self.worker_id}")
+
+    def _has_capacity(self) -> bool:
+        stats = self.scheduler.get_stats()
+        return stats["active"] + stats["queued"] < stats["slot_limit"]
+
+    def _heartbeat(self):
+        now = time.monotonic()
+        if now - self._last_heartbeat < self.heartbeat_seconds:
+            return
+        self._last_heartbeat = now
+        stats = self.scheduler.get_stats()
+        self.broker.heartbeat(self.worker_id, {
+            "max_slots": stats["max_slots"],
+            "slot_limit": stats["slot_limit"],
+            "active": stats["active"],
+            "queued": stats["queued"],
+            **self._stats,
+        }, ttl_seconds=self.heartbeat_seconds * 3)
+
+    def _check_cancellations(self):
+        with self._lock:
+            active = list(self._active.items())
+        for job_id, token in active:
+            if not token.cancelled and self.broker.is_cancelled(job_id):
+                token.cancel("İstek iptal edildi")
+
+    def _dispatch(self, job: Dict[str, Any]):
+        self._stats["received"] += 1
+        started = time.time()
+        fn = JOB_FUNCTIONS.get(job.get("fn"))
+        if fn is None:
+            self._publish(job, (job["keyword"], [], False, f"Bilinmeyen iş türü: {job.get('fn')}"), None, None, started)
+            return
+        if self.broker.is_cancelled(job["id"]):
+            self._stats["cancelled"] += 1
+            self._publish(job, (job["keyword"], [], True, "İptal edildi: İstek iptal edildi"), None, None, started)
+            return
+
+        token = CancelToken()
+        timings = PhaseTimings()
+        budget = None
+        if job.get("max_results") is not None:
+            budget = ResultBudget(job["max_results"], settings.TARGET_RESULTS_PER_KEYWORD)
+            budget.allocate([job["keyword"]])
+        with self._lock:
+            self._active[job["id"]] = token
+        future = self.scheduler.submit(
+            job["request_id"], fn, job["keyword"], job["thread_id"], job.get("tabs"), budget, token, timings,
+            job.get("continue_paging", False),
+            priority=job["priority"]
+        )
+
+        def on_done(done):
+            with self._lock:
+                self._active.pop(job["id"], None)
+            try:
+                value = done.result()
+            except Exception as e:
+                value = (job["keyword"], [], False, str(e))
+            self._publish(job, value, budget, timings, started)
+
+        future.add_done_callback(on_done)
+
+    def _publish(self, job: Dict[str, Any], value: tuple, budget, timings, started: float):
+        keyword, results, success, message = value
+        self._stats["completed" if success else "failed"] += 1
+        try:
+            self.broker.publish_result(job["reply_to"], {
+                "job_id": job["id"],
+                "keyword": keyword,
+                "results": [result.model_dump() for result in results],
+                "success": success,
+                "message": message,
+                "truncated": budget is not None and budget.was_truncated(keyword),
+                "cursor": checkpoint_store.cursor(keyword),
+                "timings": timings.as_dict() if timings is not None else {},
+                "queue_wait": max(0.0, started - job.get("enqueued_at", started)),
+                "worker_id": self.worker_id,
+            })
+        except Exception as e:
+            logger.error(f"İş sonucu yayımlanamadı '{keyword}' ({job['id']}): {e}")
+
+
+def main():
+    from .browser_supervisor import browser_supervisor
+    from .firestore_db import close_firestore, init_firestore
+    from .grid_client import grid_client
+    from .job_queue import InMemoryBroker, job_broker
+    from .scheduler import scraper_scheduler
+
+    if isinstance(job_broker, InMemoryBroker):
+        raise SystemExit("Ayrı worker süreci için REDIS_URL ayarlanmalıdır")
+
+    # Tarama kayıtları (checkpoint) Firestore'da tutulur; bağlantı yoksa yalnızca süreç içinde kalır
+    if not init_firestore():
+        logger.warning("Firestore bağlantısı başarısız - tarama kayıtları yalnızca bellekte tutulacak")
+    scraper_scheduler.start()
+    browser_supervisor.start()
+    worker = ScraperWorker(job_broker, scraper_scheduler, heartbeat_seconds=settings.WORKER_HEARTBEAT_SECONDS)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: worker.stop(wait=False))
+    try:
+        worker.run()
+    finally:
+        scraper_scheduler.shutdown(wait=False)
+        browser_supervisor.shutdown()
+        grid_client.shutdown()
+        close_firestore()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Yerel fixture sunucusu ve scraper karşılaştırma araçları"""
@@ -0,0 +1,244 @@
+"""
+karararama.yargitay.gov.tr için Çevrimdışı Fixture Sunucusu
+Scraper'ın kullandığı arayüzü kayıtlı karar verisinden (fixtures/kararlar.json) üretir:
+- Arama formu: input#aranan ve "Ara" butonu
+- #detayAramaSonuclar tablosu: sonuçlar XHR ile sayfa sayfa yüklenir, a.paginate_button.next
+  son sayfada "disabled" sınıfı alır
+- #kararAlani paneli: satıra tıklanınca karar metni XHR ile yüklenir
+Arama, sayfa geçişi ve panel yanıtları için yapılandırılabilir gecikmeler (jitter ile) uygulanır.
+
+Kullanım:
+    python -m benchmark.fixture_server --port 8765 --page-latency 0.4 --panel-latency 0.25
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FIXTURE = Path(__file__).parent / "fixtures" / "kararlar.json"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="tr">
+<head><meta charset="utf-8"><title>Yargıtay Karar Arama (fixture)</title></head>
+<body>
+<form id="aramaFormu" onsubmit="return false;">
+  <input id="aranan" name="aranan" type="text">
+  <button type="button" onclick="ara()">Ara</button>
+</form>
+<table id="detayAramaSonuclar">
+  <thead><tr><th>#</th><th>Daire</th><th>Esas</th><th>Karar</th><th>Karar Tarihi</th></tr></thead>
+  <tbody></tbody>
+</table>
+<a href="#" class="paginate_button next disabled" onclick="sonraki(); return false;">Sonraki</a>
+<div id="kararAlani"></div>
+<script>
+let aranan = "", sayfa = 1;
+function satir(k, i) {
+  const tr = document.createElement("tr");
+  for (const v of [i, k.daire, k.esas_no, k.karar_no, k.karar_tarihi]) {
+    const td = document.createElement("td"); td.textContent = v; tr.appendChild(td);
+  }
+  tr.onclick = () => fetch("/api/karar/" + k.id).then(r => r.json()).then(d => {
+    document.getElementById("kararAlani").innerText = d.metin;
+  });
+  return tr;
+}
+function yukle(hedef) {
+  return fetch("/api/ara?q=" + encodeURIComponent(aranan) + "&sayfa=" + hedef)
+    .then(r => r.json()).then(d => {
+      const tbody = document.querySelector("#detayAramaSonuclar tbody");
+      tbody.replaceChildren(...d.sonuclar.map((k, i) => satir(k, (hedef - 1) * d.sayfa_boyutu + i + 1)));
+      sayfa = hedef;
+      document.querySelector("a.paginate_button.next").className =
+        "paginate_button next" + (d.sonraki ? "" : " disabled");
+    });
+}
+function ara() { aranan = document.getElementById("aranan").value; yukle(1); }
+function sonraki() {
+  if (!document.querySelector("a.paginate_button.next").classList.contains("disabled")) yukle(sayfa + 1);
+}
+</script>
+</body>
+</html>
+"""
+
+
+def turkish_lower(text: str) -> str:
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+@dataclass
+class Latencies:
+    """Yanıt gecikmeleri (saniye); her yanıta ±jitter oranında rastgele sapma eklenir"""
+    initial: float = 0.2
+    search: float = 0.5
+    page: float = 0.4
+    panel: float = 0.25
+    jitter: float = 0.2
+
+    def sleep(self, kind: str):
+        base = getattr(self, kind)
+        if base > 0:
+            time.sleep(base * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+class FixtureCorpus:
+    """Kayıtlı kararlar üzerinde karararama araması (tüm kelimeleri içeren kararlar)"""
+
+    def __init__(self, decisions: List[Dict[str, Any]], page_size: int = 10):
+        self.page_size = page_size
+        self.decisions = [{**decision, "id": idx} for idx, decision in enumerate(decisions)]
+        self._texts = [turkish_lower(d["metin"]) for d in self.decisions]
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_FIXTURE, repeat: int = 1, page_size: int = 10) -> "FixtureCorpus":
+        """Fixture dosyasını yükler; repeat > 1 ise kararlar yeni esas numaralarıyla çoğaltılır."""
+        records = json.loads(Path(path).read_text(encoding="utf-8"))
+        decisions = []
+        for copy in range(max(1, repeat)):
+            for record in records:
+                if copy:
+                    record = {**record, "esas_no": f"{record['esas_no']}-{copy}", "karar_no": f"{record['karar_no']}-{copy}"}
+                decisions.append(record)
+        return cls(decisions, page_size)
+
+    def search(self, query: str, page: int) -> Dict[str, Any]:
+        terms = turkish_lower(query).split()
+        matches = [d for d, text in zip(self.decisions, self._texts) if terms and all(t in text for t in terms)]
+        start = (max(1, page) - 1) * self.page_size
+        rows = [{k: d[k] for k in ("id", "daire", "esas_no", "karar_no", "karar_tarihi")} for d in matches[start:start + self.page_size]]
+        return {
+            "sonuclar": rows,
+            "toplam": len(matches),
+            "sayfa_boyutu": self.page_size,
+            "sonraki": start + self.page_size < len(matches),
+        }
+
+    def decision(self, decision_id: int) -> Optional[Dict[str, Any]]:
+        if 0 <= decision_id < len(self.decisions):
+            return self.decisions[decision_id]
+        return None
+
+
+class FixtureServer:
+    """Arka plan thread'inde çalışan fixture HTTP sunucusu"""
+
+    def __init__(self, corpus: FixtureCorpus, latencies: Latencies, host: str = "127.0.0.1", port: int = 0):
+        self.corpus = corpus
+        self.latencies = latencies
+        self.requests: Dict[str, int] = {"initial": 0, "search": 0, "page": 0, "panel": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: str, content_type: str):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if parsed.path in ("/", "/YargitayBilgiBankasiIstemciWeb/"):
+                    server._count("initial")
+                    server.latencies.sleep("initial")
+                    self._send(200, PAGE_TEMPLATE, "text/html")
+                elif parsed.path == "/api/ara":
+                    page = int(query.get("sayfa", ["1"])[0])
+                    kind = "search" if page == 1 else "page"
+                    server._count(kind)
+                    server.latencies.sleep(kind)
+                    result = server.corpus.search(query.get("q", [""])[0], page)
+                    self._send(200, json.dumps(result, ensure_ascii=False), "application/json")
+                elif parsed.path.startswith("/api/karar/"):
+                    server._count("panel")
+                    server.latencies.sleep("panel")
+                    try:
+                        decision = server.corpus.decision(int(parsed.path.rsplit("/", 1)[-1]))
+                    except ValueError:
+                        decision = None
+                    if decision is None:
+                        self._send(404, json.dumps({"hata": "Karar bulunamadı"}), "application/json")
+                    else:
+                        self._send(200, json.dumps({"metin": decision["metin"]}, ensure_ascii=False), "application/json")
+                else:
+                    self._send(404, f"<p>{html.escape(parsed.path)} bulunamadı</p>", "text/html")
+
+        return Handler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE, help="Kayıtlı karar dosyası (JSON)")
+    parser.add_argument("--repeat", type=int, default=1, help="Korpusu çoğaltma katsayısı (daha fazla sayfa için)")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--initial-latency", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.5)
+    parser.add_argument("--page-latency", type=float, default=0.4)
+    parser.add_argument("--panel-latency", type=float, default=0.25)
+    parser.add_argument("--jitter", type=float, default=0.2)
+
+
+def server_from_args(args, port: int = 0) -> FixtureServer:
+    corpus = FixtureCorpus.load(args.fixture, args.repeat, args.page_size)
+    latencies = Latencies(
+        initial=args.initial_latency,
+        search=args.search_latency,
+        page=args.page_latency,
+        panel=args.panel_latency,
+        jitter=args.jitter,
+    )
+    return FixtureServer(corpus, latencies, port=port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="karararama fixture sunucusu")
+    add_server_arguments(parser)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    server = server_from_args(args, port=args.port).start()
+    print(f"Fixture sunucusu çalışıyor: {server.url} ({len(server.corpus.decisions)} karar)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Scraper Karşılaştırma (benchmark) Aracı
+Yerel fixture sunucusunu başlatır, YARGITAY_BASE_URL'yi ona yönlendirir ve iki modda ölçüm yapar:
+- keyword: search_single_keyword doğrudan, verilen eşzamanlılıkla çalıştırılır
+- api:     POST /search uç noktası (scheduler, single-flight, bütçe dahil) çağrılır; her istekten
+           önce cache temizlenir, Firestore ve yerel indeks devre dışıdır
+Rapor: karar/saniye, istek süresi p50/p95 ve istek başına tarayıcı-saniye.
+Yerel Chromium + chromedriver (USE_LOCAL_CHROME) veya SELENIUM_GRID_URL gerektirir.
+
+Kullanım (yargitay-scraper-api dizininden):
+    python -m benchmark.run_benchmark --mode keyword --keywords "tahliye,kıdem tazminatı" --iterations 3
+    python -m benchmark.run_benchmark --mode api --keywords "tahliye,nafaka" --concurrency 2 --json
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from .fixture_server import add_server_arguments, server_from_args
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class BrowserClock:
+    """search_single_keyword çağrılarının toplam süresini (tarayıcı-saniye) sayar"""
+
+    def __init__(self, fn: Callable[..., tuple]):
+        self.fn = fn
+        self.seconds = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            return self.fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.seconds += time.monotonic() - started
+                self.calls += 1
+
+
+def summarize(mode: str, latencies: List[float], decisions: int, wall: float, browser_seconds: float, errors: int) -> Dict[str, Any]:
+    requests = len(latencies)
+    return {
+        "mode": mode,
+        "requests": requests,
+        "errors": errors,
+        "decisions": decisions,
+        "wall_seconds": round(wall, 3),
+        "decisions_per_second": round(decisions / wall, 3) if wall else 0.0,
+        "latency_p50": round(percentile(latencies, 0.5), 3),
+        "latency_p95": round(percentile(latencies, 0.95), 3),
+        "browser_seconds_per_request": round(browser_seconds / requests, 3) if requests else 0.0,
+    }
+
+
+def run_keyword_mode(keywords: List[str], iterations: int, concurrency: int) -> Dict[str, Any]:
+    from app.search_logic import search_single_keyword
+
+    clock = BrowserClock(search_single_keyword)
+    jobs = [(keyword, idx) for idx, keyword in enumerate(keywords * iterations)]
+    latencies: List[float] = []
+    counts = {"decisions": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def run(job):
+        keyword, idx = job
+        started = time.monotonic()
+        _, results, success, _ = clock(keyword, idx)
+        with lock:
+            latencies.append(time.monotonic() - started)
+            counts["decisions"] += len(results)
+            counts["errors"] += 0 if success else 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, jobs))
+    return summarize("keyword", latencies, counts["decisions"], time.monotonic() - started, clock.seconds, counts["errors"])
+
+
+def run_api_mode(keywords: List[str], iterations: int, concurrency: int, max_results: int) -> Dict[str, Any]:
+    from fastapi.testclient import TestClient
+    from app import main
+
+    # Ölçüm canlı Firestore'a yazmamalı ve her istekte tarayıcıya gitmeli
+    main.firestore_manager.connect = lambda: False
+    clock = BrowserClock(main.search_single_keyword)
+    main.search_single_keyword = clock
+
+    latencies: List[float] = []
+    counts = {"decisions": 0, "errors": 0}
+    lock = threading.Lock()
+
+    with TestClient(main.app) as client:
+        def run(_):
+            main.search_cache.clear()
+            started = time.monotonic()
+            response = client.post("/search", json={"keywords": keywords, "max_results": max_results})
+            elapsed = time.monotonic() - started
+            body = response.json() if response.status_code == 200 else {}
+            with lock:
+                latencies.append(elapsed)
+                counts["decisions"] += len(body.get("results", []))
+                counts["errors"] += 0 if body.get("success") else 1
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(run, range(iterations)))
+        wall = time.monotonic() - started
+    return summarize("api", latencies, counts["decisions"], wall, clock.seconds, counts["errors"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yargıtay scraper karşılaştırma aracı")
+    add_server_arguments(parser)
+    parser.add_argument("--mode", choices=["keyword", "api", "both"], default="both")
+    parser.add_argument("--keywords", default="tahliye,kıdem tazminatı,nafaka")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--max-results", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yazdır")
+    args = parser.parse_args()
+
+    server = server_from_args(args).start()
+    # Ayarlar app import edilirken okunur; sunucu adresi ve ölçümü bozan özellikler önceden ayarlanır
+    os.environ["YARGITAY_BASE_URL"] = server.url
+    os.environ.setdefault("USER_RATE_LIMIT", "100000/minute")
+    os.environ.setdefault("TEXT_INDEX_ENABLED", "false")
+    os.environ.setdefault("PRECRAWL_ENABLED", "false")
+
+    keywords = [k.strip() for k in args.keywords.split(",") if k.strip()]
+    reports = []
+    try:
+        if args.mode in ("keyword", "both"):
+            reports.append(run_keyword_mode(keywords, args.iterations, args.concurrency))
+        if args.mode in ("api", "both"):
+            reports.append(run_api_mode(keywords, args.iterations, args.concurrency, args.max_results))
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps({"fixture_requests": server.requests, "reports": reports}, ensure_ascii=False, indent=2))
+        return
+    print(f"Fixture: {server.url}  istekler: {server.requests}")
+    for report in reports:
+        print(
+            f"[{report['mode']}] {report['requests']} istek, {report['decisions']} karar, "
+            f"{report['decisions_per_second']} karar/sn, p50 {report['latency_p50']} sn, "
+            f"p95 {report['latency_p95']} sn, istek başına {report['browser_seconds_per_request']} tarayıcı-sn, "
+            f"hata {report['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import psutil
+
+from app import browser_supervisor as supervisor_module
+from app.browser_supervisor import BrowserSupervisor
+
+
+def make_supervisor(**overrides):
+    params = dict(
+        max_rss_mb=1024, recycle_after_pages=3, recycle_rss_growth=100.0,
+        interval_seconds=60, orphan_grace_seconds=3600,
+    )
+    params.update(overrides)
+    return BrowserSupervisor(**params)
+
+
+def spawn_detached_sleeper() -> tuple:
+    """Ara süreç bir uyuyan süreç başlatıp çıkar; uyuyan süreç başka bir ebeveyne devredilir."""
+    launcher = subprocess.Popen(
+        [sys.executable, "-c",
+         "import subprocess, sys, time; "
+         "p = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)', '--headless']); "
+         "print(p.pid, flush=True); time.sleep(0.5)"],
+        stdout=subprocess.PIPE, text=True,
+    )
+    return launcher, int(launcher.stdout.readline())
+
+
+def fake_driver(process):
+    """Yerel chromedriver sürücüsü gibi service.process.pid taşıyan nesne"""
+    return SimpleNamespace(service=SimpleNamespace(process=process))
+
+
+class TestBrowserSupervisor:
+    """Browser process watchdog tests"""
+
+    def test_recycle_after_page_limit(self):
+        supervisor = make_supervisor()
+        driver = fake_driver(None)  # Remote sürücü: PID yok, yalnızca sayfa sayılır
+        supervisor.register(driver, "t")
+        for _ in range(2):
+            supervisor.record_page(driver)
+        assert supervisor.recycle_reason(driver) is None
+        supervisor.record_page(driver)
+        assert "3 sayfa" in supervisor.recycle_reason(driver)
+
+    def test_rss_ceiling_kills_browser_tree(self):
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            supervisor = make_supervisor()
+            driver = fake_driver(process)
+            supervisor.register(driver, "t")
+            assert supervisor.get_stats()["rss_mb"] > 0
+
+            supervisor.max_rss = 1  # Her süreç ağacı tavanı aşar
+            supervisor.check()
+
+            assert process.wait(timeout=5) is not None
+            assert supervisor.get_stats()["killed_rss"] == 1
+            assert "RSS" in supervisor.recycle_reason(driver)
+        finally:
+            if process.poll() is None:
+                process.kill()
+
+    def test_unregister_updates_counts(self):
+        supervisor = make_supervisor()
+        drivers = [fake_driver(None) for _ in range(3)]
+        for driver in drivers:
+            supervisor.register(driver, "t")
+        supervisor.unregister(drivers[0])
+        supervisor.unregister(drivers[0])
+        stats = supervisor.get_stats()
+        assert stats["browsers"] == 2
+        assert stats["closed"] == 1
+        assert stats["peak_browsers"] == 3
+
+    def test_zombie_children_are_reaped(self):
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        child = psutil.Process(process.pid)
+        deadline = time.monotonic() + 5
+        while child.status() != psutil.STATUS_ZOMBIE and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        make_supervisor().check()
+
+        assert not psutil.pid_exists(process.pid)
+
+    def test_reparented_launched_browser_is_killed(self, monkeypatch):
+        launcher, sleeper = spawn_detached_sleeper()
+        try:
+            monkeypatch.setattr(supervisor_module, "is_browser_process", lambda proc: proc.pid == sleeper)
+            supervisor = make_supervisor(orphan_grace_seconds=0)
+            driver = fake_driver(launcher)
+            supervisor.register(driver, "t")
+            supervisor.unregister(driver)
+            launcher.wait(timeout=5)  # Uyuyan süreç artık bu sürecin alt süreci değil
+
+            supervisor.check()
+
+            assert not psutil.pid_exists(sleeper) or psutil.Process(sleeper).status() == psutil.STATUS_ZOMBIE
+            assert supervisor.get_stats()["orphans_killed"] == 1
+        finally:
+            if psutil.pid_exists(sleeper):
+                psutil.Process(sleeper).kill()
+
+    def test_foreign_browser_is_left_alone(self, monkeypatch):
+        launcher, sleeper = spawn_detached_sleeper()
+        try:
+            launcher.wait(timeout=5)
+            # Başka bir servisin headless tarayıcısı: kaydı yok ve bu sürecin soyundan değil
+            monkeypatch.setattr(supervisor_module, "is_browser_process", lambda proc: proc.pid == sleeper)
+            supervisor = make_supervisor(orphan_grace_seconds=0)
+
+            supervisor.check()
+
+            assert psutil.Process(sleeper).is_running()
+            assert supervisor.get_stats()["orphans_killed"] == 0
+        finally:
+            if psutil.pid_exists(sleeper):
+                psutil.Process(sleeper).kill()
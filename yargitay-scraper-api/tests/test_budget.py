@@ -0,0 +1,86 @@
+from app.budget import ResultBudget, proportional_quotas
+
+
+def drain(budget, keyword, available):
+    """Simulate a keyword worker reading rows until the budget says stop"""
+    found = 0
+    for case_id in available:
+        if not budget.wants_more(keyword, found):
+            break
+        budget.record(keyword, case_id)
+        found += 1
+    budget.finish(keyword)
+    return found
+
+
+class TestProportionalQuotas:
+    """Quota distribution tests"""
+
+    def test_even_split_with_remainder(self):
+        assert proportional_quotas(7, ["a", "b", "c"], 5) == {"a": 3, "b": 2, "c": 2}
+
+    def test_capped_per_keyword(self):
+        assert proportional_quotas(50, ["a", "b"], 3) == {"a": 3, "b": 3}
+
+
+class TestResultBudget:
+    """Shared budget and cooperative cancellation tests"""
+
+    def test_stops_at_quota(self):
+        """Each keyword stops at its share; both are marked truncated"""
+        budget = ResultBudget(max_results=4, per_keyword_cap=3)
+        budget.allocate(["a", "b"])
+        assert drain(budget, "a", ["1", "2", "3"]) == 2
+        assert drain(budget, "b", ["4", "5", "6"]) == 2
+        assert budget.exhausted
+        assert budget.was_truncated("a") and budget.was_truncated("b")
+
+    def test_unused_quota_is_handed_over(self):
+        """A keyword with few hits frees its share for the others"""
+        budget = ResultBudget(max_results=4, per_keyword_cap=3)
+        budget.allocate(["a", "b"])
+        assert drain(budget, "a", ["1"]) == 1
+        assert drain(budget, "b", ["2", "3", "4", "5"]) == 3
+        assert not budget.was_truncated("a")
+
+    def test_existing_results_reduce_budget(self):
+        """Cached decisions count against max_results before scraping"""
+        budget = ResultBudget(max_results=2, per_keyword_cap=3)
+        budget.record_existing(["1", "2"])
+        budget.allocate(["a"])
+        assert budget.exhausted
+        assert drain(budget, "a", ["3"]) == 0
+        assert budget.was_truncated("a")
+
+    def test_target_cap_is_not_truncation(self):
+        """Reaching TARGET_RESULTS_PER_KEYWORD is a normal finish"""
+        budget = ResultBudget(max_results=50, per_keyword_cap=2)
+        budget.allocate(["a"])
+        assert drain(budget, "a", ["1", "2", "3"]) == 2
+        assert not budget.was_truncated("a")
+
+    def test_only_keywords_below_the_cap_are_limited(self):
+        """A keyword whose quota reaches the per-keyword cap cannot be truncated"""
+        budget = ResultBudget(max_results=5, per_keyword_cap=3)
+        budget.allocate(["a", "b"])
+        assert not budget.limits("a")
+        assert budget.limits("b")
+        assert drain(budget, "b", ["1", "2", "3"]) == 2
+        assert drain(budget, "a", ["1", "4", "5", "6"]) == 3
+        assert not budget.was_truncated("a")
+
+    def test_overlapping_keywords_fill_budget_with_unique_decisions(self):
+        """Decisions already read by another keyword do not consume quota"""
+        budget = ResultBudget(max_results=4, per_keyword_cap=5)
+        budget.allocate(["a", "b"])
+        assert drain(budget, "a", ["1", "2", "3"]) == 2
+        assert drain(budget, "b", ["1", "2", "4", "5", "6"]) == 4
+        assert budget.unique_count == 4 and budget.exhausted
+
+    def test_duplicate_reads_still_count_towards_keyword_cap(self):
+        """TARGET_RESULTS_PER_KEYWORD limits reads, not only new decisions"""
+        budget = ResultBudget(max_results=10, per_keyword_cap=2)
+        budget.allocate(["a", "b"])
+        drain(budget, "a", ["1", "2"])
+        assert drain(budget, "b", ["1", "2", "3"]) == 2
+        assert not budget.was_truncated("b")
@@ -0,0 +1,235 @@
+import asyncio
+import time
+
+from app.cache import (
+    normalize_keyword,
+    keyword_cache_key,
+    unique_keywords,
+    LRUCache,
+    TieredKeywordCache,
+    SingleFlight,
+)
+
+
+class FakeStore:
+    """In-memory stand-in for the Firestore keyword cache"""
+
+    def __init__(self):
+        self.client = object()
+        self.docs = {}
+        self.reads = 0
+
+    async def get_keyword_caches(self, keywords):
+        self.reads += 1
+        return {k: self.docs[k] for k in keywords if k in self.docs}
+
+    async def save_keyword_cache(self, keyword, results, search_duration,
+                                 fresh_until=None, expires_at=None, metadata=None):
+        self.docs[keyword] = {
+            "search_results": results,
+            "search_duration": search_duration,
+            "fresh_until": fresh_until,
+            "expires_at": expires_at,
+            **(metadata or {}),
+        }
+
+
+class TestKeywordNormalization:
+    """Keyword-level cache key tests"""
+
+    def test_turkish_lowercase(self):
+        """Turkish dotted/dotless I are lowered correctly"""
+        assert normalize_keyword("İŞÇİLİK ALACAĞI") == "işçilik alacağı"
+        assert normalize_keyword("KIDEM") == "kıdem"
+
+    def test_whitespace_is_collapsed(self):
+        """Surrounding and repeated whitespace is ignored"""
+        assert normalize_keyword("  kira   tespiti ") == "kira tespiti"
+
+    def test_cache_key_is_normalized(self):
+        """Equivalent spellings share one cache key"""
+        assert keyword_cache_key("Tazminat") == keyword_cache_key(" tazminat ")
+        assert keyword_cache_key("tazminat") != keyword_cache_key("kira")
+
+    def test_unique_keywords_keeps_order(self):
+        """Duplicates are dropped, first occurrence order kept"""
+        assert unique_keywords(["Kira", "tazminat", "kira ", "", "Tahliye"]) == ["kira", "tazminat", "tahliye"]
+
+
+class TestLRUCache:
+    """L1 cache bounds tests"""
+
+    def test_entry_limit_evicts_least_recently_used(self):
+        """Oldest untouched entry is evicted first"""
+        cache = LRUCache(max_entries=2, max_bytes=10_000, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.evictions == 1
+
+    def test_byte_limit(self):
+        """Total serialized size stays under max_bytes"""
+        cache = LRUCache(max_entries=100, max_bytes=50, ttl_seconds=60)
+        cache.set("a", "x" * 30)
+        cache.set("b", "y" * 30)
+        assert cache.get("a") is None
+        assert cache.get_stats()["bytes"] <= 50
+
+    def test_ttl_expiry(self):
+        """Expired entries are not returned"""
+        cache = LRUCache(max_entries=10, max_bytes=10_000, ttl_seconds=60)
+        cache.set("a", 1, ttl_seconds=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestTieredKeywordCache:
+    """Read-through L1/L2 cache tests"""
+
+    def test_l2_hit_is_promoted_to_l1(self):
+        """L2 hits are served from L1 on the next lookup"""
+        store = FakeStore()
+        store.docs["kira"] = {"search_results": [{"esas_no": "1"}], "search_duration": 1.0}
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 60), store)
+
+        first = asyncio.run(cache.get_many(["kira", "tahliye"]))
+        second = asyncio.run(cache.get_many(["kira"]))
+
+        assert first["kira"]["source"] == "l2"
+        assert "tahliye" not in first
+        assert second["kira"]["source"] == "l1"
+        assert store.reads == 1
+        stats = cache.get_stats()
+        assert stats["l1_hits"] == 1 and stats["l2_hits"] == 1 and stats["misses"] == 1
+
+    def test_set_writes_through(self):
+        """New entries land in both tiers"""
+        store = FakeStore()
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 60), store)
+        asyncio.run(cache.set("Kira", [{"esas_no": "1"}], 2.0))
+        assert "kira" in store.docs
+        assert cache.l1.get("kira")["results"] == [{"esas_no": "1"}]
+
+    def test_stale_entries_are_flagged(self):
+        """Entries past their freshness window are returned as stale"""
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 60), None, fresh_ttl_seconds=0)
+        asyncio.run(cache.set("kira", [{"esas_no": "1"}], 1.0))
+        found = asyncio.run(cache.get_many(["kira"]))
+        assert found["kira"]["stale"] is True
+        assert cache.get_stats()["stale_hits"] == 1
+
+
+class TestSingleFlight:
+    """Per-key stampede protection tests"""
+
+    def test_concurrent_callers_share_one_run(self):
+        """Only one factory call per key while in flight"""
+        flights = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+
+        async def scenario():
+            return await asyncio.gather(*[flights.run("kira", work) for _ in range(5)])
+
+        assert asyncio.run(scenario()) == ["done"] * 5
+        assert len(calls) == 1
+        assert flights.coalesced == 4
+
+    def test_spawn_skips_running_key(self):
+        """Background refresh is not duplicated"""
+        flights = SingleFlight()
+
+        async def scenario():
+            started = [flights.spawn("kira", lambda: asyncio.sleep(0.01)) for _ in range(3)]
+            await asyncio.sleep(0.02)
+            return started
+
+        assert asyncio.run(scenario()) == [True, False, False]
+        assert flights.get_stats()["in_flight"] == 0
+
+
+class TestNegativeCache:
+    """Negative cache entry tests"""
+
+    def test_negative_entry_round_trip(self):
+        """Known-empty keywords are answered from cache"""
+        store = FakeStore()
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 60), store)
+        asyncio.run(cache.set_negative("Kira", "Sonuç bulunamadı", True, 60))
+
+        found = asyncio.run(cache.get_many(["kira"]))
+        assert found["kira"]["negative"] is True
+        assert found["kira"]["results"] == []
+        assert found["kira"]["stale"] is False
+        assert store.docs["kira"]["search_results"] == []
+        assert cache.get_stats()["negative_hits"] == 1
+
+    def test_negative_entry_from_l2(self):
+        """Negative flags survive an L2 round trip"""
+        store = FakeStore()
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 60), store)
+        asyncio.run(cache.set_negative("kira", "Zaman aşımı", False, 60))
+        cache.l1.clear()
+
+        found = asyncio.run(cache.get_many(["kira"]))
+        assert found["kira"]["source"] == "l2"
+        assert found["kira"]["negative"] is True
+        assert found["kira"]["success"] is False
+
+    def test_zero_ttl_disables(self):
+        """A zero TTL skips negative caching"""
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 60), None)
+        asyncio.run(cache.set_negative("kira", "Sonuç bulunamadı", True, 0))
+        assert asyncio.run(cache.get_many(["kira"])) == {}
+
+    def test_l2_negative_entry_keeps_its_short_ttl_in_l1(self):
+        """Promoted negative entries expire from L1 when their L2 freshness ends"""
+        store = FakeStore()
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 3600), store)
+        asyncio.run(cache.set_negative("kira", "Zaman aşımı", False, 0.2))
+        cache.l1.clear()
+
+        assert asyncio.run(cache.get_many(["kira"]))["kira"]["source"] == "l2"
+        time.sleep(0.3)
+        store.docs.clear()
+        assert asyncio.run(cache.get_many(["kira"])) == {}
+
+    def test_stale_negative_entry_is_a_miss(self):
+        """Expired negative entries still present in L2 are not served"""
+        store = FakeStore()
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 3600), store)
+        asyncio.run(cache.set_negative("kira", "Sonuç bulunamadı", True, 0.1))
+        time.sleep(0.2)
+
+        assert asyncio.run(cache.get_many(["kira"])) == {}
+        assert cache.get_stats()["misses"] == 1
+        assert cache.get_stats()["negative_hits"] == 0
+
+
+class TestUntrackedLookups:
+    """track=False lookup tests"""
+
+    def test_untracked_lookup_keeps_concurrent_stats(self):
+        """Stats recorded by a concurrent tracked lookup survive an untracked one"""
+        class SlowStore(FakeStore):
+            async def get_keyword_caches(self, keywords):
+                await asyncio.sleep(0.01)
+                return await super().get_keyword_caches(keywords)
+
+        cache = TieredKeywordCache(LRUCache(100, 10_000, 60), SlowStore())
+        asyncio.run(cache.set("kira", [{"esas_no": "1"}], 1.0))
+
+        async def scenario():
+            await asyncio.gather(cache.get_many(["tahliye"], track=False), cache.get_many(["kira"]))
+
+        asyncio.run(scenario())
+        stats = cache.get_stats()
+        assert stats["l1_hits"] == 1 and stats["misses"] == 0
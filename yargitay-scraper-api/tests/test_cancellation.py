@@ -0,0 +1,52 @@
+import time
+
+from app.cancellation import CancelToken, RequestCancellation, deadline_from_headers
+
+
+class TestCancelToken:
+    """Shared cancel token tests"""
+
+    def test_cancelled_when_last_holder_leaves(self):
+        """A scrape shared by two requests survives the first one leaving"""
+        token = CancelToken()
+        first, second = RequestCancellation(), RequestCancellation()
+        first.hold(token)
+        second.hold(token)
+        first.release_all()
+        assert not token.cancelled
+        second.release_all()
+        assert token.cancelled
+
+    def test_deadline_requires_all_holders_expired(self):
+        """A holder without a deadline keeps the scrape alive"""
+        token = CancelToken()
+        expired = RequestCancellation(deadline=time.monotonic() - 1)
+        open_ended = RequestCancellation()
+        expired.hold(token)
+        open_ended.hold(token)
+        assert not token.cancelled
+        open_ended.release_all()
+        assert token.cancelled
+        assert token.reason == "İstek süresi doldu"
+
+    def test_deadline_expiry(self):
+        token = CancelToken()
+        RequestCancellation(deadline=time.monotonic() - 1).hold(token)
+        assert token.cancelled
+        assert token.reason == "İstek süresi doldu"
+
+    def test_hold_after_release_cancels(self):
+        """Joining after the request ended does not keep the scrape alive"""
+        token = CancelToken()
+        cancellation = RequestCancellation()
+        cancellation.release_all()
+        cancellation.hold(token)
+        assert token.cancelled
+
+    def test_deadline_headers(self):
+        now = time.monotonic()
+        assert deadline_from_headers({}) is None
+        assert abs(deadline_from_headers({"X-Request-Timeout": "10"}) - (now + 10)) < 1
+        deadline = deadline_from_headers({"X-Request-Timeout": "10", "X-Request-Deadline": str(time.time() + 5)})
+        assert abs(deadline - (now + 5)) < 1
+        assert deadline_from_headers({"X-Request-Timeout": "abc"}) is None
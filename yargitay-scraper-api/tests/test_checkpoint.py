@@ -0,0 +1,80 @@
+import time
+
+from app.checkpoint import STATUS_COMPLETE, STATUS_IN_PROGRESS, CheckpointStore, ScrapeCheckpoint
+
+
+class FakeStore:
+    """Firestore yerine geçen bellek içi depo"""
+
+    def __init__(self):
+        self.client = object()
+        self.documents = {}
+
+    def fetch_scrape_checkpoint(self, keyword):
+        return self.documents.get(keyword)
+
+    def store_scrape_checkpoint(self, keyword, checkpoint, ttl_seconds):
+        self.documents[keyword] = dict(checkpoint)
+
+
+class TestCheckpointStore:
+    """Resumable keyword search checkpoint tests"""
+
+    def test_fresh_search_starts_at_first_page(self):
+        store = CheckpointStore(None, ttl_seconds=60)
+        checkpoint = store.start("tahliye")
+        assert checkpoint.page_number == 1
+        assert checkpoint.processed_cases == []
+        assert checkpoint.status == STATUS_IN_PROGRESS
+
+    def test_in_progress_checkpoint_is_resumed_with_results(self):
+        store = CheckpointStore(None, ttl_seconds=60)
+        store.save(ScrapeCheckpoint(
+            keyword="Tahliye", page_number=4, processed_cases=["a", "b"], results=[{"esas_no": "a"}]
+        ))
+
+        checkpoint = store.start("tahliye", continue_paging=True)
+        assert checkpoint.page_number == 4
+        assert checkpoint.processed_cases == ["a", "b"]
+        assert checkpoint.results == [{"esas_no": "a"}]
+        # Kopya döner; taramanın değişiklikleri save edilene kadar kayda yansımaz
+        checkpoint.page_number = 9
+        assert store.load("tahliye").page_number == 4
+        assert store.get_stats()["resumed"] == 1
+
+    def test_continue_paging_starts_from_completed_cursor(self):
+        store = CheckpointStore(None, ttl_seconds=60)
+        store.save(ScrapeCheckpoint(keyword="nafaka", page_number=6, processed_cases=["a"], status=STATUS_COMPLETE))
+
+        assert store.start("nafaka").page_number == 1
+        continued = store.start("nafaka", continue_paging=True)
+        assert continued.page_number == 6
+        assert continued.processed_cases == ["a"]
+        assert continued.results == []
+        assert store.cursor("nafaka") == {"page": 6, "processed": 1, "status": STATUS_COMPLETE, "exhausted": False}
+
+    def test_exhausted_search_has_nothing_to_continue(self):
+        store = CheckpointStore(None, ttl_seconds=60)
+        store.save(ScrapeCheckpoint(keyword="nafaka", page_number=3, status=STATUS_COMPLETE, exhausted=True))
+        assert store.start("nafaka", continue_paging=True) is None
+
+    def test_expired_checkpoint_is_ignored(self):
+        store = CheckpointStore(None, ttl_seconds=60)
+        store.save(ScrapeCheckpoint(keyword="tahliye", page_number=5))
+        store.load("tahliye").updated_at = time.time() - 120
+        assert store.start("tahliye").page_number == 1
+
+    def test_checkpoint_survives_process_restart_through_store(self):
+        backing = FakeStore()
+        CheckpointStore(backing, ttl_seconds=60).save(ScrapeCheckpoint(keyword="tahliye", page_number=3, processed_cases=["x"]))
+
+        checkpoint = CheckpointStore(backing, ttl_seconds=60).start("tahliye")
+        assert checkpoint.page_number == 3
+        assert checkpoint.processed_cases == ["x"]
+
+    def test_lru_keeps_most_recent_entries(self):
+        store = CheckpointStore(None, ttl_seconds=60, max_entries=2)
+        for keyword in ("a", "b", "c"):
+            store.save(ScrapeCheckpoint(keyword=keyword))
+        assert store.load("a") is None
+        assert store.load("c") is not None
@@ -0,0 +1,186 @@
+import asyncio
+from datetime import date, datetime
+
+from app.corpus import (
+    CorpusIngestor,
+    content_hash,
+    decision_key,
+    parse_decision_date,
+    to_corpus_document,
+)
+
+
+def result(esas_no="2024/1", text="Karar metni", karar_tarihi="15.03.2024", keyword="kira"):
+    return {
+        "daire": "3. Hukuk Dairesi",
+        "esas_no": esas_no,
+        "karar_no": "2024/99",
+        "karar_tarihi": karar_tarihi,
+        "karar_metni": text,
+        "keyword": keyword,
+    }
+
+
+class FakeCorpusStore:
+    """Stand-in for the Firestore decision corpus"""
+
+    client = object()
+
+    def __init__(self):
+        self.docs = {}
+        self.states = {}
+
+    async def save_decisions(self, decisions):
+        summary = {"new": 0, "updated": 0, "unchanged": 0}
+        for decision in decisions:
+            current = self.docs.get(decision["decision_id"])
+            if current and current["content_hash"] == decision["content_hash"]:
+                summary["unchanged"] += 1
+                continue
+            summary["updated" if current else "new"] += 1
+            self.docs[decision["decision_id"]] = decision
+        return summary
+
+    async def get_crawl_state(self, keyword):
+        return self.states.get(keyword)
+
+    async def save_crawl_state(self, keyword, state):
+        self.states.setdefault(keyword, {}).update(state)  # Firestore merge=True gibi
+
+
+class TestCorpusDocuments:
+    """Decision identity and change detection tests"""
+
+    def test_decision_key_is_stable(self):
+        """Whitespace and case differences map to one decision"""
+        assert decision_key("3. Hukuk Dairesi", "2024/1", "2024/99") == \
+            decision_key(" 3. hukuk  dairesi", "2024/1 ", "2024/99")
+
+    def test_content_hash_ignores_whitespace(self):
+        """Reflowed text hashes the same"""
+        assert content_hash("a  b\nc") == content_hash("a b c")
+        assert content_hash("a b c") != content_hash("a b d")
+
+    def test_parse_decision_date(self):
+        """Turkish date format is parsed"""
+        assert parse_decision_date("15.03.2024") == datetime(2024, 3, 15)
+        assert parse_decision_date("bilinmiyor") is None
+
+    def test_placeholder_texts_are_not_stored(self):
+        """Panel timeouts never enter the corpus"""
+        assert to_corpus_document(result(text="Karar metni bulunamadı.")) is None
+
+
+class TestCorpusIngestor:
+    """Ingest pipeline tests"""
+
+    def test_unchanged_text_is_not_rewritten(self):
+        """Second ingest of the same text is a no-op"""
+        ingestor = CorpusIngestor(FakeCorpusStore())
+        first = asyncio.run(ingestor.ingest([result()], "kira"))
+        second = asyncio.run(ingestor.ingest([result()], "kira"))
+        changed = asyncio.run(ingestor.ingest([result(text="Düzeltilmiş karar metni")], "kira"))
+
+        assert first["new"] == 1
+        assert second["unchanged"] == 1
+        assert changed["updated"] == 1
+
+    def test_ingest_feeds_text_index(self, tmp_path):
+        """Ingested decisions become searchable locally, flushed at the threshold"""
+        from app.text_index import TextIndex
+
+        index = TextIndex(str(tmp_path / "idx"))
+        ingestor = CorpusIngestor(FakeCorpusStore(), index, index_flush_threshold=2)
+        asyncio.run(ingestor.ingest([result("2024/1", text="Kiracının tahliyesi")], "kira"))
+        assert index.pending_count == 1
+        asyncio.run(ingestor.ingest([result("2024/2", text="Kira bedeli tahliye")], "kira"))
+        assert index.pending_count == 0
+        assert len(index.search("tahliye", require_all=True)) == 2
+
+    def test_date_range_filter(self):
+        """Only decisions inside the range are stored"""
+        store = FakeCorpusStore()
+        ingestor = CorpusIngestor(store)
+        summary = asyncio.run(ingestor.ingest(
+            [result("2024/1", karar_tarihi="01.01.2023"), result("2024/2", karar_tarihi="01.06.2024")],
+            "kira",
+            date_from=date(2024, 1, 1)
+        ))
+        assert summary["new"] == 1
+        assert summary["skipped"] == 1
+
+    def test_crawl_resumes_from_watermark(self):
+        """A follow-up crawl starts from the newest stored decision date"""
+        store = FakeCorpusStore()
+        ingestor = CorpusIngestor(store)
+
+        async def scrape(keyword, continue_paging):
+            if continue_paging:
+                return keyword, [], True, "Devam edilecek başka sonuç sayfası yok"
+            return keyword, [result("2024/1", karar_tarihi="01.06.2024")], True, "1 sonuç bulundu."
+
+        first = asyncio.run(ingestor.crawl("Kira", scrape))
+        second = asyncio.run(ingestor.crawl("kira", scrape))
+
+        assert first["date_from"] is None and first["complete"]
+        assert store.states["kira"]["newest_decision_date"] == datetime(2024, 6, 1)
+        assert second["date_from"] == "2024-06-01"
+        assert second["unchanged"] == 1
+
+
+class PagedSearch:
+    """Relevance-ordered result pages served a few decisions per scrape through the cursor"""
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.cursor = 0
+        self.calls = []
+
+    async def __call__(self, keyword, continue_paging):
+        self.calls.append(continue_paging)
+        if not continue_paging:
+            self.cursor = 0
+        if self.cursor >= len(self.batches):
+            return keyword, [], True, "Devam edilecek başka sonuç sayfası yok"
+        batch = self.batches[self.cursor]
+        self.cursor += 1
+        return keyword, batch, True, f"{len(batch)} sonuç bulundu."
+
+
+class TestCorpusCrawl:
+    """Paged incremental crawl tests"""
+
+    BATCHES = [
+        [result("2024/1", karar_tarihi="01.06.2024"), result("2024/2", karar_tarihi="01.01.2020")],
+        [result("2024/3", karar_tarihi="15.02.2024"), result("2024/4", karar_tarihi="10.03.2024")],
+        [result("2024/5", karar_tarihi="20.01.2024")],
+    ]
+
+    def test_pages_until_results_run_out(self):
+        """Older in-range decisions beyond the first scrape are reached"""
+        store = FakeCorpusStore()
+        search = PagedSearch(self.BATCHES)
+        summary = asyncio.run(CorpusIngestor(store).crawl("kira", search, date_from=date(2024, 1, 1)))
+
+        assert search.calls == [False, True, True, True]
+        assert summary["complete"] and summary["new"] == 4 and summary["skipped"] == 1
+        assert store.states["kira"]["newest_decision_date"] == datetime(2024, 6, 1)
+
+    def test_budget_stop_keeps_watermark_and_resumes(self):
+        """A crawl cut short by its scrape budget does not advance the watermark"""
+        store = FakeCorpusStore()
+        store.states["kira"] = {"newest_decision_date": datetime(2023, 12, 31)}
+        ingestor = CorpusIngestor(store)
+        search = PagedSearch(self.BATCHES)
+
+        first = asyncio.run(ingestor.crawl("kira", search, max_scrapes=2))
+        assert not first["complete"]
+        assert store.states["kira"]["newest_decision_date"] == datetime(2023, 12, 31)
+        assert store.states["kira"]["in_progress"]
+
+        second = asyncio.run(ingestor.crawl("kira", search, max_scrapes=2))
+        assert search.calls == [False, True, True, True]  # İkinci çağrı imleçten devam eder
+        assert second["complete"] and second["date_from"] == "2023-12-31"
+        assert store.states["kira"]["newest_decision_date"] == datetime(2024, 6, 1)
+        assert not store.states["kira"]["in_progress"]
+        assert len(store.docs) == 4
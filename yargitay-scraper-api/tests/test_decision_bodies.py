@@ -0,0 +1,202 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.cache import keyword_cache_key
+from app.decision_bodies import body_key, body_refs, externalize_bodies, resolve_bodies
+from app.firestore_db import FirestoreManager
+
+TEXT = "T.C. YARGITAY 9. Hukuk Dairesi ... karar metni"
+
+
+def make_result(esas_no, text=TEXT):
+    return {"esas_no": esas_no, "daire": "9. Hukuk Dairesi", "karar_metni": text, "content": text}
+
+
+class FakeDoc:
+    def __init__(self, ref, data):
+        self.reference, self.id = ref, ref.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeRef:
+    def __init__(self, store, collection, doc_id):
+        self.store, self.key, self.id = store, (collection, doc_id), doc_id
+
+    def set(self, data):
+        self.store.docs[self.key] = dict(data)
+
+    def update(self, data):
+        self.store.docs[self.key].update(data)
+
+    def delete(self):
+        self.store.docs.pop(self.key, None)
+
+
+class FakeQuery:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def get(self):
+        return self.docs
+
+
+class FakeCollection:
+    def __init__(self, store, name):
+        self.store, self.name = store, name
+
+    def document(self, doc_id):
+        return FakeRef(self.store, self.name, doc_id)
+
+    def where(self, field, op, value):
+        assert op == "<="
+        return FakeQuery([
+            FakeDoc(FakeRef(self.store, collection, doc_id), data)
+            for (collection, doc_id), data in list(self.store.docs.items())
+            if collection == self.name and data.get(field) is not None and data[field] <= value
+        ])
+
+
+class FakeBatch:
+    def __init__(self, store):
+        self.store, self.ops = store, []
+
+    def set(self, ref, data):
+        self.ops.append(lambda: ref.set(data))
+
+    def update(self, ref, data):
+        self.ops.append(lambda: ref.update(data))
+
+    def delete(self, ref):
+        self.ops.append(ref.delete)
+
+    def commit(self):
+        self.store.commits += 1
+        for op in self.ops:
+            op()
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.docs, self.get_all_calls, self.commits = {}, 0, 0
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, refs, field_paths=None):
+        self.get_all_calls += 1
+        return [FakeDoc(ref, self.docs.get(ref.key)) for ref in refs]
+
+    def bodies(self):
+        return {doc_id: data for (collection, doc_id), data in self.docs.items() if collection == "decision_bodies"}
+
+
+def manager_with_fake():
+    manager = FirestoreManager()
+    manager.client = FakeFirestore()
+    return manager
+
+
+class TestDecisionBodies:
+    """Content-addressed decision body tests"""
+
+    def test_duplicate_text_is_stored_once(self):
+        stripped, bodies = externalize_bodies([make_result("2024/1"), make_result("2024/2")])
+        assert list(bodies) == [body_key(TEXT)]
+        assert all("karar_metni" not in r and "content" not in r for r in stripped)
+        assert body_refs(stripped) == {body_key(TEXT)}
+
+    def test_resolve_restores_original_results(self):
+        results = [make_result("2024/1"), make_result("2024/2", text="başka metin"), {"esas_no": "2024/3", "content": ""}]
+        stripped, bodies = externalize_bodies(results)
+        assert resolve_bodies(stripped, bodies) == results
+
+    def test_legacy_results_pass_through(self):
+        legacy = [make_result("2024/1")]
+        assert resolve_bodies(legacy, {}) == legacy
+
+    def test_unresolved_reference_is_not_blanked(self):
+        stripped, bodies = externalize_bodies([make_result("2024/1"), make_result("2024/2", text="başka metin")])
+        bodies.pop(body_key(TEXT))
+        assert resolve_bodies(stripped, bodies) is None
+
+
+class TestFirestoreDecisionStore:
+    """keyword_cache entries hold references to shared decision bodies"""
+
+    def test_keyword_caches_share_bodies_and_resolve_with_one_multi_get(self):
+        manager = manager_with_fake()
+        expires_at = datetime.utcnow() + timedelta(days=1)
+        manager.store_keyword_cache("tahliye", [make_result("2024/1")], 1.0, expires_at=expires_at)
+        manager.store_keyword_cache("kira", [make_result("2024/1"), make_result("2024/2", "ikinci")], 1.0, expires_at=expires_at)
+
+        client = manager.client
+        assert len(client.bodies()) == 2
+        assert TEXT not in str(client.docs[("keyword_cache", keyword_cache_key("tahliye"))])
+
+        manager._known_bodies.clear()  # Soğuk süreç: metinler Firestore'dan okunmalı
+        client.get_all_calls = 0
+        found = manager.fetch_keyword_caches(["tahliye", "kira"])
+        assert client.get_all_calls == 2  # Cache kayıtları + tüm metinler
+        assert found["kira"]["search_results"] == [make_result("2024/1"), make_result("2024/2", "ikinci")]
+
+    def test_known_bodies_are_not_rewritten(self):
+        manager = manager_with_fake()
+        expires_at = datetime.utcnow() + timedelta(days=1)
+        assert manager.store_decision_bodies({body_key(TEXT): TEXT}, expires_at) == 1
+        client = manager.client
+        client.get_all_calls = 0
+        assert manager.store_decision_bodies({body_key(TEXT): TEXT}, expires_at) == 0
+        assert client.get_all_calls == 0
+
+    def test_body_expiry_follows_longest_lived_reference(self):
+        manager = manager_with_fake()
+        now = datetime.utcnow()
+        manager.store_decision_bodies({body_key(TEXT): TEXT}, now + timedelta(days=1))
+        # Daha kısa ömürlü yeni başvuru yazma gerektirmez, daha uzun ömürlü olan süreyi uzatır
+        assert manager.store_decision_bodies({body_key(TEXT): TEXT}, now + timedelta(hours=1)) == 0
+        assert manager.store_decision_bodies({body_key(TEXT): TEXT}, now + timedelta(days=7)) == 1
+        body = manager.client.bodies()[body_key(TEXT)]
+        assert body["expires_at"] >= now + timedelta(days=7) and body["text"] == TEXT
+
+    def test_legacy_body_gets_expiry_when_referenced(self):
+        manager = manager_with_fake()
+        manager.client.docs[("decision_bodies", body_key(TEXT))] = {"text": TEXT, "size": len(TEXT)}
+        assert manager.store_decision_bodies({body_key(TEXT): TEXT}, datetime.utcnow() + timedelta(days=1)) == 1
+        assert manager.client.bodies()[body_key(TEXT)]["expires_at"] is not None
+
+    def test_cleanup_removes_unreferenced_bodies(self):
+        manager = manager_with_fake()
+        now = datetime.utcnow()
+        manager.store_keyword_cache("tahliye", [make_result("2024/1")], 1.0, expires_at=now + timedelta(days=1))
+        manager.store_keyword_cache("kira", [make_result("2024/2", "ikinci")], 1.0, expires_at=now + timedelta(days=30))
+        client = manager.client
+        # tahliye kaydı ve metni süresini doldurmuş gibi geriye alınır
+        client.docs[("keyword_cache", keyword_cache_key("tahliye"))]["expires_at"] = now - timedelta(days=2)
+        client.docs[("decision_bodies", body_key(TEXT))]["expires_at"] = now - timedelta(days=1)
+
+        assert asyncio.run(manager.cleanup_expired_cache()) == 2
+        assert list(client.bodies()) == [body_key("ikinci")]
+        assert manager.fetch_keyword_caches(["kira"])["kira"]["search_results"] == [make_result("2024/2", "ikinci")]
+
+    def test_missing_body_turns_keyword_cache_into_miss(self):
+        manager = manager_with_fake()
+        expires_at = datetime.utcnow() + timedelta(days=1)
+        manager.store_keyword_cache("tahliye", [make_result("2024/1")], 1.0, expires_at=expires_at)
+        manager.store_keyword_cache("kira", [make_result("2024/2", "ikinci")], 1.0, expires_at=expires_at)
+        client = manager.client
+        del client.docs[("decision_bodies", body_key(TEXT))]
+
+        found = manager.fetch_keyword_caches(["tahliye", "kira"])
+        assert list(found) == ["kira"]
+        assert client.docs[("keyword_cache", keyword_cache_key("tahliye"))]["hit_count"] == 1
+
+        # Yeniden tarama kaydı yenilerken eksik metin tekrar yazılır
+        manager.store_keyword_cache("tahliye", [make_result("2024/1")], 1.0, expires_at=expires_at)
+        assert manager.fetch_keyword_caches(["tahliye"])["tahliye"]["search_results"] == [make_result("2024/1")]
@@ -0,0 +1,43 @@
+import json
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import pytest
+
+from benchmark.fixture_server import FixtureCorpus, FixtureServer, Latencies
+
+
+@pytest.fixture
+def server():
+    corpus = FixtureCorpus.load(repeat=2, page_size=10)
+    fixture = FixtureServer(corpus, Latencies(initial=0, search=0, page=0, panel=0)).start()
+    yield fixture
+    fixture.stop()
+
+
+def get_json(url):
+    with urlopen(url) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class TestFixtureServer:
+    """Offline karararama stand-in tests"""
+
+    def test_search_page_has_scraper_selectors(self, server):
+        with urlopen(server.url + "/") as response:
+            page = response.read().decode("utf-8")
+        for selector in ('id="aranan"', ">Ara</button>", 'id="detayAramaSonuclar"', "paginate_button next", 'id="kararAlani"'):
+            assert selector in page
+
+    def test_search_is_paginated(self, server):
+        first = get_json(server.url + "/api/ara?q=tahliye&sayfa=1")
+        assert first["toplam"] == 16  # 8 kayıt x repeat 2
+        assert len(first["sonuclar"]) == 10 and first["sonraki"]
+        second = get_json(server.url + "/api/ara?q=" + quote("TAHLİYE") + "&sayfa=2")
+        assert len(second["sonuclar"]) == 6 and not second["sonraki"]
+        assert server.requests["search"] == 1 and server.requests["page"] == 1
+
+    def test_decision_panel_text(self, server):
+        row = get_json(server.url + "/api/ara?q=nafaka&sayfa=1")["sonuclar"][0]
+        decision = get_json(f"{server.url}/api/karar/{row['id']}")
+        assert row["esas_no"] in decision["metin"]
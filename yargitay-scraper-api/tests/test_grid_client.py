@@ -0,0 +1,108 @@
+from app.grid_client import GridClient, parse_grid_status
+
+
+def grid_payload(*nodes):
+    return {"value": {"ready": True, "nodes": list(nodes)}}
+
+
+def node(node_id, busy, free, max_sessions=None, availability="UP"):
+    slots = [{"session": {"sessionId": f"{node_id}-{i}"}, "stereotype": {"browserName": "chrome"}} for i in range(busy)]
+    slots += [{"session": None, "stereotype": {"browserName": "chrome"}} for _ in range(free)]
+    return {
+        "id": node_id, "uri": f"http://{node_id}:5555", "availability": availability,
+        "maxSessions": max_sessions or busy + free, "slots": slots,
+    }
+
+
+class FakeDriver:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.window_handles = ["main", "tab-2"]
+        self.closed = []
+        self.quit_called = False
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+
+    def close(self):
+        self.closed.append("tab")
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestGridStatus:
+    """Selenium Grid status parsing tests"""
+
+    def test_free_slots_respect_max_sessions_and_availability(self):
+        status = parse_grid_status(grid_payload(
+            node("a", busy=1, free=3),
+            node("b", busy=1, free=3, max_sessions=2),
+            node("c", busy=0, free=4, availability="DRAINING"),
+        ))
+        assert [n["free"] for n in status["nodes"]] == [3, 1, 0]
+        assert status["free"] == 4
+
+    def test_selenium3_status_has_unknown_capacity(self):
+        assert parse_grid_status({"value": {"ready": True, "message": "Hub has capacity"}})["free"] is None
+
+
+class TestGridClient:
+    """Grid placement and session reuse tests"""
+
+    def test_reservations_stop_at_free_slots(self):
+        client = GridClient("http://hub", fetch_status=lambda: parse_grid_status(grid_payload(node("a", busy=2, free=2))))
+        assert client.reserve() is True
+        assert client.reserve() is True
+        assert client.reserve() is False  # Yerel Chromium'a düşülmeli
+        client.cancel_reservation()
+        assert client.reserve() is True
+        assert client.get_stats()["grid_full"] == 1
+
+    def test_unreachable_hub_gives_unknown_capacity(self):
+        def fail():
+            raise OSError("connection refused")
+
+        client = GridClient("http://hub", fetch_status=fail)
+        assert client.reserve() is None
+        assert client.get_stats()["status_errors"] == 1
+
+    def test_released_session_is_reused_by_next_job(self):
+        client = GridClient("http://hub", fetch_status=lambda: parse_grid_status(grid_payload()))
+        driver = FakeDriver()
+        client.adopt(driver, "tabs-1", started=0.0, reserved=False)
+
+        assert client.release(driver) is True
+        assert client.acquire("tabs-2") is None
+        assert client.acquire("tabs-1") is driver
+        assert driver.closed  # Fazla sekmeler kapatıldı
+        assert client.get_stats()["reused_sessions"] == 1
+
+    def test_dead_or_worn_out_sessions_are_not_pooled(self):
+        client = GridClient("http://hub", max_reuses=2, fetch_status=lambda: None)
+        dead = FakeDriver(alive=False)
+        client.adopt(dead, "tabs-1", started=0.0, reserved=False)
+        assert client.release(dead) is False
+
+        worn = FakeDriver()
+        client.adopt(worn, "tabs-1", started=0.0, reserved=False)
+        assert client.release(worn) is True
+        assert client.acquire("tabs-1") is worn
+        assert client.release(worn) is False  # İkinci kullanımdan sonra kapatılır
+
+    def test_idle_pool_is_bounded(self):
+        client = GridClient("http://hub", max_idle_sessions=1, fetch_status=lambda: None)
+        first, second = FakeDriver(), FakeDriver()
+        for driver in (first, second):
+            client.adopt(driver, "tabs-1", started=0.0, reserved=False)
+            client.release(driver)
+        assert first.quit_called and not second.quit_called
+        assert client.get_stats()["idle_sessions"] == 1
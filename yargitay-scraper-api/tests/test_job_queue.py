@@ -0,0 +1,135 @@
+import time
+
+import pytest
+
+from app import worker as worker_module
+from app.budget import ResultBudget
+from app.cancellation import CancelToken
+from app.checkpoint import STATUS_COMPLETE, CheckpointStore, ScrapeCheckpoint
+from app.job_queue import InMemoryBroker, QueueScheduler
+from app.metrics import PhaseTimings, bind_timings, observe_phase, unbind_timings
+from app.scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, ScraperScheduler
+from app.schemas import ResultItem
+from app.worker import ScraperWorker
+
+
+def make_result(keyword, esas_no):
+    return ResultItem(
+        daire="1. Hukuk Dairesi", esas_no=esas_no, karar_no="2024/1", karar_tarihi="01.01.2024",
+        karar_metni="metin", keyword=keyword
+    )
+
+
+def fake_search(keyword, thread_id, tabs=None, budget=None, cancel_token=None, timings=None, continue_paging=False):
+    token = bind_timings(timings)
+    observe_phase("fake_phase", 0.01)
+    unbind_timings(token)
+    results = []
+    for i in range(5):
+        if cancel_token is not None and cancel_token.cancelled:
+            return (keyword, results, True, f"İptal edildi: {cancel_token.reason}")
+        if budget is not None and not budget.wants_more(keyword, len(results)):
+            break
+        results.append(make_result(keyword, f"{keyword}-{i}"))
+        if budget is not None:
+            budget.record(keyword, f"{keyword}-{i}")
+    return (keyword, results, True, f"{len(results)} sonuç bulundu.")
+
+
+def slow_search(keyword, thread_id, tabs=None, budget=None, cancel_token=None, timings=None, continue_paging=False):
+    while not cancel_token.cancelled:
+        time.sleep(0.02)
+    return (keyword, [], True, f"İptal edildi: {cancel_token.reason}")
+
+
+worker_checkpoints = CheckpointStore(None, ttl_seconds=60)
+
+
+def paging_search(keyword, thread_id, tabs=None, budget=None, cancel_token=None, timings=None, continue_paging=False):
+    # Tarama kaydı yalnızca worker sürecinin deposuna yazılır
+    worker_checkpoints.save(ScrapeCheckpoint(keyword=keyword, page_number=4, processed_cases=["a", "b"], status=STATUS_COMPLETE))
+    return (keyword, [make_result(keyword, f"{keyword}-1")], True, "1 sonuç bulundu.")
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    monkeypatch.setitem(worker_module.JOB_FUNCTIONS, "fake_search", fake_search)
+    monkeypatch.setitem(worker_module.JOB_FUNCTIONS, "paging_search", paging_search)
+    monkeypatch.setattr(worker_module, "checkpoint_store", worker_checkpoints)
+    monkeypatch.setitem(worker_module.JOB_FUNCTIONS, "slow_search", slow_search)
+    broker = InMemoryBroker()
+    local = ScraperScheduler(max_slots=2, max_queue=10)
+    local.start()
+    worker = ScraperWorker(broker, local, worker_id="w1", heartbeat_seconds=0.1).start()
+    queue = QueueScheduler(broker, max_queue=10, result_timeout=5)
+    queue.start()
+    yield broker, queue
+    queue.shutdown()
+    worker.stop()
+    local.shutdown()
+
+
+class TestJobQueue:
+    """Distributed scraper job queue tests"""
+
+    def test_broker_serves_interactive_jobs_first(self):
+        broker = InMemoryBroker()
+        broker.enqueue({"id": "bg", "priority": PRIORITY_BACKGROUND})
+        broker.enqueue({"id": "a", "priority": PRIORITY_INTERACTIVE})
+        broker.enqueue({"id": "b", "priority": PRIORITY_INTERACTIVE})
+        assert [broker.dequeue(0.1)["id"] for _ in range(3)] == ["a", "b", "bg"]
+        assert broker.dequeue(0.05) is None
+
+    def test_job_runs_on_worker_and_returns_results(self, cluster):
+        _, queue = cluster
+        timings = PhaseTimings()
+        future = queue.submit("req", fake_search, "tahliye", 0, None, None, None, timings)
+
+        keyword, results, success, _ = future.result(timeout=5)
+        assert keyword == "tahliye" and success
+        assert [r.esas_no for r in results] == [f"tahliye-{i}" for i in range(5)]
+        assert timings.as_dict()["fake_phase"]["count"] == 1
+        assert queue.get_stats()["completed"] == 1
+
+    def test_budget_quota_travels_with_job(self, cluster):
+        _, queue = cluster
+        budget = ResultBudget(max_results=2, per_keyword_cap=20)
+        budget.allocate(["nafaka"])
+
+        _, results, _, _ = queue.submit("req", fake_search, "nafaka", 0, None, budget).result(timeout=5)
+        assert len(results) == 2
+        assert budget.was_truncated("nafaka")
+        assert budget.unique_count == 2
+
+    def test_cancellation_reaches_worker(self, cluster):
+        _, queue = cluster
+        token = CancelToken()
+        future = queue.submit("req", slow_search, "kıdem", 0, None, None, token)
+        time.sleep(0.3)
+        token.cancel("Tüm istemciler ayrıldı")
+
+        _, _, success, message = future.result(timeout=5)
+        assert success and message.startswith("İptal edildi")
+
+    def test_worker_cursor_returns_with_result(self, cluster):
+        _, queue = cluster
+        assert queue.cursor("ihbar") is None
+
+        queue.submit("req", paging_search, "İhbar", 0, None, None, None, None, True).result(timeout=5)
+        assert queue.cursor("ihbar") == {"page": 4, "processed": 2, "status": STATUS_COMPLETE, "exhausted": False}
+
+    def test_worker_heartbeat_reports_capacity(self, cluster):
+        broker, queue = cluster
+        time.sleep(0.3)
+        assert "w1" in broker.workers()
+        assert queue.slot_limit == 2
+
+    def test_unanswered_job_times_out(self):
+        queue = QueueScheduler(InMemoryBroker(), max_queue=10, result_timeout=0.2)
+        queue.start()
+        try:
+            _, results, success, _ = queue.submit("req", fake_search, "tahliye", 0).result(timeout=5)
+        finally:
+            queue.shutdown()
+        assert results == [] and not success
+        assert queue.get_stats()["timed_out"] == 1
@@ -0,0 +1,41 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.metrics import PhaseTimings, bind_timings, phase, unbind_timings
+
+
+def sample(name, phase_name):
+    return REGISTRY.get_sample_value(name, {"phase": phase_name}) or 0.0
+
+
+class TestPhaseMetrics:
+    """Scraper phase instrumentation tests"""
+
+    def test_phase_records_histogram_and_request_timings(self):
+        before = sample("scraper_phase_duration_seconds_count", "test_phase")
+        timings = PhaseTimings()
+        token = bind_timings(timings)
+        try:
+            with phase("test_phase"):
+                pass
+            with phase("test_phase"):
+                pass
+        finally:
+            unbind_timings(token)
+        with phase("test_phase"):
+            pass  # Bağlı timings yokken yalnızca Prometheus'a yazılır
+
+        assert sample("scraper_phase_duration_seconds_count", "test_phase") == before + 3
+        assert timings.as_dict()["test_phase"]["count"] == 2
+
+    def test_failed_phase_counts_error_and_reraises(self):
+        timings = PhaseTimings()
+        token = bind_timings(timings)
+        try:
+            with pytest.raises(RuntimeError):
+                with phase("failing_phase"):
+                    raise RuntimeError("boom")
+        finally:
+            unbind_timings(token)
+        assert sample("scraper_phase_errors_total", "failing_phase") == 1
+        assert timings.as_dict()["failing_phase"]["errors"] == 1
@@ -0,0 +1,71 @@
+from selenium.webdriver.chrome.options import Options
+
+from app.network_profile import (
+    PROFILE_FILTERED,
+    PROFILE_FULL,
+    NetworkProfile,
+    host_resolver_rules,
+    split_setting,
+)
+
+
+class FakeDriver:
+    """execute_cdp_cmd / execute_script çağrılarını kaydeden sürücü"""
+
+    def __init__(self, transferred=0, requests=0):
+        self.cdp = []
+        self.measurement = [transferred, requests]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+    def execute_script(self, script):
+        return self.measurement
+
+
+def make_profile(**overrides):
+    params = dict(enabled=True, allowed_hosts=["karararama.yargitay.gov.tr"],
+                  blocked_patterns=["*.png", "*.css"], baseline_rate=0.0)
+    params.update(overrides)
+    return NetworkProfile(**params)
+
+
+class TestNetworkProfile:
+    """Request interception profile tests"""
+
+    def test_filtered_profile_configures_chrome(self):
+        profile = make_profile()
+        options = Options()
+        assert profile.configure_options(options) == PROFILE_FILTERED
+        assert "--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE karararama.yargitay.gov.tr" in options.arguments
+        assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+
+        driver = FakeDriver()
+        profile.attach(driver, PROFILE_FILTERED)
+        assert ("Network.setBlockedURLs", {"urls": ["*.png", "*.css"]}) in driver.cdp
+
+    def test_disabled_profile_leaves_browser_untouched(self):
+        profile = make_profile(enabled=False)
+        options = Options()
+        assert profile.configure_options(options) == PROFILE_FULL
+        assert options.arguments == []
+        driver = FakeDriver()
+        profile.attach(driver, PROFILE_FULL)
+        assert driver.cdp == []
+
+    def test_savings_compare_filtered_and_full_loads(self):
+        profile = make_profile()
+        filtered, full = FakeDriver(100 * 1024, 5), FakeDriver(400 * 1024, 40)
+        profile.attach(filtered, PROFILE_FILTERED)
+        profile.attach(full, PROFILE_FULL)
+        profile.measure(filtered, "page", 1.0)
+        profile.measure(full, "page", 3.0)
+
+        savings = profile.get_stats()["savings"]["page"]
+        assert savings["kb_per_load"] == 300.0
+        assert savings["seconds_per_load"] == 2.0
+        assert savings["bytes_pct"] == 75.0
+
+    def test_setting_helpers(self):
+        assert split_setting(" a.com, ,b.com ") == ["a.com", "b.com"]
+        assert host_resolver_rules([]) == "MAP * ~NOTFOUND"
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.cache import LRUCache, TieredKeywordCache, SingleFlight
+from app.precrawler import PreCrawler, rank_keywords, parse_hour_range, in_hour_range
+
+
+NOW = datetime(2026, 1, 10, 3, 0, tzinfo=timezone.utc)
+
+
+def query(keywords, hours_ago):
+    return {"keywords": keywords, "created_at": NOW - timedelta(hours=hours_ago)}
+
+
+class FakeQueryLog:
+    """Stand-in for FirestoreManager.get_recent_search_queries"""
+
+    client = object()
+
+    def __init__(self, queries):
+        self.queries = queries
+
+    async def get_recent_search_queries(self, since, limit=5000):
+        return self.queries
+
+
+class TestKeywordRanking:
+    """Query-log keyword mining tests"""
+
+    def test_frequent_keywords_rank_first(self):
+        """More frequent keywords get higher scores"""
+        queries = [query(["kira"], 100)] * 5 + [query(["tazminat"], 100)] * 2
+        ranked = rank_keywords(queries, NOW, timedelta(hours=24), timedelta(days=7))
+        assert [k for k, _ in ranked] == ["kira", "tazminat"]
+
+    def test_rising_keywords_get_a_boost(self):
+        """A recent spike outranks an older, slightly larger total"""
+        queries = [query(["kira"], 100)] * 6 + [query(["tahliye"], 1)] * 4
+        ranked = dict(rank_keywords(queries, NOW, timedelta(hours=24), timedelta(days=7)))
+        assert ranked["tahliye"] > ranked["kira"]
+
+    def test_keywords_are_normalized(self):
+        """Spelling variants are counted together"""
+        queries = [query(["KİRA"], 5), query([" kira "], 5)]
+        ranked = rank_keywords(queries, NOW, timedelta(hours=24), timedelta(days=7))
+        assert ranked == [("kira", 2 + 2 * (2 - 0))]
+
+    def test_hour_ranges(self):
+        """Off-peak windows may wrap around midnight"""
+        assert in_hour_range(3, parse_hour_range("1-6"))
+        assert not in_hour_range(6, parse_hour_range("1-6"))
+        assert in_hour_range(23, parse_hour_range("22-6"))
+        assert in_hour_range(2, parse_hour_range("22-6"))
+        assert not in_hour_range(12, parse_hour_range("22-6"))
+
+
+class TestPreCrawler:
+    """Budgeted cache warming tests"""
+
+    def test_run_refreshes_only_missing_keywords_within_budget(self):
+        """Fresh entries are skipped and the budget is respected"""
+        cache = TieredKeywordCache(LRUCache(100, 100_000, 3600), None)
+        asyncio.run(cache.set("kira", [{"esas_no": "1"}], 1.0))
+        scraped = []
+
+        async def scrape(keyword, request_id, idx, priority):
+            scraped.append(keyword)
+            return keyword, [], True, "ok"
+
+        log = FakeQueryLog(
+            [query(["kira"], 2)] * 5 + [query(["tazminat"], 2)] * 4
+            + [query(["tahliye"], 2)] * 3 + [query(["nafaka"], 2)]
+        )
+        crawler = PreCrawler(cache, SingleFlight(), scrape, log)
+        summary = asyncio.run(crawler.run_once(budget=2))
+
+        assert summary["selected"] == ["tazminat", "tahliye"]
+        assert sorted(scraped) == ["tahliye", "tazminat"]
+        assert crawler.get_stats()["skipped_fresh"] == 1
+        assert cache.get_stats()["lookups"] == 0
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from app.scheduler import (
+    ScraperScheduler,
+    SchedulerFullError,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+)
+
+
+class TestScraperScheduler:
+    """Process-wide scraper scheduler tests"""
+
+    def test_slot_limit_is_respected(self):
+        """Never more jobs running than browser slots"""
+        scheduler = ScraperScheduler(max_slots=2, max_queue=50)
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def job():
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.02)
+            with lock:
+                running["now"] -= 1
+
+        futures = [scheduler.submit("req", job) for _ in range(8)]
+        for future in futures:
+            future.result(timeout=5)
+        scheduler.shutdown()
+
+        assert running["peak"] <= 2
+        assert scheduler.get_stats()["completed"] == 8
+
+    def test_round_robin_between_requests(self):
+        """Jobs from different requests are interleaved"""
+        scheduler = ScraperScheduler(max_slots=1, max_queue=50)
+        gate = threading.Event()
+        order = []
+
+        scheduler.submit("blocker", gate.wait)
+        futures = [scheduler.submit("a", order.append, f"a{i}") for i in range(3)]
+        futures += [scheduler.submit("b", order.append, f"b{i}") for i in range(3)]
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+        scheduler.shutdown()
+
+        assert order == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+    def test_priority_levels(self):
+        """Interactive jobs run before background jobs"""
+        scheduler = ScraperScheduler(max_slots=1, max_queue=50)
+        gate = threading.Event()
+        order = []
+
+        scheduler.submit("blocker", gate.wait)
+        low = scheduler.submit("bg", order.append, "bg", priority=PRIORITY_BACKGROUND)
+        high = scheduler.submit("user", order.append, "user", priority=PRIORITY_INTERACTIVE)
+        gate.set()
+        low.result(timeout=5)
+        high.result(timeout=5)
+        scheduler.shutdown()
+
+        assert order == ["user", "bg"]
+
+    def test_queue_limit_rejects(self):
+        """Submissions beyond the queue limit are rejected"""
+        scheduler = ScraperScheduler(max_slots=1, max_queue=1)
+        gate = threading.Event()
+        scheduler.submit("blocker", gate.wait)
+        time.sleep(0.05)
+        scheduler.submit("a", lambda: None)
+
+        with pytest.raises(SchedulerFullError):
+            scheduler.submit("a", lambda: None)
+
+        gate.set()
+        scheduler.shutdown()
+        assert scheduler.get_stats()["rejected"] == 1
+
+    def test_exceptions_propagate(self):
+        """Job exceptions surface on the returned future"""
+        scheduler = ScraperScheduler(max_slots=1, max_queue=10)
+
+        def boom():
+            raise ValueError("boom")
+
+        future = scheduler.submit("req", boom)
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+        scheduler.shutdown()
+        assert scheduler.get_stats()["failed"] == 1
@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.cache import SingleFlight
+from app.cancellation import RequestCancellation
+from app.corpus import CorpusIngestor
+from app.job_queue import InMemoryBroker, QueueScheduler
+from app.scheduler import SchedulerFullError
+
+
+def cached_result(keyword):
+    return main.to_result_dict({
+        "daire": "9. Hukuk Dairesi", "esas_no": f"{keyword}-1", "karar_no": "2024/1",
+        "karar_tarihi": "01.01.2024", "karar_metni": "metin", "keyword": keyword,
+    })
+
+
+@pytest.fixture(autouse=True)
+def isolated_flights(monkeypatch):
+    monkeypatch.setattr(main, "search_flights", SingleFlight())
+    monkeypatch.setattr(main, "scrape_tokens", {})
+    monkeypatch.setattr(main, "scrape_timings", {})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def lookup(keywords):
+        hits = {k: [cached_result(k)] for k in keywords if k == "kira"}
+        details = {k: {"success": True, "count": 1, "message": "Cache'den döndürüldü (l1)", "cached": True} for k in hits}
+        return hits, details, 0
+
+    async def no_log(*args):
+        pass
+
+    monkeypatch.setattr(main, "lookup_without_scraping", lookup)
+    monkeypatch.setattr(main, "log_search", no_log)
+    monkeypatch.setattr(main.limiter, "enabled", False)
+    return TestClient(main.app)
+
+
+def scrape_with(outcomes):
+    async def scrape(keyword, request_id, idx, **kwargs):
+        outcome = outcomes[keyword]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return keyword, outcome, True, f"{len(outcome)} sonuç bulundu."
+    return scrape
+
+
+class TestSearchEndpoint:
+    """/search aggregation tests"""
+
+    def test_all_scrapes_rejected_returns_503_despite_cache_hits(self, client, monkeypatch):
+        monkeypatch.setattr(main, "scrape_keyword", scrape_with({
+            "tahliye": SchedulerFullError("dolu"), "nafaka": SchedulerFullError("dolu"),
+        }))
+        response = client.post("/search", json={"keywords": ["kira", "tahliye", "nafaka"]})
+        assert response.status_code == 503
+
+    def test_failed_keyword_keeps_other_results(self, client, monkeypatch):
+        monkeypatch.setattr(main, "scrape_keyword", scrape_with({
+            "tahliye": RuntimeError("driver çöktü"), "nafaka": [cached_result("nafaka")],
+        }))
+        response = client.post("/search", json={"keywords": ["kira", "tahliye", "nafaka"]})
+
+        body = response.json()
+        assert response.status_code == 200 and body["success"]
+        assert {r["esas_no"] for r in body["results"]} == {"kira-1", "nafaka-1"}
+        assert body["search_details"]["tahliye"] == {
+            "success": False, "count": 0, "message": "driver çöktü", "cached": False,
+        }
+
+    def test_queue_mode_reports_worker_cursor(self, client, monkeypatch):
+        queue = QueueScheduler(InMemoryBroker(), max_queue=10, result_timeout=5)
+        queue._remember_cursor("tahliye", {"page": 3, "processed": 9, "status": "complete", "exhausted": False})
+        monkeypatch.setattr(main, "queue_scheduler", queue)
+        monkeypatch.setattr(main, "job_scheduler", queue)
+        monkeypatch.setattr(main, "scrape_keyword", scrape_with({"tahliye": [cached_result("tahliye")]}))
+
+        response = client.post("/search", json={"keywords": ["tahliye"]})
+
+        assert response.json()["search_details"]["tahliye"]["cursor"]["page"] == 3
+
+
+class TestBudgetedFlights:
+    """Single-flight sharing with max_results budgets"""
+
+    def test_budget_limited_scrape_is_not_shared(self, monkeypatch):
+        calls = []
+
+        async def scrape(keyword, request_id, idx, budget=None, **kwargs):
+            calls.append(request_id)
+            await asyncio.sleep(0.05)
+            count = 1 if budget is not None else 3
+            return keyword, [cached_result(f"{keyword}{i}") for i in range(count)], True, "ok"
+
+        monkeypatch.setattr(main, "scrape_keyword", scrape)
+        monkeypatch.setattr(main.settings, "TARGET_RESULTS_PER_KEYWORD", 3)
+
+        async def scenario():
+            budget = main.create_result_budget(1, {}, ["tahliye"])
+            limited = main.start_keyword_searches(["tahliye"], "limited", budget)[0]
+            unlimited = main.start_keyword_searches(["tahliye"], "unlimited")[0]
+            return await asyncio.gather(limited, unlimited)
+
+        limited, unlimited = asyncio.run(scenario())
+        assert sorted(calls) == ["limited", "unlimited"]
+        assert len(limited[1]) == 1 and len(unlimited[1]) == 3
+
+
+class TestScrapeTokens:
+    """Cancellation token bookkeeping for shared flights"""
+
+    def test_joining_background_flight_does_not_leak_tokens(self, monkeypatch):
+        async def background_refresh():
+            await asyncio.sleep(0.05)
+            return "tahliye", [cached_result("tahliye")], True, "ok"
+
+        async def scenario():
+            main.search_flights.spawn("tahliye", background_refresh)
+            cancellation = RequestCancellation()
+            result = await main.start_keyword_searches(["tahliye"], "req", cancellation=cancellation)[0]
+            cancellation.release_all()
+            return result
+
+        assert asyncio.run(scenario())[1][0]["esas_no"] == "tahliye-1"
+        assert main.scrape_tokens == {} and main.scrape_timings == {}
+
+    def test_stream_watches_deadline_and_disconnect(self, client, monkeypatch):
+        watched = []
+
+        async def watch(request, cancellation):
+            watched.append(cancellation.deadline)
+
+        monkeypatch.setattr(main, "watch_disconnect", watch)
+        monkeypatch.setattr(main, "scrape_keyword", scrape_with({"tahliye": [cached_result("tahliye")]}))
+        response = client.post("/search/stream", json={"keywords": ["tahliye"]}, headers={"X-Request-Timeout": "30"})
+
+        assert response.status_code == 200
+        assert '"type": "summary"' in response.text
+        assert len(watched) == 1 and watched[0] is not None
+
+
+class RecordingFlights(SingleFlight):
+    def __init__(self):
+        super().__init__()
+        self.keys = []
+
+    async def run(self, key, factory):
+        self.keys.append(key)
+        return await super().run(key, factory)
+
+
+class TestCorpusCrawlEndpoint:
+    """/corpus/crawl flight isolation"""
+
+    def test_crawl_uses_its_own_flight_and_pages(self, client, monkeypatch):
+        flights = RecordingFlights()
+        calls = []
+
+        async def scrape(keyword, request_id, idx, priority, ingest=True, continue_paging=False, private=False, **kwargs):
+            calls.append((request_id, priority, continue_paging, private))
+            results = [] if continue_paging else [cached_result(keyword)]
+            return keyword, results, True, "ok"
+
+        class NoStore:
+            client = None
+
+        monkeypatch.setattr(main, "search_flights", flights)
+        monkeypatch.setattr(main, "scrape_keyword", scrape)
+        monkeypatch.setattr(main, "corpus", CorpusIngestor(NoStore()))
+        monkeypatch.setattr(main.firestore_manager, "client", object())
+
+        response = client.post("/corpus/crawl", json={"keywords": ["tahliye"]})
+
+        assert response.status_code == 200 and response.json()["results"][0]["complete"]
+        assert flights.keys == ["tahliye#corpus-crawl", "tahliye#devam#corpus-crawl"]
+        assert calls == [
+            ("corpus-crawl", main.PRIORITY_BACKGROUND, False, True),
+            ("corpus-crawl", main.PRIORITY_BACKGROUND, True, True),
+        ]
@@ -0,0 +1,280 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+
+from app import search_logic
+from app.budget import ResultBudget
+from app.checkpoint import STATUS_COMPLETE, STATUS_IN_PROGRESS, CheckpointStore, ScrapeCheckpoint
+from app.config import settings
+from app.schemas import ResultItem
+from app.search_logic import (
+    DECISION_TEXT_MISSING, PAGE_ADVANCED, PAGE_FAILED, PAGE_LAST, get_decision_text, go_to_next_page,
+    process_page_rows, process_page_rows_multi_tab, search_single_keyword,
+)
+
+
+class FakeSiteController:
+    def acquire_site_request(self):
+        pass
+
+    def observe(self, kind, latency, ok=True):
+        pass
+
+
+class FakeCell:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeRow:
+    """Tıklandığında sekmenin #kararAlani panelini karar metniyle dolduran sonuç satırı"""
+
+    def __init__(self, driver, handle, esas_no, loads=True):
+        self.driver, self.handle, self.esas_no, self.loads = driver, handle, esas_no, loads
+
+    def find_elements(self, by, value):
+        return [FakeCell(text) for text in ("1", "9. Hukuk Dairesi", self.esas_no, "2024/1", "01.01.2024")]
+
+    def click(self):
+        self.driver.clicks.append((self.handle, self.esas_no))
+        if self.loads:
+            self.driver.pending[self.handle] = f"Karar {self.esas_no} metni"
+
+
+class FakeDriver:
+    """
+    #kararAlani paneli olan sekmeler. Tıklanan kararın metni panel okunduğunda görünür;
+    MutationObserver betiği metin önceki metinden farklı değilse zaman aşımına uğrar.
+    """
+
+    def __init__(self, handles=("tab-1",), observer=True):
+        self.window_handles = list(handles)
+        self.current = self.window_handles[0]
+        self.panels = {handle: "" for handle in handles}
+        self.pending = {}
+        self.rows = {handle: [] for handle in handles}
+        self.clicks = []
+        self.observer = observer
+        self.panel_reads = 0
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        self.current = handle
+
+    def add_rows(self, specs):
+        for handle in self.window_handles:
+            self.rows[handle] = [FakeRow(self, handle, esas_no, loads) for esas_no, loads in specs]
+
+    def find_elements(self, by, value):
+        return self.rows[self.current]
+
+    def _panel(self):
+        if self.current in self.pending:
+            self.panels[self.current] = self.pending.pop(self.current)
+        self.panel_reads += 1
+        return self.panels[self.current]
+
+    def execute_script(self, script, *args):
+        if "kararAlani" in script:
+            return self._panel()
+        return None
+
+    def execute_async_script(self, script, previous, timeout_ms, settle_ms):
+        if not self.observer:
+            raise WebDriverException("async script unsupported")
+        text = self._panel()
+        if text and text != previous:
+            return text
+        raise TimeoutException()
+
+
+@pytest.fixture(autouse=True)
+def fast_panel(monkeypatch):
+    monkeypatch.setattr(search_logic, "site_controller", FakeSiteController())
+    monkeypatch.setattr(settings, "PANEL_WAIT_TIMEOUT", 0.2)
+    monkeypatch.setattr(settings, "PANEL_SETTLE_MS", 1)
+    monkeypatch.setattr(settings, "PANEL_POLL_MIN_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "PANEL_POLL_MAX_INTERVAL", 0.02)
+    monkeypatch.setattr(settings, "TARGET_RESULTS_PER_KEYWORD", 10)
+
+
+class TestPanelChangeWait:
+    """#kararAlani change detection tests"""
+
+    def test_changed_text_is_returned(self):
+        driver = FakeDriver()
+        driver.panels["tab-1"] = "Önceki karar"
+        driver.pending["tab-1"] = "Yeni karar"
+        assert get_decision_text(driver, None, "Önceki karar") == "Yeni karar"
+
+    def test_unchanged_panel_times_out(self):
+        driver = FakeDriver()
+        driver.panels["tab-1"] = "Önceki karar"
+        assert get_decision_text(driver, None, "Önceki karar") == DECISION_TEXT_MISSING
+
+    def test_polling_fallback_waits_for_change(self):
+        driver = FakeDriver(observer=False)
+        driver.panels["tab-1"] = "Önceki karar"
+        driver.pending["tab-1"] = "Yeni karar"
+        assert get_decision_text(driver, None, "Önceki karar") == "Yeni karar"
+
+        assert get_decision_text(driver, None, "Yeni karar") == DECISION_TEXT_MISSING
+        assert driver.panel_reads > 3  # Zaman aşımına kadar yoklandı
+
+    def test_stale_panel_after_timeout_is_not_reused(self):
+        driver = FakeDriver()
+        driver.add_rows([("2024/1", True), ("2024/2", False), ("2024/3", False), ("2024/4", True)])
+        results = []
+
+        found = process_page_rows(driver, None, "t", 0, set(), results, "tahliye")
+
+        assert found == 4
+        assert [r.karar_metni for r in results] == [
+            "Karar 2024/1 metni", DECISION_TEXT_MISSING, DECISION_TEXT_MISSING, "Karar 2024/4 metni",
+        ]
+
+
+class TestBudgetedRows:
+    """Shared result budget during row collection"""
+
+    def test_overlapping_keywords_share_budget_by_unique_decisions(self):
+        budget = ResultBudget(max_results=4, per_keyword_cap=settings.TARGET_RESULTS_PER_KEYWORD)
+        budget.allocate(["tahliye", "kira"])
+        first, second = FakeDriver(), FakeDriver()
+        first.add_rows([("2024/1", True), ("2024/2", True), ("2024/3", True)])
+        second.add_rows([("2024/1", True), ("2024/2", True), ("2024/4", True), ("2024/5", True), ("2024/6", True)])
+
+        assert process_page_rows(first, None, "t", 0, set(), [], "tahliye", budget) == 2
+        budget.finish("tahliye")
+        # İlk kelimenin okuduğu kararlar kira'nın kotasından düşmez
+        assert process_page_rows(second, None, "t", 0, set(), [], "kira", budget) == 4
+        assert budget.unique_count == 4
+
+
+class TestMultiTabCollection:
+    """Multi-tab row distribution tests"""
+
+    def test_rows_are_split_across_tabs_and_texts_match_rows(self):
+        driver = FakeDriver(handles=("tab-1", "tab-2"))
+        driver.add_rows([(f"2024/{i}", True) for i in range(1, 6)])
+        results = []
+
+        found = process_page_rows_multi_tab(driver, driver.window_handles, "t", 0, set(), results, "tahliye")
+
+        assert found == 5
+        assert all(r.karar_metni == f"Karar {r.esas_no} metni" for r in results)
+        assert driver.clicks[:2] == [("tab-1", "2024/1"), ("tab-2", "2024/2")]
+        assert {handle for handle, esas_no in driver.clicks if esas_no in ("2024/1", "2024/3", "2024/5")} == {"tab-1"}
+
+    def test_timeout_in_one_tab_does_not_leak_previous_text(self):
+        driver = FakeDriver(handles=("tab-1", "tab-2"))
+        driver.add_rows([("2024/1", True), ("2024/2", True), ("2024/3", False), ("2024/4", True), ("2024/5", False)])
+        results = []
+
+        process_page_rows_multi_tab(driver, driver.window_handles, "t", 0, set(), results, "tahliye")
+
+        texts = {r.esas_no: r.karar_metni for r in results}
+        assert texts["2024/3"] == texts["2024/5"] == DECISION_TEXT_MISSING
+        assert texts["2024/4"] == "Karar 2024/4 metni"
+
+    def test_target_stops_clicking(self, monkeypatch):
+        monkeypatch.setattr(settings, "TARGET_RESULTS_PER_KEYWORD", 3)
+        driver = FakeDriver(handles=("tab-1", "tab-2"))
+        driver.add_rows([(f"2024/{i}", True) for i in range(1, 7)])
+        results = []
+
+        assert process_page_rows_multi_tab(driver, driver.window_handles, "t", 0, set(), results, "tahliye") == 3
+        assert len(driver.clicks) == 3
+
+
+class FakeNextButton:
+    def __init__(self, css_class):
+        self.css_class = css_class
+
+    def get_attribute(self, name):
+        return self.css_class
+
+
+class PaginationDriver:
+    """find_element ile "sonraki" butonunu (veya hatasını) döndüren sürücü"""
+
+    def __init__(self, button=None, error=None):
+        self.button, self.error = button, error
+
+    def find_element(self, by, value):
+        if self.error is not None:
+            raise self.error
+        return self.button
+
+
+class FakeSupervisor:
+    def recycle_reason(self, driver):
+        return None
+
+    def record_page(self, driver):
+        pass
+
+
+class TestPagination:
+    """Next-page outcomes and checkpoint exhaustion"""
+
+    def test_missing_or_disabled_next_is_last_page(self):
+        assert go_to_next_page(PaginationDriver(error=NoSuchElementException()), None, "t", 1) == PAGE_LAST
+        assert go_to_next_page(PaginationDriver(FakeNextButton("paginate_button next disabled")), None, "t", 1) == PAGE_LAST
+
+    def test_transient_error_is_failure(self):
+        assert go_to_next_page(PaginationDriver(error=WebDriverException("stale")), None, "t", 1) == PAGE_FAILED
+
+    @pytest.fixture
+    def store(self, monkeypatch):
+        store = CheckpointStore(None, ttl_seconds=60)
+        monkeypatch.setattr(search_logic, "checkpoint_store", store)
+        monkeypatch.setattr(search_logic, "browser_supervisor", FakeSupervisor())
+        monkeypatch.setattr(search_logic, "open_search", lambda *args: (object(), None, None, True, PAGE_ADVANCED))
+        monkeypatch.setattr(search_logic, "driver_alive", lambda driver: True)
+        monkeypatch.setattr(search_logic, "close_driver", lambda *args, **kwargs: None)
+
+        def one_row_per_page(driver, wait, thread_name, found_count, processed_cases, results, keyword, *args):
+            esas_no = f"2024/{found_count + 1}"
+            processed_cases.add(esas_no)
+            results.append(ResultItem(
+                daire="9. Hukuk Dairesi", esas_no=esas_no, karar_no="2024/1",
+                karar_tarihi="01.01.2024", karar_metni="metin", keyword=keyword,
+            ))
+            return found_count + 1
+
+        monkeypatch.setattr(search_logic, "process_page_rows", one_row_per_page)
+        return store
+
+    def scrape_with_next_page(self, monkeypatch, state):
+        monkeypatch.setattr(search_logic, "go_to_next_page", lambda *args: state)
+        return search_single_keyword("tahliye", 1, tabs=1)
+
+    def test_last_page_exhausts_keyword(self, store, monkeypatch):
+        keyword, results, success, message = self.scrape_with_next_page(monkeypatch, PAGE_LAST)
+
+        assert success and len(results) == 1
+        checkpoint = store.load("tahliye")
+        assert checkpoint.status == STATUS_COMPLETE and checkpoint.exhausted
+        assert store.start("tahliye", continue_paging=True) is None
+
+    def test_failed_transition_keeps_checkpoint_resumable(self, store, monkeypatch):
+        keyword, results, success, message = self.scrape_with_next_page(monkeypatch, PAGE_FAILED)
+
+        assert success and len(results) == 1
+        checkpoint = store.load("tahliye")
+        assert checkpoint.status == STATUS_IN_PROGRESS and not checkpoint.exhausted
+        resumed = store.start("tahliye", continue_paging=True)
+        assert resumed.page_number == 1 and resumed.processed_cases == ["2024/1"]
+
+    def test_failed_resume_navigation_keeps_checkpoint_open(self, store, monkeypatch):
+        monkeypatch.setattr(search_logic, "open_search", lambda *args: (object(), None, None, True, PAGE_FAILED))
+        store.save(ScrapeCheckpoint(keyword="tahliye", page_number=3, processed_cases=["a"]))
+
+        keyword, results, success, message = search_single_keyword("tahliye", 1, tabs=1)
+
+        assert success and results == []
+        checkpoint = store.load("tahliye")
+        assert checkpoint.status == STATUS_IN_PROGRESS and checkpoint.page_number == 3
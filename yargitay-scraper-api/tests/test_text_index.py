@@ -0,0 +1,105 @@
+import threading
+
+from app import text_index as text_index_module
+from app.text_index import TextIndex, tokenize
+
+
+def decision(decision_id, content):
+    return {
+        "decision_id": decision_id,
+        "court": "3. Hukuk Dairesi",
+        "esas_no": f"2024/{decision_id}",
+        "karar_no": "2024/99",
+        "karar_tarihi": "15.03.2024",
+        "content": content,
+    }
+
+
+CORPUS = [
+    decision("1", "Kiracının tahliyesi için açılan davada kira bedeli ödenmemiştir."),
+    decision("2", "İşçinin kıdem tazminatı talebi reddedilmiştir."),
+    decision("3", "Kira sözleşmesi feshedildi, kiracı tahliye edildi. Tahliye kararı onandı."),
+    decision("4", "Boşanma davasında nafaka miktarı artırıldı."),
+]
+
+
+class TestTokenize:
+    """Turkish normalization and prefix stemming"""
+
+    def test_turkish_case_and_stemming(self):
+        assert tokenize("İŞÇİNİN Kıdem") == ["işçin", "kıdem"]
+        assert tokenize("TAHLİYESİ") == ["tahli"]
+
+    def test_stopwords_dropped(self):
+        assert tokenize("kira ve tahliye için") == ["kira", "tahli"]
+
+
+class TestTextIndex:
+    """On-disk segment plus pending documents with BM25 ranking"""
+
+    def test_search_ranks_by_bm25(self, tmp_path):
+        index = TextIndex(str(tmp_path / "idx"))
+        index.rebuild(CORPUS)
+        hits = index.search("kiracı tahliye", top_k=10)
+        assert [h["decision_id"] for h in hits][:2] == ["3", "1"]
+        assert all(h["score"] > 0 for h in hits)
+
+    def test_require_all_terms(self, tmp_path):
+        index = TextIndex(str(tmp_path / "idx"))
+        index.rebuild(CORPUS)
+        assert {h["decision_id"] for h in index.search("tahliye nafaka")} == {"1", "3", "4"}
+        assert index.search("tahliye nafaka", require_all=True) == []
+
+    def test_pending_documents_searchable_and_override_segment(self, tmp_path):
+        index = TextIndex(str(tmp_path / "idx"))
+        index.rebuild(CORPUS)
+        index.add_documents([decision("2", "Nafaka alacağı hakkında karar."), decision("5", "Nafaka davası.")])
+        assert len(index) == 5
+        assert {h["decision_id"] for h in index.search("kıdem tazminatı")} == set()
+        assert {h["decision_id"] for h in index.search("nafaka")} == {"2", "4", "5"}
+
+    def test_flush_persists_and_reopens(self, tmp_path):
+        path = str(tmp_path / "idx")
+        index = TextIndex(path)
+        index.add_documents(CORPUS)
+        assert index.flush() == 4
+        assert index.pending_count == 0
+
+        reopened = TextIndex(path)
+        assert len(reopened) == 4
+        hits = reopened.search("kıdem")
+        assert hits[0]["decision_id"] == "2"
+        assert hits[0]["content"].startswith("İşçinin")
+
+    def test_empty_index(self, tmp_path):
+        index = TextIndex(str(tmp_path / "idx"))
+        assert index.search("kira") == []
+        assert index.flush() == 0
+
+    def test_search_and_add_continue_while_segment_is_written(self, tmp_path, monkeypatch):
+        index = TextIndex(str(tmp_path / "idx"))
+        index.rebuild(CORPUS[:2])
+        index.add_documents(CORPUS[2:])
+        writing, release = threading.Event(), threading.Event()
+        build_segment = text_index_module.build_segment
+
+        def slow_build(documents, path):
+            documents = list(documents)
+            writing.set()
+            release.wait(5)
+            return build_segment(documents, path)
+
+        monkeypatch.setattr(text_index_module, "build_segment", slow_build)
+        flusher = threading.Thread(target=index.flush)
+        flusher.start()
+        assert writing.wait(5)
+
+        # Yazım sürerken kilit tutulmaz: arama ve ekleme beklemeden çalışır
+        assert {h["decision_id"] for h in index.search("tahliye")} == {"1", "3"}
+        index.add_documents([decision("5", "Tahliye taahhüdü geçersiz sayıldı.")])
+        assert len(index) == 5
+
+        release.set()
+        flusher.join(5)
+        assert index.pending_count == 1
+        assert {h["decision_id"] for h in index.search("tahliye")} == {"1", "3", "5"}
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from app.scheduler import ScraperScheduler
+from app.throttle import AIMDController, TokenBucket
+
+
+def make_controller(**overrides):
+    params = dict(
+        min_limit=1, max_limit=8, initial_limit=4, window=4, decrease_factor=0.5,
+        page_latency_target=1.0, panel_latency_target=1.0, error_rate_threshold=0.25,
+        rate_per_second=0, burst=1,
+    )
+    params.update(overrides)
+    return AIMDController(**params)
+
+
+class TestAIMDController:
+    """Adaptive concurrency controller tests"""
+
+    def test_additive_increase_when_healthy(self):
+        controller = make_controller()
+        for _ in range(8):
+            controller.observe("page", 0.2)
+        assert controller.limit == 6
+
+    def test_multiplicative_decrease_on_slow_pages(self):
+        controller = make_controller()
+        for _ in range(4):
+            controller.observe("panel", 3.0)
+        assert controller.limit == 2
+        for _ in range(8):
+            controller.observe("panel", 3.0)
+        assert controller.limit == 1  # Alt sınırın altına inmez
+
+    def test_decrease_on_error_rate(self):
+        controller = make_controller()
+        for ok in (True, False, True, False):
+            controller.observe("page", 0.1, ok=ok)
+        assert controller.limit == 2
+        assert controller.get_stats()["errors"] == 2
+
+    def test_increase_capped_at_max(self):
+        controller = make_controller(max_limit=5)
+        for _ in range(40):
+            controller.observe("page", 0.1)
+        assert controller.limit == 5
+
+
+class TestTokenBucket:
+    """Global site request rate ceiling tests"""
+
+    def test_rate_is_enforced_after_burst(self):
+        bucket = TokenBucket(rate_per_second=50, burst=2)
+        started = time.monotonic()
+        for _ in range(7):
+            bucket.acquire()
+        # 2 istek burst'ten, kalan 5 istek 50/sn hızla ~0.1 sn
+        assert time.monotonic() - started >= 0.08
+
+
+class TestSchedulerWithController:
+    """Scheduler honours the controller's slot limit"""
+
+    def test_running_jobs_follow_controller_limit(self):
+        controller = make_controller(initial_limit=1, max_limit=4)
+        scheduler = ScraperScheduler(max_slots=4, max_queue=50, concurrency=controller)
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def job():
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.02)
+            with lock:
+                running["now"] -= 1
+
+        futures = [scheduler.submit("req", job) for _ in range(6)]
+        for future in futures:
+            future.result(timeout=10)
+        stats = scheduler.get_stats()
+        scheduler.shutdown()
+
+        assert running["peak"] == 1
+        assert stats["slot_limit"] == 1